@@ -0,0 +1,177 @@
+"""
+Benchmark WriteResults against the previous one-statement-per-row upserts.
+
+Builds a synthetic extraction result (fields plus one large table), writes it
+to a temporary database with both approaches and prints rows/sec.
+
+    python benchmarks/bench_write_results.py --fields 50 --rows 500 --columns 6
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from utils import db_utils
+from utils.write_results import WriteResults
+
+CREATE_EXTRACTION_TABLE = """
+    CREATE TABLE IF NOT EXISTS extraction (
+        filename TEXT NOT NULL,
+        document_id TEXT NOT NULL,
+        document_type_id TEXT NOT NULL,
+        field_id TEXT,
+        field TEXT,
+        is_missing BOOLEAN,
+        field_value TEXT,
+        field_unformatted_value TEXT,
+        validated_field_value TEXT,
+        is_correct BOOLEAN,
+        confidence REAL,
+        ocr_confidence REAL,
+        operator_confirmed BOOLEAN,
+        row_index INTEGER DEFAULT -1,
+        column_index INTEGER DEFAULT -1,
+        page_range TEXT,
+        timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (filename, field_id, field, row_index, column_index)
+    )
+"""
+
+
+def _value(value):
+    return {
+        "Value": value,
+        "UnformattedValue": value,
+        "Confidence": 0.9,
+        "OcrConfidence": 0.95,
+        "OperatorConfirmed": False,
+        "DataSource": "Automatic",
+    }
+
+
+def build_extraction_results(fields: int, rows: int, columns: int) -> dict:
+    """Return an extraction result with `fields` fields and a rows x columns table."""
+    cells = [
+        {
+            "RowIndex": 0,
+            "ColumnIndex": c,
+            "IsHeader": True,
+            "Values": [_value(f"col{c}")],
+        }
+        for c in range(columns)
+    ]
+    cells += [
+        {
+            "RowIndex": r,
+            "ColumnIndex": c,
+            "IsHeader": False,
+            "IsMissing": False,
+            "Values": [_value(f"r{r}c{c}")],
+        }
+        for r in range(1, rows + 1)
+        for c in range(columns)
+    ]
+    return {
+        "extractionResult": {
+            "DocumentId": "bench-document",
+            "ResultsDocument": {
+                "DocumentTypeId": "bank_statement",
+                "Bounds": {"PageRange": "1-40"},
+                "Fields": [
+                    {
+                        "FieldId": f"field{i}",
+                        "FieldName": f"Field {i}",
+                        "IsMissing": False,
+                        "Values": [_value(f"value{i}")],
+                    }
+                    for i in range(fields)
+                ],
+                "Tables": [{"FieldId": "transactions", "Values": [{"Cells": cells}]}],
+            },
+        }
+    }
+
+
+def legacy_write(writer: WriteResults) -> None:
+    """The previous implementation: build the SQL and execute once per row."""
+    for row in writer.extraction_rows():
+        row_data = dict(
+            zip(
+                (
+                    "filename",
+                    "document_id",
+                    "document_type_id",
+                    "field_id",
+                    "field",
+                    "is_missing",
+                    "field_value",
+                    "field_unformatted_value",
+                    "confidence",
+                    "ocr_confidence",
+                    "operator_confirmed",
+                    "is_correct",
+                    "page_range",
+                    "row_index",
+                    "column_index",
+                ),
+                row,
+            )
+        )
+        columns = ", ".join(row_data.keys())
+        placeholders = ", ".join(["?"] * len(row_data))
+        update_assignments = ", ".join(
+            f"{key} = excluded.{key}" for key in row_data.keys()
+        )
+        sql = f"""
+            INSERT INTO extraction ({columns})
+            VALUES ({placeholders})
+            ON CONFLICT(filename, field_id, field, row_index, column_index)
+            DO UPDATE SET {update_assignments}
+        """
+        writer.cursor.execute(sql, list(row_data.values()))
+
+
+def run(label: str, write, extraction_results: dict, repeat: int) -> None:
+    row_count = 0
+    elapsed = 0.0
+    for i in range(repeat):
+        writer = WriteResults(f"bench-{i}.pdf", extraction_results=extraction_results)
+        start = time.perf_counter()
+        write(writer)
+        writer.conn.commit()
+        elapsed += time.perf_counter() - start
+        row_count += len(writer.extraction_rows())
+    print(
+        f"{label:>12}: {row_count} rows in {elapsed:.3f}s ({row_count / elapsed:,.0f} rows/sec)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fields", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--columns", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    extraction_results = build_extraction_results(args.fields, args.rows, args.columns)
+    with tempfile.TemporaryDirectory() as tmp:
+        with patch("utils.db_utils.SQLITE_DB_PATH", os.path.join(tmp, "bench.db")):
+            db_utils.execute_query(CREATE_EXTRACTION_TABLE)
+            run("per-row", legacy_write, extraction_results, args.repeat)
+            db_utils.execute_query("DELETE FROM extraction")
+            run(
+                "executemany",
+                WriteResults.write_extraction_results,
+                extraction_results,
+                args.repeat,
+            )
+            db_utils.close_connection()
+
+
+if __name__ == "__main__":
+    main()
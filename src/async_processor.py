@@ -0,0 +1,167 @@
+import os
+import asyncio
+from pipeline import iter_document_paths
+from processor import DocumentProcessor
+from project_setup import load_prompts
+from project_config import (
+    ASYNC_CONCURRENCY,
+    ProcessingConfig,
+    DocumentProcessingContext,
+)
+
+
+class AsyncDocumentProcessor(DocumentProcessor):
+    """
+    Asyncio counterpart of `DocumentProcessor`.
+
+    Every document runs as a coroutine on one event loop. Waiting for cloud
+    operations does not hold a thread, so thousands of documents can be in
+    flight at once; only uploads, start calls and database writes briefly use
+    the default executor. Expects the clients from `modules.async_clients`.
+    """
+
+    async def process_document(
+        self,
+        document_path: str,
+        config: ProcessingConfig,
+        context: DocumentProcessingContext,
+    ) -> None:
+        """Process a document using the provided configuration and context."""
+        try:
+            document_id = await self.start_digitization(document_path)
+
+            # Perform classification if required
+            document_classifications = (
+                await self.classify_document(
+                    document_id, document_path, config, context
+                )
+                if config.perform_classification
+                else []
+            )
+
+            # If no classification, assume a single default document type with no page range
+            if not document_classifications:
+                document_classifications = [(None, None)]
+
+            # Extract each classified document type concurrently
+            if config.perform_extraction:
+                extractions = []
+                for document_type_id, page_range in document_classifications:
+                    extractor_id, extractor_name = self.get_extractor(
+                        context, document_type_id
+                    )
+                    if extractor_id and extractor_name:
+                        extractions.append(
+                            self.perform_extraction(
+                                document_id,
+                                document_path,
+                                extractor_id,
+                                extractor_name,
+                                page_range,
+                                config,
+                                context,
+                            )
+                        )
+                await asyncio.gather(*extractions)
+
+        except Exception as e:
+            print(f"Error processing {document_path}: {e}")
+
+    async def start_digitization(self, document_path: str) -> str:
+        return await self.digitize_client.digitize(document_path)
+
+    async def classify_document(
+        self,
+        document_id: str,
+        document_path: str,
+        config: ProcessingConfig,
+        context: DocumentProcessingContext,
+    ) -> str | None:
+        classification_prompts = (
+            load_prompts("classification")
+            if context.classifier == "generative_classifier"
+            else None
+        )
+        document_type_id = await self.classify_client.classify_document(
+            document_path,
+            document_id,
+            context.classifier,
+            classification_prompts,
+            config.validate_classification,
+        )
+        if config.validate_classification:
+            document_type_id = (
+                await self.validate_client.validate_classification_results(
+                    document_id,
+                    context.classifier,
+                    document_type_id,
+                    classification_prompts,
+                )
+            )
+        return document_type_id
+
+    async def perform_extraction(
+        self,
+        document_id: str,
+        document_path: str,
+        extractor_id: str,
+        extractor_name: str,
+        page_range: str,
+        config: ProcessingConfig,
+        context: DocumentProcessingContext,
+    ) -> None:
+        extraction_prompts = (
+            load_prompts(extractor_name)
+            if context.project_id == "00000000-0000-0000-0000-000000000001"
+            else None
+        )
+        extraction_results = await self.extract_client.extract_document(
+            extractor_id, document_id, page_range, extraction_prompts
+        )
+        await asyncio.to_thread(
+            self.write_extraction_results, extraction_results, document_path
+        )
+
+        if config.validate_extraction:
+            # Submit the validation request, optionally deferring the validation process
+            filename = os.path.basename(document_path)
+
+            validated_results = await self.validate_client.validate_extraction_results(
+                filename,
+                extractor_id,
+                document_id,
+                extraction_results,
+                extraction_prompts,
+                validate_extraction_later=config.validate_extraction_later,
+            )
+
+            if config.validate_extraction_later:
+                print(
+                    f"Extraction validation will be performed later for document {document_id}"
+                )
+            elif validated_results:
+                # Handle and write results only if validation was immediate
+                await asyncio.to_thread(
+                    self.write_validated_results,
+                    validated_results,
+                    extraction_results,
+                    document_path,
+                )
+
+    async def process_documents_in_folder(
+        self,
+        folder_path: str,
+        config: ProcessingConfig,
+        context: DocumentProcessingContext,
+        concurrency: int = ASYNC_CONCURRENCY,
+    ) -> None:
+        """Process all documents in the folder with at most `concurrency` in flight."""
+        document_paths = iter_document_paths(folder_path)
+
+        async def worker():
+            # Workers pull from one shared generator until it is exhausted
+            for document_path in document_paths:
+                print(f"Submitting document for processing: {document_path}")
+                await self.process_document(document_path, config, context)
+
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
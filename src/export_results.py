@@ -0,0 +1,113 @@
+import argparse
+import sqlite3
+from typing import Optional
+from project_config import EXPORT_CHUNK_ROWS
+from utils.columnar_export import FORMATS, TABLES, export_tables
+from utils.db_utils import get_connection
+from utils.migrations import run_migrations
+from utils.write_results import CSV_COLUMNS, OUTPUT_DIR, group_csv_rows, write_csv
+
+
+def export_all_results(
+    filename: Optional[str] = None, output_dir: Optional[str] = None
+) -> int:
+    """
+    Rewrite the CSV exports of every stored extraction result.
+
+    Rows are streamed from the database ordered by document and page range,
+    so only one split is held in memory at a time. Each CSV is replaced
+    atomically, which makes the export safe to run next to `main.py`.
+
+    Args:
+        filename (str, optional): Only export this document.
+        output_dir (str, optional): Folder for the CSV files (default OUTPUT_DIR).
+
+    Returns:
+        int: The number of CSV files written.
+    """
+    query = f"SELECT {', '.join(CSV_COLUMNS)} FROM extraction"
+    params = ()
+    if filename:
+        query += " WHERE filename = ?"
+        params = (filename,)
+    query += " ORDER BY filename, page_range, rowid"
+
+    exported = 0
+    cursor = get_connection().cursor()
+    for document, page_range, rows in group_csv_rows(cursor.execute(query, params)):
+        csv_filepath = write_csv(document, page_range, rows, output_dir)
+        print(f"Data exported to {csv_filepath}")
+        exported += 1
+    return exported
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export stored results to CSV, or to Parquet/Arrow for analytics."
+    )
+    parser.add_argument(
+        "--format",
+        choices=("csv",) + FORMATS,
+        default="csv",
+        help="csv rebuilds output_results/; parquet and arrow write partitioned "
+        "files of the extraction and classification tables (needs pyarrow)",
+    )
+    parser.add_argument("--filename", help="Only export this document (csv)")
+    parser.add_argument(
+        "--output-dir",
+        help=f"Output folder (default: {OUTPUT_DIR} for csv, exports/ otherwise)",
+    )
+    parser.add_argument(
+        "--table",
+        action="append",
+        choices=TABLES,
+        help="Table to export (repeatable, default: all)",
+    )
+    parser.add_argument("--since", help="First day to export, YYYY-MM-DD (UTC)")
+    parser.add_argument("--until", help="Last day to export, YYYY-MM-DD (UTC)")
+    parser.add_argument("--project-id", help="Only export this project")
+    parser.add_argument("--document-type", help="Only export this document type ID")
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=EXPORT_CHUNK_ROWS,
+        help=f"Rows held in memory per batch (default: {EXPORT_CHUNK_ROWS})",
+    )
+    args = parser.parse_args()
+
+    # Upgrade databases written by older versions before reading them
+    run_migrations(get_connection())
+
+    if args.format == "csv":
+        output_dir = args.output_dir or OUTPUT_DIR
+        try:
+            exported = export_all_results(args.filename, output_dir)
+        except sqlite3.Error as e:
+            print(f"SQLite error: {e}")
+            return
+        print(f"Exported {exported} CSV file(s) to {output_dir}")
+        return
+
+    output_dir = args.output_dir or "exports"
+    try:
+        written = export_tables(
+            output_dir,
+            tables=args.table or TABLES,
+            file_format=args.format,
+            since=args.since,
+            until=args.until,
+            project_id=args.project_id,
+            document_type_id=args.document_type,
+            chunk_rows=args.chunk_rows,
+        )
+    except RuntimeError as e:
+        print(e)
+        return
+    print(
+        f"Exported {sum(written.values())} rows to {len(written)} "
+        f"{args.format} partition(s) in {output_dir}"
+    )
+
+
+if __name__ == "__main__":
+    main()
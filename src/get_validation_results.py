@@ -1,34 +1,55 @@
-import os
 import sqlite3
-from dotenv import load_dotenv
-from project_config import SQLITE_DB_PATH
-from utils.auth import initialize_authentication
+from project_config import BASE_URL
+from utils.auth import get_authentication
+from utils.circuit_breaker import OPEN, HALF_OPEN
+from utils.db_utils import (
+    execute_query,
+    get_circuit_breaker_states,
+    get_connection,
+    get_parked_documents,
+)
+from utils.migrations import run_migrations
+from utils.result_model import validation_status
+from utils.token_provider import TokenProvider
 from utils.write_results import WriteResults
 from modules.async_request_handler import submit_validation_request
 
 
-# Load environment variables and initialize authentication
-load_dotenv()
-base_url = os.getenv("BASE_URL")
-
-auth = initialize_authentication()
-bearer_token = auth.bearer_token
-
-
 def get_extraction_validation_submitted_ids():
     """Fetches all validation_extraction_operation_id for records with stage 'extraction-validation-submitted'."""
-    connection = sqlite3.connect(SQLITE_DB_PATH)
-    cursor = connection.cursor()
     query = "SELECT filename, document_id, extraction_validation_operation_id, project_id, extractor_id FROM documents WHERE stage = 'extraction-validation-submitted'"
-    cursor.execute(query)
-    results = cursor.fetchall()
-    connection.close()
-    return results
+    return execute_query(query)
+
+
+def report_circuit_breakers():
+    """Print classifiers and extractors whose circuit is not closed."""
+    try:
+        states = get_circuit_breaker_states()
+    except sqlite3.Error as e:
+        print(f"Unable to read circuit breaker state: {e}")
+        return
+
+    for key, state, failure_count, opened_at in states:
+        if state in {OPEN, HALF_OPEN}:
+            print(
+                f"Circuit {state} for {key} after {failure_count} failures; "
+                f"documents may be parked."
+            )
+
+    parked = get_parked_documents()
+    if parked:
+        print(
+            f"{len(parked)} documents are parked; run main.py on their folder again "
+            f"to resubmit them."
+        )
 
 
 def process_validation_requests():
     """Submits validation requests for each operation ID with the appropriate project and extractor IDs."""
+    report_circuit_breakers()
     extraction_ids = get_extraction_validation_submitted_ids()
+    # Authenticates on the first call, so importing this module stays offline
+    token_provider = TokenProvider(get_authentication())
 
     for (
         filename,
@@ -40,21 +61,15 @@ def process_validation_requests():
         if extraction_validation_operation_id:
             validation_results = submit_validation_request(
                 action="extraction_validation",
-                bearer_token=bearer_token,
-                base_url=base_url,
+                bearer_token=token_provider,
+                base_url=BASE_URL,
                 project_id=project_id,
                 operation_id=extraction_validation_operation_id,
                 module_id=extractor_id,
             )
 
             # Check if validation result indicates completion
-            if (
-                isinstance(validation_results, dict)
-                and validation_results.get("result", {})
-                .get("actionData", {})
-                .get("status")
-                == "Completed"
-            ):
+            if validation_status(validation_results) == "Completed":
                 print(
                     f"Validation Result for Document ID {document_id} has been completed."
                 )
@@ -82,4 +97,6 @@ def write_validated_results(validated_results, extraction_results, document_path
 
 
 if __name__ == "__main__":
+    # Upgrade databases written by older versions before scanning them
+    run_migrations(get_connection())
     process_validation_requests()
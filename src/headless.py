@@ -0,0 +1,153 @@
+import argparse
+import json
+from project_config import (
+    HEADLESS_CONFIG,
+    DocumentProcessingContext,
+    ProcessingConfig,
+)
+
+DEFAULT_DOCUMENT_FOLDER = "example_documents"
+
+# ProcessingConfig flags and their defaults
+_FLAGS = {
+    "validate_classification": False,
+    "validate_extraction": False,
+    "validate_extraction_later": False,
+    "perform_classification": True,
+    "perform_extraction": True,
+}
+
+
+def load_headless_config(path: str) -> dict:
+    """
+    Read the settings of a headless run from a JSON file.
+
+    The file holds `project_id`, `classifier`, `extractors` (document type
+    ID -> {"id", "name"}, the layout Discovery builds), the ProcessingConfig
+    flags and an optional `document_folder`:
+
+        {
+            "project_id": "00000000-0000-0000-0000-000000000000",
+            "classifier": "ml-classification",
+            "extractors": {"invoices": {"id": "invoices", "name": "Invoices"}},
+            "validate_extraction": false,
+            "document_folder": "example_documents"
+        }
+
+    The cache written by an interactive run (cache/document_cache.json) is
+    accepted as well, so its answers can be reused unattended.
+    """
+    with open(path, "r", encoding="utf-8") as config_file:
+        data = json.load(config_file)
+    if not isinstance(data, dict):
+        raise ValueError(f"Headless config '{path}' must contain a JSON object")
+
+    if isinstance(data.get("project"), dict):
+        # Layout of the Discovery cache
+        project = data["project"]
+        settings = {key: data[key] for key in _FLAGS if key in data}
+        settings["project_id"] = project.get("id")
+        settings["classifier"] = (project.get("classifier_id") or {}).get("id")
+        settings["extractors"] = project.get("extractor_ids")
+        return settings
+    return data
+
+
+def parse_extractor(value: str) -> tuple[str, dict]:
+    """Parse a `DOCUMENT_TYPE=EXTRACTOR_ID` command line value."""
+    document_type_id, separator, extractor_id = value.partition("=")
+    if not separator or not document_type_id or not extractor_id:
+        raise argparse.ArgumentTypeError(
+            f"Expected DOCUMENT_TYPE=EXTRACTOR_ID, got '{value}'"
+        )
+    return document_type_id, {"id": extractor_id, "name": extractor_id}
+
+
+def add_headless_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of a headless (non-interactive) run to `parser`."""
+    group = parser.add_argument_group(
+        "headless mode",
+        "Run without prompts; settings come from --config and these options.",
+    )
+    group.add_argument(
+        "--headless",
+        action="store_true",
+        help="Skip the interactive Discovery prompts",
+    )
+    group.add_argument(
+        "--config",
+        default=HEADLESS_CONFIG,
+        help="JSON file with the run settings (implies --headless)",
+    )
+    group.add_argument("--project-id", help="Project to process documents in")
+    group.add_argument("--classifier", help="Classifier ID")
+    group.add_argument(
+        "--extractor",
+        action="append",
+        type=parse_extractor,
+        metavar="DOCUMENT_TYPE=EXTRACTOR_ID",
+        help="Extractor for a document type (repeatable)",
+    )
+    for flag in _FLAGS:
+        option = flag.removeprefix("perform_").replace("_", "-")
+        group.add_argument(
+            f"--{option}",
+            dest=flag,
+            action=argparse.BooleanOptionalAction,
+            default=None,
+            help=f"Override {flag} (default: {str(_FLAGS[flag]).lower()})",
+        )
+
+
+def is_headless(args: argparse.Namespace) -> bool:
+    return bool(args.headless or args.config)
+
+
+def headless_settings(
+    args: argparse.Namespace,
+) -> tuple[ProcessingConfig, DocumentProcessingContext, str]:
+    """
+    Build the ProcessingConfig, DocumentProcessingContext and document folder
+    of a headless run. Command line options override the config file.
+
+    Raises:
+        ValueError: If a required setting is missing.
+    """
+    settings = load_headless_config(args.config) if args.config else {}
+    if args.project_id:
+        settings["project_id"] = args.project_id
+    if args.classifier:
+        settings["classifier"] = args.classifier
+    if args.extractor:
+        settings["extractors"] = dict(args.extractor)
+    for flag in _FLAGS:
+        if getattr(args, flag) is not None:
+            settings[flag] = getattr(args, flag)
+    if getattr(args, "folder", None):
+        settings["document_folder"] = args.folder
+
+    config = ProcessingConfig(
+        **{flag: bool(settings.get(flag, default)) for flag, default in _FLAGS.items()}
+    )
+    # Modules of skipped steps are not passed on
+    classifier = settings.get("classifier") if config.perform_classification else None
+    extractors = settings.get("extractors") if config.perform_extraction else None
+    context = DocumentProcessingContext(
+        project_id=settings.get("project_id"),
+        classifier=classifier,
+        extractor_dict=extractors,
+    )
+
+    if not context.project_id:
+        raise ValueError("A headless run needs a project ID (--project-id)")
+    if config.perform_classification and not context.classifier:
+        raise ValueError(
+            "Classification is enabled but no classifier is set "
+            "(--classifier, or --no-classification)"
+        )
+    if config.perform_extraction and not context.extractor_dict:
+        raise ValueError(
+            "Extraction is enabled but no extractor is set "
+            "(--extractor, or --no-extraction)"
+        )
+    return config, context, settings.get("document_folder") or DEFAULT_DOCUMENT_FOLDER
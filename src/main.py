@@ -1,16 +1,42 @@
+import argparse
+from headless import (
+    DEFAULT_DOCUMENT_FOLDER,
+    add_headless_arguments,
+    headless_settings,
+    is_headless,
+)
 from processor import DocumentProcessor
-from project_setup import initialize_environment
+from project_setup import initialize_environment, initialize_headless_environment
+from utils.http_session import get_session
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process documents in a folder.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Re-attach to operations left running in the cloud by an interrupted run",
+    )
+    parser.add_argument(
+        "--folder",
+        help=f"Folder containing the documents to process (default: {DEFAULT_DOCUMENT_FOLDER})",
+    )
+    add_headless_arguments(parser)
+    args = parser.parse_args()
+
     # Initialize environment (clients, config, context)
-    config, context, clients = initialize_environment()
+    if is_headless(args):
+        try:
+            config, context, DOCUMENT_FOLDER = headless_settings(args)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        config, context, clients = initialize_headless_environment(config, context)
+    else:
+        config, context, clients = initialize_environment()
+        DOCUMENT_FOLDER = args.folder or DEFAULT_DOCUMENT_FOLDER
 
     # Unpack the clients tuple into individual components
     digitize_client, classify_client, extract_client, validate_client = clients
 
-    # Define the document folder
-    DOCUMENT_FOLDER = "example_documents"
-
     # Create and run the processor
     processor = DocumentProcessor(
         digitize_client=digitize_client,
@@ -20,4 +46,13 @@ if __name__ == "__main__":
     )
 
     # Process documents in the folder
-    processor.process_documents_in_folder(DOCUMENT_FOLDER, config, context)
+    processor.process_documents_in_folder(
+        DOCUMENT_FOLDER, config, context, resume=args.resume
+    )
+
+    # Report how many requests reused a pooled connection
+    stats = get_session().stats()
+    print(
+        f"HTTP requests: {stats['requests']}, connections opened: "
+        f"{stats['connections_opened']}, reused: {stats['connections_reused']}"
+    )
@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+from async_processor import AsyncDocumentProcessor
+from modules.async_clients import (
+    AsyncDigitize,
+    AsyncClassify,
+    AsyncExtract,
+    AsyncValidate,
+)
+from headless import (
+    DEFAULT_DOCUMENT_FOLDER,
+    add_headless_arguments,
+    headless_settings,
+    is_headless,
+)
+from project_config import ASYNC_CONCURRENCY
+from project_setup import initialize_environment, initialize_headless_environment
+from utils.http_session import get_session
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Process a folder of documents on a single asyncio event loop."
+    )
+    parser.add_argument(
+        "--folder",
+        help=f"Folder containing the documents to process (default: {DEFAULT_DOCUMENT_FOLDER}).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=ASYNC_CONCURRENCY,
+        help="Maximum number of documents in flight at once.",
+    )
+    add_headless_arguments(parser)
+    args = parser.parse_args()
+    if is_headless(args):
+        try:
+            args.settings = headless_settings(args)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    # Initialize environment (clients, config, context)
+    if is_headless(args):
+        config, context, folder = args.settings
+        config, context, clients = initialize_headless_environment(config, context)
+    else:
+        config, context, clients = initialize_environment()
+        folder = args.folder or DEFAULT_DOCUMENT_FOLDER
+
+    # Wrap the thread-based clients with their asyncio counterparts
+    digitize_client, classify_client, extract_client, validate_client = clients
+
+    processor = AsyncDocumentProcessor(
+        digitize_client=AsyncDigitize(digitize_client),
+        classify_client=AsyncClassify(classify_client),
+        extract_client=AsyncExtract(extract_client),
+        validate_client=AsyncValidate(validate_client),
+    )
+
+    # Process documents in the folder
+    asyncio.run(
+        processor.process_documents_in_folder(
+            folder, config, context, concurrency=args.concurrency
+        )
+    )
+
+    # Report how many requests reused a pooled connection
+    stats = get_session().stats()
+    print(
+        f"HTTP requests: {stats['requests']}, connections opened: "
+        f"{stats['connections_opened']}, reused: {stats['connections_reused']}"
+    )
@@ -6,10 +6,30 @@ __all__ = [
     "Discovery",
     "submit_async_request",
     "submit_validation_request",
+    "start_async_request",
+    "start_validation_request",
+    "asubmit_async_request",
+    "asubmit_validation_request",
+    "AsyncDigitize",
+    "AsyncClassify",
+    "AsyncExtract",
+    "AsyncValidate",
+    "OperationPoller",
+    "PollAgain",
+    "get_poller",
 ]
 from .digitize import Digitize
 from .classify import Classify
 from .extract import Extract
 from .validate import Validate
 from .discovery import Discovery
-from .async_request_handler import submit_async_request, submit_validation_request
+from .async_request_handler import (
+    submit_async_request,
+    submit_validation_request,
+    start_async_request,
+    start_validation_request,
+    asubmit_async_request,
+    asubmit_validation_request,
+)
+from .async_clients import AsyncDigitize, AsyncClassify, AsyncExtract, AsyncValidate
+from .poller import OperationPoller, PollAgain, get_poller
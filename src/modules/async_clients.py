@@ -0,0 +1,242 @@
+import asyncio
+from .digitize import Digitize
+from .classify import Classify
+from .extract import Extract
+from .validate import Validate
+from .async_request_handler import asubmit_async_request, asubmit_validation_request
+from utils.file_hash import hash_file
+
+
+class AsyncDigitize:
+    """
+    Asyncio counterpart of `Digitize`.
+
+    The upload runs in the default executor and the status polling is awaited
+    on the shared poller, so no thread is held while the operation runs.
+    """
+
+    def __init__(self, client: Digitize):
+        self.client = client
+
+    async def digitize(self, document_path: str) -> str | None:
+        """Digitize a document and handle caching."""
+        content_hash = await asyncio.to_thread(hash_file, document_path)
+        future, owner = self.client.claim_digitization(content_hash)
+        if not owner:
+            return await asyncio.wrap_future(future)
+
+        try:
+            document_id = await self._digitize(document_path, content_hash)
+        except BaseException as e:
+            self.client.release_digitization(content_hash, error=e)
+            raise
+        self.client.release_digitization(content_hash, document_id)
+        return document_id
+
+    async def _digitize(self, document_path: str, content_hash: str) -> str | None:
+        document_id, cached = await asyncio.to_thread(
+            self.client.start_digitization, document_path, content_hash
+        )
+        if cached or not document_id:
+            return document_id
+
+        digitize_results = await asubmit_async_request(
+            action=self.client.action,
+            base_url=self.client.base_url,
+            project_id=self.client.project_id,
+            module_id="digitization",
+            operation_id=document_id,
+            document_id=document_id,
+            bearer_token=self.client.token_provider,
+            session=self.client.session,
+        )
+        return await asyncio.to_thread(
+            self.client.finish_digitization, document_path, digitize_results
+        )
+
+
+class AsyncClassify:
+    """Asyncio counterpart of `Classify`."""
+
+    def __init__(self, client: Classify):
+        self.client = client
+
+    async def classify_document(
+        self,
+        document_path: str,
+        document_id: str,
+        classifier: str,
+        classification_prompts: dict,
+        validate_classification: bool = False,
+    ) -> dict | list | None:
+        cached = await asyncio.to_thread(
+            self.client.result_cache.get_entry,
+            document_id,
+            classifier,
+            None,
+            classification_prompts,
+        )
+        if cached is not None:
+            print(f"Using cached classification results for document {document_id}")
+            classification_results, operation_id = cached
+            self.client.record_cached_classification(
+                document_id, classifier, operation_id
+            )
+            return await asyncio.to_thread(
+                self.client.finish_classification,
+                document_path,
+                classification_results,
+                operation_id,
+                validate_classification,
+                store=False,
+            )
+
+        operation_id = await asyncio.to_thread(
+            self.client.start_classification,
+            document_id,
+            classifier,
+            classification_prompts,
+        )
+        if not operation_id:
+            return None
+
+        classification_results = await asubmit_async_request(
+            action="classification",
+            base_url=self.client.base_url,
+            project_id=self.client.project_id,
+            module_id=classifier,
+            operation_id=operation_id,
+            document_id=document_id,
+            bearer_token=self.client.token_provider,
+            session=self.client.session,
+        )
+        await asyncio.to_thread(
+            self.client.result_cache.put,
+            document_id,
+            classifier,
+            None,
+            classification_prompts,
+            classification_results,
+            operation_id,
+        )
+        return await asyncio.to_thread(
+            self.client.finish_classification,
+            document_path,
+            classification_results,
+            operation_id,
+            validate_classification,
+        )
+
+
+class AsyncExtract:
+    """Asyncio counterpart of `Extract`."""
+
+    def __init__(self, client: Extract):
+        self.client = client
+
+    async def extract_document(
+        self,
+        extractor_id: str,
+        document_id: str,
+        page_range: str = None,
+        prompts: dict = None,
+    ) -> dict | None:
+        cached_results = await asyncio.to_thread(
+            self.client.result_cache.get, document_id, extractor_id, page_range, prompts
+        )
+        if cached_results is not None:
+            print(f"Using cached extraction results for document {document_id}")
+            return cached_results
+
+        operation_id = await asyncio.to_thread(
+            self.client.start_extraction,
+            extractor_id,
+            document_id,
+            page_range,
+            prompts,
+        )
+        if not operation_id:
+            return None
+
+        # Tracked like the sync client so the pending row is cleared and the
+        # result cached when the operation completes
+        return await asyncio.wrap_future(
+            self.client.track_extraction(
+                extractor_id, document_id, operation_id, page_range, prompts
+            )
+        )
+
+
+class AsyncValidate:
+    """Asyncio counterpart of `Validate`."""
+
+    def __init__(self, client: Validate):
+        self.client = client
+
+    async def validate_extraction_results(
+        self,
+        filename: str,
+        extractor_id: str,
+        document_id: str,
+        extraction_results: dict,
+        extraction_prompts: dict,
+        validate_extraction_later: bool = False,
+    ) -> dict | None:
+        operation_id = await asyncio.to_thread(
+            self.client.start_extraction_validation,
+            filename,
+            extractor_id,
+            document_id,
+            extraction_results,
+            extraction_prompts,
+        )
+        if not operation_id:
+            return None
+
+        if validate_extraction_later:
+            print(
+                f"Validation request for document {document_id} submitted and deferred."
+            )
+            return None
+
+        validation_result = await asubmit_validation_request(
+            action="extraction_validation",
+            bearer_token=self.client.token_provider,
+            base_url=self.client.base_url,
+            project_id=self.client.project_id,
+            operation_id=operation_id,
+            module_id=extractor_id,
+            session=self.client.session,
+        )
+        print("Extraction Validation Complete!\n")
+        return validation_result
+
+    async def validate_classification_results(
+        self,
+        document_id: str,
+        classifier_id: str,
+        classification_results: dict,
+        classificastion_prompts: dict,
+    ) -> str | None:
+        operation_id = await asyncio.to_thread(
+            self.client.start_classification_validation,
+            document_id,
+            classifier_id,
+            classification_results,
+            classificastion_prompts,
+        )
+        if not operation_id:
+            return None
+
+        validation_result = await asubmit_validation_request(
+            action="classification_validation",
+            bearer_token=self.client.token_provider,
+            base_url=self.client.base_url,
+            project_id=self.client.project_id,
+            operation_id=operation_id,
+            module_id=classifier_id,
+            session=self.client.session,
+        )
+        return await asyncio.to_thread(
+            self.client.finish_classification_validation, validation_result
+        )
@@ -1,7 +1,27 @@
 import time
+import asyncio
 import requests
+from concurrent.futures import Future
 from datetime import datetime
+from project_config import VALIDATION_POLL_INTERVAL
+from utils.circuit_breaker import (
+    CircuitBreaker,
+    get_circuit_breaker,
+    is_unavailable_error,
+)
 from utils.db_utils import update_document_stage
+from utils.futures import resolved
+from utils.http_session import HttpSession, get_session
+from utils.json_codec import parse_response
+from utils.rate_limiter import ThrottledError
+from utils.response_archive import get_response_archive
+from utils.result_model import validation_status
+from utils.token_provider import TokenProvider, as_token_provider
+from .poller import OperationPoller, PollAgain, get_poller
+from .polling_policy import PollingPolicy, get_polling_policy
+
+# Error codes of failed operations showing the classifier/extractor is unavailable
+MODULE_UNAVAILABLE_ERRORS = {"[IxpExtractorUnavailableError]"}
 
 
 def _log_error(action, document_id, operation_id, error_code, error_message):
@@ -17,19 +37,52 @@ def _log_error(action, document_id, operation_id, error_code, error_message):
     )
 
 
-def submit_async_request(
+def _park(action, document_id, operation_id, error_code, error_message):
+    print(f"{action.capitalize()} parked for document {document_id}: circuit is open.")
+    update_document_stage(
+        action=action,
+        document_id=document_id,
+        new_stage=f"{action}_parked",
+        operation_id=operation_id,
+        error_code=error_code,
+        error_message=error_message,
+    )
+
+
+def start_async_request(
     action: str,
     base_url: str,
     project_id: str,
     module_id: str,
     operation_id: str,
     document_id: str,
-    bearer_token: str,
+    bearer_token: str | TokenProvider,
     max_retries: int = 15,  # Maximum retries for errors
     retry_delay: float = 2.0,  # Initial delay for retries
-) -> dict:
+    session: HttpSession | None = None,
+    poller: OperationPoller | None = None,
+    policy: PollingPolicy | None = None,
+) -> Future:
+    """
+    Register an asynchronous operation with the shared poller.
+
+    The first poll is delayed until shortly before the expected completion
+    time learned by the polling policy, then polls back off with jitter.
+
+    Successful results are stored in the response archive before the future
+    resolves.
+
+    Operations failing because the classifier or extractor is unavailable
+    are counted by its circuit breaker, and a half-open probe is released
+    however the operation ends. Once the circuit is open, documents waiting on an unavailable module are
+    parked with an `{action}_parked` stage instead of backing off one by one.
+
+    Returns immediately with a future that resolves to the operation result,
+    or to None if the operation failed. The calling thread is not blocked.
+    """
     classifier_id = None
     extractor_id = None
+    breaker: CircuitBreaker | None = None
 
     if action.startswith("digitization") and module_id:
         api_url = (
@@ -38,30 +91,54 @@ def submit_async_request(
     elif action.startswith("classification") and module_id:
         api_url = f"{base_url}{project_id}/classifiers/{module_id}/classification/result/{operation_id}?api-version=1.1"
         classifier_id = module_id
+        breaker = get_circuit_breaker("classifier", module_id)
     elif action.startswith("extraction") and module_id:
         api_url = f"{base_url}{project_id}/extractors/{module_id}/extraction/result/{operation_id}?api-version=1.1"
         extractor_id = module_id
+        breaker = get_circuit_breaker("extractor", module_id)
     else:
         print("Invalid action or missing Module ID for extraction.")
-        return None
+        return resolved(None)
 
-    headers = {
-        "accept": "application/json",
-        "Authorization": f"Bearer {bearer_token}",
-    }
+    tokens = as_token_provider(bearer_token)
+    session = session or get_session()
+    policy = policy or get_polling_policy()
     start_time = time.time()
     retries = 0
+    polls = 0
 
-    while True:
+    def poll():
+        nonlocal retries, polls
+        polls += 1
         try:
-            response = requests.get(api_url, headers=headers, timeout=60)
-            response.raise_for_status()
-            response_data = response.json()
+            # Streamed so that large results can be parsed incrementally
+            # The token is read per poll so long waits outlive its expiry
+            headers = {
+                "accept": "application/json",
+                "Authorization": f"Bearer {tokens.token()}",
+            }
+            response = session.get(
+                api_url,
+                headers=headers,
+                token_provider=tokens,
+                timeout=60,
+                retry_throttled=False,
+                stream=True,
+            )
+            try:
+                response.raise_for_status()
+                response_data = parse_response(response, stream=True)
+            finally:
+                # Returns the connection to the pool
+                response.close()
 
             if response_data["status"] == "Succeeded":
                 end_time = time.time()
                 duration = end_time - start_time
                 print(f"{action.capitalize()} completed successfully!")
+                policy.record(action, module_id, duration)
+                if breaker:
+                    breaker.record_success()
 
                 update_document_stage(
                     action=action,
@@ -72,19 +149,34 @@ def submit_async_request(
                     classifier_id=classifier_id,
                     extractor_id=extractor_id,
                 )
-                return response_data.get("result")
+                result = response_data.get("result")
+                get_response_archive().store(
+                    document_id, action, module_id, operation_id, result, project_id
+                )
+                return result
 
             elif response_data["status"] in {"NotStarted", "Running"}:
                 print(f"{action.capitalize()} status: {response_data['status']}...")
-                time.sleep(1)
-                continue
+                raise PollAgain(policy.next_delay(action, module_id, polls))
 
             else:  # Handle failure states
                 error_code = response_data.get("error", {}).get("code")
                 error_message = response_data.get("error", {}).get("message")
                 _log_error(action, document_id, operation_id, error_code, error_message)
 
-                if error_code == "[IxpExtractorUnavailableError]":
+                if error_code in MODULE_UNAVAILABLE_ERRORS:
+                    if breaker:
+                        breaker.record_failure()
+                        if breaker.is_open():
+                            # Stop retrying until the module passes a probe request
+                            _park(
+                                action,
+                                document_id,
+                                operation_id,
+                                error_code,
+                                error_message,
+                            )
+                            return None
                     if retries < max_retries:
                         retries += 1
                         delay = retry_delay * (
@@ -93,8 +185,7 @@ def submit_async_request(
                         print(
                             f"Retrying due to error: {error_code}. Retry {retries}/{max_retries} in {delay} seconds..."
                         )
-                        time.sleep(delay)
-                        continue  # Retry the loop
+                        raise PollAgain(delay)  # Retry on the shared schedule
                     else:
                         raise RuntimeError(
                             f"Maximum retries reached for error {error_code}. Unable to complete the request."
@@ -105,8 +196,18 @@ def submit_async_request(
                     f"Operation {action} failed: {error_message} (Error Code: {error_code})"
                 )
 
+        except PollAgain:
+            raise
+        except ThrottledError as te:
+            # Re-queue the poll once the throttling window has passed
+            print(
+                f"{action.capitalize()} poll throttled. Retrying in {te.retry_after:.1f} seconds..."
+            )
+            raise PollAgain(te.retry_after)
         except requests.exceptions.RequestException as e:
             _log_error(action, document_id, operation_id, "NetworkError", str(e))
+            if breaker and is_unavailable_error(e):
+                breaker.record_failure()
         except KeyError as ke:
             _log_error(action, document_id, operation_id, "KeyError", str(ke))
         except Exception as ex:
@@ -114,22 +215,90 @@ def submit_async_request(
 
         return None
 
+    future = (poller or get_poller()).track(
+        operation_id, poll, first_delay=policy.first_delay(action, module_id)
+    )
+    if breaker:
+        # No-op unless the operation ended without recording success or failure
+        future.add_done_callback(lambda _: breaker.release_probe())
+    return future
+
 
-def submit_validation_request(
+def submit_async_request(
+    action: str,
+    base_url: str,
+    project_id: str,
+    module_id: str,
+    operation_id: str,
+    document_id: str,
+    bearer_token: str | TokenProvider,
+    max_retries: int = 15,  # Maximum retries for errors
+    retry_delay: float = 2.0,  # Initial delay for retries
+    session: HttpSession | None = None,
+) -> dict:
+    """Wait for an asynchronous operation tracked by the shared poller."""
+    return start_async_request(
+        action=action,
+        base_url=base_url,
+        project_id=project_id,
+        module_id=module_id,
+        operation_id=operation_id,
+        document_id=document_id,
+        bearer_token=bearer_token,
+        max_retries=max_retries,
+        retry_delay=retry_delay,
+        session=session,
+    ).result()
+
+
+async def asubmit_async_request(
+    action: str,
+    base_url: str,
+    project_id: str,
+    module_id: str,
+    operation_id: str,
+    document_id: str,
+    bearer_token: str | TokenProvider,
+    max_retries: int = 15,  # Maximum retries for errors
+    retry_delay: float = 2.0,  # Initial delay for retries
+    session: HttpSession | None = None,
+) -> dict:
+    """Await an asynchronous operation without holding a thread while it runs."""
+    return await asyncio.wrap_future(
+        start_async_request(
+            action=action,
+            base_url=base_url,
+            project_id=project_id,
+            module_id=module_id,
+            operation_id=operation_id,
+            document_id=document_id,
+            bearer_token=bearer_token,
+            max_retries=max_retries,
+            retry_delay=retry_delay,
+            session=session,
+        )
+    )
+
+
+def start_validation_request(
     action: str,
-    bearer_token: str,
+    bearer_token: str | TokenProvider,
     base_url: str,
     project_id: str,
     operation_id: str,
     module_id: str = None,
-) -> dict | None:
+    session: HttpSession | None = None,
+    poller: OperationPoller | None = None,
+    policy: PollingPolicy | None = None,
+) -> Future:
     """
-    Submits a validation request (either for classification or extraction) and waits for the process to complete.
+    Register a validation operation with the shared poller.
 
     :param action: Type of validation ("classification" or "extraction")
     :param operation_id: Operation ID to check the result status
     :param extractor_id: Extractor ID (required for extraction validation)
-    :return: The result data if successful, otherwise None
+    :param session: Shared HTTP session to poll with (defaults to the process-wide session)
+    :return: A future resolved with the result data if successful, otherwise None
     """
     classifier_id = None
     extractor_id = None
@@ -142,94 +311,121 @@ def submit_validation_request(
         extractor_id = module_id
     else:
         print("Invalid action or missing extractor ID for extraction.")
-        return None
+        return resolved(None)
 
-    headers = {
-        "accept": "application/json",
-        "Authorization": f"Bearer {bearer_token}",
-    }
+    tokens = as_token_provider(bearer_token)
+    session = session or get_session()
+    policy = policy or get_polling_policy()
+    submitted = False
+    polls = 0
 
-    try:
-        while True:
-            response = requests.get(api_url, headers=headers, timeout=60)
-            response_data = response.json()
+    def poll():
+        nonlocal submitted, polls
+        polls += 1
+        try:
+            # The token is read per poll so long waits outlive its expiry
+            headers = {
+                "accept": "application/json",
+                "Authorization": f"Bearer {tokens.token()}",
+            }
+            response = session.get(
+                api_url,
+                headers=headers,
+                token_provider=tokens,
+                timeout=60,
+                retry_throttled=False,
+                stream=True,
+            )
+            try:
+                response_data = parse_response(response, stream=True)
+            finally:
+                response.close()
 
             if response_data.get("status") == "Succeeded":
-                print(
-                    f"{action.capitalize()} Validation request submitted successfully!"
-                )
-                while True:
-                    response = requests.get(api_url, headers=headers, timeout=60)
-                    response_data = response.json()
-
-                    action_data_status = (
-                        response_data.get("result", {})
-                        .get("actionData", {})
-                        .get("status")
+                if not submitted:
+                    print(
+                        f"{action.capitalize()} Validation request submitted successfully!"
                     )
+                    submitted = True
+
+                action_data_status = validation_status(response_data)
 
-                    if action_data_status is None:
-                        print("Error: Missing actionData status in response.")
-                        return None
+                if action_data_status is None:
+                    print("Error: Missing actionData status in response.")
+                    return None
 
+                print(
+                    f"Validate Document {action.capitalize()} action status: {action_data_status}"
+                )
+
+                if action_data_status == "Unassigned":
                     print(
-                        f"Validate Document {action.capitalize()} action status: {action_data_status}"
+                        f"Validation Document {action.capitalize()} is unassigned. Waiting..."
                     )
-
-                    if action_data_status == "Unassigned":
-                        print(
-                            f"Validation Document {action.capitalize()} is unassigned. Waiting..."
-                        )
-                    elif action_data_status == "Pending":
-                        print(
-                            f"Validate Document {action.capitalize()} in progress. Waiting..."
-                        )
-                    elif action_data_status == "Completed":
-                        print(f"Validate Document {action.capitalize()} is completed.")
-                        # Extract document ID based on action type
-                        document_key = (
-                            "validatedExtractionResults"
-                            if action == "extraction_validation"
-                            else "validatedClassificationResults"
-                        )
-                        if action == "classification_validation":
-                            document_id = response_data["result"][document_key][0][
-                                "DocumentId"
-                            ]
-                        else:
-                            document_id = response_data["result"][document_key][
-                                "DocumentId"
-                            ]
-
-                        # Parse start and end times
-                        start_time_str = response_data["result"]["actionData"][
-                            "lastAssignedTime"  ## Not valid if directly assigned!
+                elif action_data_status == "Pending":
+                    print(
+                        f"Validate Document {action.capitalize()} in progress. Waiting..."
+                    )
+                elif action_data_status == "Completed":
+                    print(f"Validate Document {action.capitalize()} is completed.")
+                    # Extract document ID based on action type
+                    document_key = (
+                        "validatedExtractionResults"
+                        if action == "extraction_validation"
+                        else "validatedClassificationResults"
+                    )
+                    if action == "classification_validation":
+                        document_id = response_data["result"][document_key][0][
+                            "DocumentId"
                         ]
-                        end_time_str = response_data["result"]["actionData"][
-                            "completionTime"
+                    else:
+                        document_id = response_data["result"][document_key][
+                            "DocumentId"
                         ]
-                        start_time = datetime.fromisoformat(
-                            start_time_str.replace("Z", "+00:00")
-                        )
-                        end_time = datetime.fromisoformat(
-                            end_time_str.replace("Z", "+00:00")
-                        )
 
-                        # Calculate duration
-                        duration = (end_time - start_time).total_seconds()
-                        update_document_stage(
-                            document_id=document_id,
-                            action=action,
-                            new_stage=action,
-                            duration=duration,
-                            operation_id=operation_id,
-                            classifier_id=classifier_id,
-                            extractor_id=extractor_id,
-                        )
-                        return response_data
-                    else:
-                        print("Unknown validation action status.")
-                    time.sleep(5)  # Wait for 5 seconds before checking again
+                    # Parse start and end times
+                    start_time_str = response_data["result"]["actionData"][
+                        "lastAssignedTime"  ## Not valid if directly assigned!
+                    ]
+                    end_time_str = response_data["result"]["actionData"][
+                        "completionTime"
+                    ]
+                    start_time = datetime.fromisoformat(
+                        start_time_str.replace("Z", "+00:00")
+                    )
+                    end_time = datetime.fromisoformat(
+                        end_time_str.replace("Z", "+00:00")
+                    )
+
+                    # Calculate duration
+                    duration = (end_time - start_time).total_seconds()
+                    policy.record(action, module_id, duration)
+                    update_document_stage(
+                        document_id=document_id,
+                        action=action,
+                        new_stage=action,
+                        duration=duration,
+                        operation_id=operation_id,
+                        classifier_id=classifier_id,
+                        extractor_id=extractor_id,
+                    )
+                    get_response_archive().store(
+                        document_id,
+                        action,
+                        module_id,
+                        operation_id,
+                        response_data,
+                        project_id,
+                    )
+                    return response_data
+                else:
+                    print("Unknown validation action status.")
+                # Wait before checking the action again
+                raise PollAgain(
+                    policy.next_delay(
+                        action, module_id, polls, VALIDATION_POLL_INTERVAL
+                    )
+                )
 
             elif response_data.get("status") == "NotStarted":
                 print(
@@ -246,12 +442,77 @@ def submit_validation_request(
             else:
                 print(f"{action.capitalize()} Validation request failed...")
                 return None
+            raise PollAgain(policy.next_delay(action, module_id, polls))
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error submitting {action} validation request: {e}")
-    except KeyError as ke:
-        print(f"KeyError: {ke}")
-        return None
-    except Exception as ex:
-        print(f"An error occurred during {action} validation: {ex}")
-        return None
+        except PollAgain:
+            raise
+        except ThrottledError as te:
+            # Re-queue the poll once the throttling window has passed
+            print(
+                f"{action.capitalize()} poll throttled. Retrying in {te.retry_after:.1f} seconds..."
+            )
+            raise PollAgain(te.retry_after)
+        except requests.exceptions.RequestException as e:
+            print(f"Error submitting {action} validation request: {e}")
+        except KeyError as ke:
+            print(f"KeyError: {ke}")
+            return None
+        except Exception as ex:
+            print(f"An error occurred during {action} validation: {ex}")
+            return None
+
+    # Validation durations measure reviewer time rather than time since
+    # submission, so only the backoff between polls is taken from the policy
+    return (poller or get_poller()).track(operation_id, poll)
+
+
+def submit_validation_request(
+    action: str,
+    bearer_token: str | TokenProvider,
+    base_url: str,
+    project_id: str,
+    operation_id: str,
+    module_id: str = None,
+    session: HttpSession | None = None,
+) -> dict | None:
+    """
+    Submits a validation request (either for classification or extraction) and waits for the process to complete.
+
+    :param action: Type of validation ("classification" or "extraction")
+    :param operation_id: Operation ID to check the result status
+    :param extractor_id: Extractor ID (required for extraction validation)
+    :param session: Shared HTTP session to poll with (defaults to the process-wide session)
+    :return: The result data if successful, otherwise None
+    """
+    return start_validation_request(
+        action=action,
+        bearer_token=bearer_token,
+        base_url=base_url,
+        project_id=project_id,
+        operation_id=operation_id,
+        module_id=module_id,
+        session=session,
+    ).result()
+
+
+async def asubmit_validation_request(
+    action: str,
+    bearer_token: str | TokenProvider,
+    base_url: str,
+    project_id: str,
+    operation_id: str,
+    module_id: str = None,
+    session: HttpSession | None = None,
+) -> dict | None:
+    """Await a validation operation without holding a thread while it runs."""
+    return await asyncio.wrap_future(
+        start_validation_request(
+            action=action,
+            bearer_token=bearer_token,
+            base_url=base_url,
+            project_id=project_id,
+            operation_id=operation_id,
+            module_id=module_id,
+            session=session,
+        )
+    )
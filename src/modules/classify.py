@@ -1,61 +1,75 @@
 import requests
-from .async_request_handler import submit_async_request
+from concurrent.futures import Future
+from .async_request_handler import start_async_request
 from utils.db_utils import update_document_stage, insert_classification_results
+from utils.circuit_breaker import get_circuit_breaker, is_unavailable_error
+from utils.futures import resolved, then
+from utils.http_session import get_session
+from utils.token_provider import as_token_provider
+from utils.json_codec import parse_response
+from utils.rate_limiter import ThrottledError
+from utils.result_cache import ResultCache, get_result_cache
+from utils.result_model import ClassificationResult, parse_classifications
 
 
 class Classify:
-    def __init__(self, base_url, project_id, bearer_token):
+    def __init__(
+        self,
+        base_url,
+        project_id,
+        bearer_token,
+        session=None,
+        result_cache: ResultCache | None = None,
+    ):
         self.base_url = base_url
         self.project_id = project_id
-        self.bearer_token = bearer_token
+        self.token_provider = as_token_provider(bearer_token)
+        self.session = session or get_session()
+        self.result_cache = result_cache or get_result_cache()
+
+    @property
+    def bearer_token(self) -> str:
+        """Current bearer token; read on every request so refreshed tokens are used."""
+        return self.token_provider.token()
 
     def _parse_classification_results(
         self,
         classification_results: dict,
         filename: str,
         operation_id: str,
-    ):
+        store: bool = True,
+    ) -> list[ClassificationResult] | None:
         try:
-            # Initialize variables
-            document_id = None
-            document_type_id = None
-            classification_confidence = None
-            start_page = None
-            page_count = None
-            classifier_name = None
-
-            # Parse classification results to find the document type, confidence, start_page, and page_count
-            for result in classification_results["classificationResults"]:
-                document_id = result["DocumentId"]
-                document_type_id = result["DocumentTypeId"]
-                classification_confidence = result["Confidence"]
-                start_page = result["DocumentBounds"]["StartPage"]
-                page_count = result["DocumentBounds"]["PageCount"]
-                classifier_name = result["ClassifierName"]
-
-                # Insert the classification results into the SQLite database
-                insert_classification_results(
-                    document_id,
-                    filename,
-                    document_type_id,
-                    classification_confidence,
-                    start_page,
-                    page_count,
-                    classifier_name,
-                    operation_id,
-                )
+            classifications = parse_classifications(classification_results)
+            # Insert the classification results into the SQLite database
+            for result in classifications if store else ():
+                insert_classification_results(*result.row(filename, operation_id))
+            return classifications
         except ValueError as ve:
             print(f"Error parsing JSON response: {ve}")
             return None
 
-    def classify_document(
+    def start_classification(
         self,
-        document_path: str,
         document_id: str,
         classifier: str,
         classification_prompts: dict,
-        validate_classification: bool = False,
-    ) -> dict | None:
+    ) -> str | None:
+        """Submit a document for classification and return the operation ID."""
+        # Fail fast while the classifier is known to be unavailable
+        breaker = get_circuit_breaker("classifier", classifier)
+        if not breaker.allow_request():
+            print(
+                f"Circuit open for classifier {classifier}; parking document {document_id}."
+            )
+            update_document_stage(
+                action="classification",
+                document_id=document_id,
+                operation_id=None,
+                new_stage="classification_parked",
+            )
+            return None
+
         # Update the cache to indicate the classification process has started
         update_document_stage(
             action="classification",
@@ -75,58 +89,196 @@ class Classify:
 
         data = {"documentId": f"{document_id}", **(classification_prompts or {})}
 
+        operation_id = None
         try:
-            response = requests.post(api_url, json=data, headers=headers, timeout=60)
+            response = self.session.post(
+                api_url,
+                json=data,
+                headers=headers,
+                token_provider=self.token_provider,
+                timeout=60,
+            )
             response.raise_for_status()  # Raise an exception for HTTP errors
 
             if response.status_code == 202:
                 print("Document submitted for classification!")
-                response_data = response.json()
+                response_data = parse_response(response)
                 # Extract and return operationId
                 operation_id = response_data.get("operationId")
-
-                # Wait until classification request is completed
                 if operation_id:
-                    classification_results = submit_async_request(
+                    # Persist the operation so an interrupted run can resume it
+                    update_document_stage(
                         action="classification",
-                        base_url=self.base_url,
-                        project_id=self.project_id,
-                        module_id=classifier,
-                        operation_id=operation_id,
                         document_id=document_id,
-                        bearer_token=self.bearer_token,
-                    )
-
-                    if validate_classification:
-                        return classification_results
-
-                    self._parse_classification_results(
-                        classification_results, document_path, operation_id
-                    )
-
-                    # Extract all classified document type IDs along with their PageRanges
-                    document_classifications = [
-                        (
-                            result["DocumentTypeId"],
-                            result["DocumentBounds"]["PageRange"],
-                        )
-                        for result in classification_results.get(
-                            "classificationResults", []
-                        )
-                    ]
-
-                    print(
-                        f"Classification results for {document_path}: {document_classifications}"
+                        operation_id=operation_id,
+                        new_stage="classify-pending",
+                        classifier_id=classifier,
                     )
-
-                    return document_classifications
+                    return operation_id
 
             print(f"Error: {response.status_code} - {response.text}")
             return None
 
+        except ThrottledError as te:
+            # Still throttled after the session's retries; park the document
+            # so the next run submits it again
+            print(f"Classification request throttled; parking document {document_id}.")
+            update_document_stage(
+                action="classification",
+                document_id=document_id,
+                operation_id=None,
+                new_stage="classification_parked",
+                error_code="Throttled",
+                error_message=str(te),
+            )
         except requests.exceptions.RequestException as e:
+            if is_unavailable_error(e):
+                breaker.record_failure()
             print(f"Error submitting classification request: {e}")
             # Handle network-related errors
         except Exception as ex:
             print(f"An error occurred during classification: {ex}")
             # Handle any other unexpected errors
+        finally:
+            # A half-open probe that never got an operation frees the next probe
+            if not operation_id:
+                breaker.release_probe()
+
+    def finish_classification(
+        self,
+        document_path: str,
+        classification_results: dict | None,
+        operation_id: str,
+        validate_classification: bool = False,
+        store: bool = True,
+    ) -> dict | list | None:
+        """
+        Store classification results and return the classified page ranges.
+
+        Results served from the cache were stored by the run that produced
+        them, so they are passed with `store=False` to avoid duplicate rows.
+        """
+        try:
+            if validate_classification:
+                return classification_results
+
+            classifications = self._parse_classification_results(
+                classification_results, document_path, operation_id, store
+            )
+
+            # Extract all classified document type IDs along with their PageRanges
+            document_classifications = [
+                (result.document_type_id, result.page_range)
+                for result in classifications or []
+            ]
+
+            print(
+                f"Classification results for {document_path}: {document_classifications}"
+            )
+
+            return document_classifications
+
+        except Exception as ex:
+            print(f"An error occurred during classification: {ex}")
+            # Handle any other unexpected errors
+
+    def record_cached_classification(
+        self, document_id: str, classifier: str, operation_id: str | None
+    ) -> None:
+        """Advance the document stage for a classification served from the cache."""
+        # The operation that produced the cached result stands in for a new one
+        update_document_stage(
+            action="classification",
+            document_id=document_id,
+            new_stage="classification",
+            operation_id=operation_id,
+            classifier_id=classifier,
+        )
+
+    def track_classification(
+        self, document_id: str, classifier: str, operation_id: str
+    ) -> Future:
+        """Return a future of a started classification, including one started by an earlier run."""
+        return start_async_request(
+            action="classification",
+            base_url=self.base_url,
+            project_id=self.project_id,
+            module_id=classifier,
+            operation_id=operation_id,
+            document_id=document_id,
+            bearer_token=self.token_provider,
+            session=self.session,
+        )
+
+    def classify_future(
+        self,
+        document_path: str,
+        document_id: str,
+        classifier: str,
+        classification_prompts: dict,
+        validate_classification: bool = False,
+    ) -> Future:
+        """
+        Start a classification and return a future of its classified page ranges.
+
+        The raw results are returned instead when `validate_classification`
+        is set, for the validation request to submit.
+        """
+        cached = self.result_cache.get_entry(
+            document_id, classifier, None, classification_prompts
+        )
+        if cached is not None:
+            print(f"Using cached classification results for document {document_id}")
+            classification_results, operation_id = cached
+            self.record_cached_classification(document_id, classifier, operation_id)
+            return resolved(
+                self.finish_classification(
+                    document_path,
+                    classification_results,
+                    operation_id,
+                    validate_classification,
+                    store=False,
+                )
+            )
+
+        operation_id = self.start_classification(
+            document_id, classifier, classification_prompts
+        )
+        if not operation_id:
+            return resolved(None)
+
+        def finish(classification_results: dict | None) -> dict | list | None:
+            self.result_cache.put(
+                document_id,
+                classifier,
+                None,
+                classification_prompts,
+                classification_results,
+                operation_id,
+            )
+            return self.finish_classification(
+                document_path,
+                classification_results,
+                operation_id,
+                validate_classification,
+            )
+
+        return then(
+            self.track_classification(document_id, classifier, operation_id), finish
+        )
+
+    def classify_document(
+        self,
+        document_path: str,
+        document_id: str,
+        classifier: str,
+        classification_prompts: dict,
+        validate_classification: bool = False,
+    ) -> dict | None:
+        return self.classify_future(
+            document_path,
+            document_id,
+            classifier,
+            classification_prompts,
+            validate_classification,
+        ).result()
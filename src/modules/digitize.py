@@ -2,28 +2,53 @@ import os
 import logging
 import requests
 import mimetypes
-from .async_request_handler import submit_async_request
-from utils.db_utils import get_document_id_from_cache, update_cache
+import threading
+from concurrent.futures import Future
+from .async_request_handler import start_async_request
+from utils.db_utils import get_document_id_by_hash, update_cache
+from utils.file_hash import hash_file
+from utils.http_session import get_session
+from utils.token_provider import as_token_provider
+from utils.json_codec import parse_response
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+# Digitizations in flight by (content hash, project); identical files wait on
+# the first one instead of uploading the same content again
+_in_flight: dict[tuple[str, str], Future] = {}
+_in_flight_lock = threading.Lock()
+
 
 class Digitize:
-    def __init__(self, base_url, project_id, bearer_token):
+    def __init__(self, base_url, project_id, bearer_token, session=None):
         self.base_url = base_url
         self.project_id = project_id
-        self.bearer_token = bearer_token
+        self.token_provider = as_token_provider(bearer_token)
+        self.session = session or get_session()
         self.action = "digitization"
 
-    def _log_error(self, filename, action, error_code, error_message):
+    @property
+    def bearer_token(self) -> str:
+        """Current bearer token; read on every request so refreshed tokens are used."""
+        return self.token_provider.token()
+
+    def _log_error(self, filename, action, error_code, error_message, content_hash):
         """Log an error and update the database."""
         logging.error(
             f"{action.capitalize()} failed for {filename}. Code: {error_code}, Message: {error_message}"
         )
-        update_cache(filename, None, f"{action}_failed", error_code, error_message)
+        update_cache(
+            filename=filename,
+            document_id=None,
+            stage=f"{action}_failed",
+            project_id=self.project_id,
+            error_code=error_code,
+            error_message=error_message,
+            content_hash=content_hash,
+        )
 
     def _prepare_file(self, document_path: str):
         """Prepare the file for upload."""
@@ -37,15 +62,58 @@ class Digitize:
             )
         }
 
-    def digitize(self, document_path: str) -> str | None:
-        """Digitize a document and handle caching."""
+    def claim_digitization(self, content_hash: str) -> tuple[Future, bool]:
+        """
+        Register a digitization of `content_hash`, or join the one in flight.
+
+        Returns the future of the document ID and whether the caller owns the
+        digitization. The owner must call `release_digitization` when done;
+        other callers wait on the future.
+        """
+        key = (content_hash, self.project_id)
+        with _in_flight_lock:
+            future = _in_flight.get(key)
+            if future is not None:
+                return future, False
+            future = _in_flight[key] = Future()
+            return future, True
+
+    def release_digitization(
+        self,
+        content_hash: str,
+        document_id: str | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Resolve an owned digitization for the callers waiting on it."""
+        with _in_flight_lock:
+            future = _in_flight.pop((content_hash, self.project_id))
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(document_id)
+
+    def start_digitization(
+        self, document_path: str, content_hash: str | None = None
+    ) -> tuple[str | None, bool]:
+        """
+        Upload a document for digitization, or reuse a cached document ID.
+
+        The cache is keyed by the SHA-256 of the file contents and the project,
+        so renamed copies are not uploaded again and different files sharing a
+        name do not collide.
+
+        Returns:
+            tuple[str | None, bool]: The document ID (None on failure) and
+            whether it was taken from the cache.
+        """
         filename = os.path.basename(document_path)
-        cached_document_id = get_document_id_from_cache(filename)
+        content_hash = content_hash or hash_file(document_path)
+        cached_document_id = get_document_id_by_hash(content_hash, self.project_id)
         if cached_document_id:
             logging.info(
                 f"Using cached document ID: {cached_document_id} for {filename}"
             )
-            return cached_document_id
+            return cached_document_id, True
 
         # Log the initiation stage with no document_id
         update_cache(
@@ -53,6 +121,7 @@ class Digitize:
             document_id=None,
             stage="init",
             project_id=self.project_id,
+            content_hash=content_hash,
         )
 
         api_url = f"{self.base_url}{self.project_id}/digitization/start?api-version=1"
@@ -63,11 +132,17 @@ class Digitize:
 
         try:
             files = self._prepare_file(document_path)
-            response = requests.post(api_url, files=files, headers=headers, timeout=60)
+            response = self.session.post(
+                api_url,
+                files=files,
+                headers=headers,
+                token_provider=self.token_provider,
+                timeout=60,
+            )
             response.raise_for_status()
 
             if response.status_code == 202:
-                response_data = response.json()
+                response_data = parse_response(response)
                 document_id = response_data.get("documentId")
                 if not document_id:
                     raise ValueError("Missing documentId in the response.")
@@ -78,28 +153,96 @@ class Digitize:
                     document_id=document_id,
                     stage="digitize-pending",
                     project_id=self.project_id,
+                    content_hash=content_hash,
                 )
-
-                digitize_results = submit_async_request(
-                    action=self.action,
-                    base_url=self.base_url,
-                    project_id=self.project_id,
-                    module_id="digitization",
-                    operation_id=document_id,
-                    document_id=document_id,
-                    bearer_token=self.bearer_token,
-                )
-
-                if digitize_results:
-                    return digitize_results.get("documentObjectModel", {}).get(
-                        "documentId"
-                    )
+                return document_id, False
 
             self._log_error(
-                filename, self.action, str(response.status_code), response.text
+                filename,
+                self.action,
+                str(response.status_code),
+                response.text,
+                content_hash,
             )
         except requests.exceptions.RequestException as e:
-            self._log_error(filename, self.action, "NetworkError", str(e))
+            self._log_error(filename, self.action, "NetworkError", str(e), content_hash)
         except Exception as ex:
-            self._log_error(filename, self.action, "UnexpectedError", str(ex))
+            self._log_error(
+                filename, self.action, "UnexpectedError", str(ex), content_hash
+            )
+        return None, False
+
+    def finish_digitization(
+        self,
+        document_path: str,
+        digitize_results: dict | None,
+        content_hash: str | None = None,
+    ) -> str | None:
+        """Return the document ID from a completed digitization result."""
+        if digitize_results:
+            return digitize_results.get("documentObjectModel", {}).get("documentId")
+
+        filename = os.path.basename(document_path)
+        self._log_error(
+            filename,
+            self.action,
+            "NoResult",
+            "Digitization returned no result.",
+            content_hash or hash_file(document_path),
+        )
         return None
+
+    def track_digitization(self, document_id: str) -> Future:
+        """Return a future of a started digitization, including one started by an earlier run."""
+        return start_async_request(
+            action=self.action,
+            base_url=self.base_url,
+            project_id=self.project_id,
+            module_id="digitization",
+            operation_id=document_id,
+            document_id=document_id,
+            bearer_token=self.token_provider,
+            session=self.session,
+        )
+
+    def digitize_future(self, document_path: str) -> Future:
+        """
+        Upload a document and return a future of its document ID.
+
+        Only the upload runs in the calling thread; the digitization is then
+        awaited by the shared poller, so no thread is held while it runs.
+        """
+        content_hash = hash_file(document_path)
+        future, owner = self.claim_digitization(content_hash)
+        if not owner:
+            logging.info(
+                f"Waiting for the digitization of identical content for {document_path}"
+            )
+            return future
+
+        try:
+            document_id, cached = self.start_digitization(document_path, content_hash)
+            if cached or not document_id:
+                self.release_digitization(content_hash, document_id)
+                return future
+            results = self.track_digitization(document_id)
+        except BaseException as e:
+            self.release_digitization(content_hash, error=e)
+            raise
+
+        def finish(completed: Future) -> None:
+            try:
+                document_id = self.finish_digitization(
+                    document_path, completed.result(), content_hash
+                )
+            except BaseException as e:
+                self.release_digitization(content_hash, error=e)
+            else:
+                self.release_digitization(content_hash, document_id)
+
+        results.add_done_callback(finish)
+        return future
+
+    def digitize(self, document_path: str) -> str | None:
+        """Digitize a document and handle caching."""
+        return self.digitize_future(document_path).result()
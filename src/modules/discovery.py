@@ -1,14 +1,16 @@
 import os
 import json
-import requests
 import questionary
 from project_config import CACHE_DIR, CACHE_FILE
+from utils.http_session import get_session
+from utils.token_provider import as_token_provider
 
 
 class Discovery:
-    def __init__(self, base_url, bearer_token):
+    def __init__(self, base_url, bearer_token, session=None):
         self.base_url = base_url
-        self.bearer_token = bearer_token
+        self.token_provider = as_token_provider(bearer_token)
+        self.session = session or get_session()
         self.document_cache = self._load_cache_from_file()
 
         # Retrieve boolean values from cache or prompt the user
@@ -37,6 +39,11 @@ class Discovery:
         # Save updated cache values
         self._save_cache_to_file(self.document_cache)
 
+    @property
+    def bearer_token(self) -> str:
+        """Current bearer token; read on every request so refreshed tokens are used."""
+        return self.token_provider.token()
+
     def _ensure_cache_directory(self):
         """Ensure the cache directory exists."""
         if not os.path.exists(CACHE_DIR):
@@ -106,7 +113,12 @@ class Discovery:
 
         try:
             # Get Projects
-            response = requests.get(api_url, headers=headers, timeout=300)
+            response = self.session.get(
+                api_url,
+                headers=headers,
+                token_provider=self.token_provider,
+                timeout=300,
+            )
 
             if response.status_code == 200:
                 # Try parsing the JSON response
@@ -225,7 +237,12 @@ class Discovery:
 
         try:
             # Get Classifiers
-            response = requests.get(api_url, headers=headers, timeout=300)
+            response = self.session.get(
+                api_url,
+                headers=headers,
+                token_provider=self.token_provider,
+                timeout=300,
+            )
 
             if response.status_code == 200:
                 # Try parsing the JSON response
@@ -337,7 +354,12 @@ class Discovery:
 
         try:
             # Get Extractors
-            response = requests.get(api_url, headers=headers, timeout=300)
+            response = self.session.get(
+                api_url,
+                headers=headers,
+                token_provider=self.token_provider,
+                timeout=300,
+            )
             if response.status_code != 200:
                 print(f"Error: {response.status_code} - {response.text}")
                 return None
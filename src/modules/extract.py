@@ -1,21 +1,62 @@
 import requests
-from utils.db_utils import update_document_stage
-from .async_request_handler import submit_async_request
+from concurrent.futures import Future
+from utils.db_utils import (
+    clear_pending_extraction,
+    save_pending_extraction,
+    update_document_stage,
+)
+from utils.circuit_breaker import get_circuit_breaker, is_unavailable_error
+from utils.futures import resolved, then
+from utils.http_session import get_session
+from utils.token_provider import as_token_provider
+from utils.json_codec import parse_response
+from utils.rate_limiter import ThrottledError
+from utils.result_cache import ResultCache, get_result_cache
+from .async_request_handler import start_async_request
 
 
 class Extract:
-    def __init__(self, base_url, project_id, bearer_token):
+    def __init__(
+        self,
+        base_url,
+        project_id,
+        bearer_token,
+        session=None,
+        result_cache: ResultCache | None = None,
+    ):
         self.base_url = base_url
         self.project_id = project_id
-        self.bearer_token = bearer_token
+        self.token_provider = as_token_provider(bearer_token)
+        self.session = session or get_session()
+        self.result_cache = result_cache or get_result_cache()
 
-    def extract_document(
+    @property
+    def bearer_token(self) -> str:
+        """Current bearer token; read on every request so refreshed tokens are used."""
+        return self.token_provider.token()
+
+    def start_extraction(
         self,
         extractor_id: str,
         document_id: str,
         page_range: str = None,
         prompts: dict = None,
-    ) -> dict | None:
+    ) -> str | None:
+        """Submit a document for extraction and return the operation ID."""
+        # Fail fast while the extractor is known to be unavailable
+        breaker = get_circuit_breaker("extractor", extractor_id)
+        if not breaker.allow_request():
+            print(
+                f"Circuit open for extractor {extractor_id}; parking document {document_id}."
+            )
+            update_document_stage(
+                action="extraction",
+                document_id=document_id,
+                operation_id=None,
+                new_stage="extraction_parked",
+            )
+            return None
+
         # Update the cache to indicate the extraction process has started
         update_document_stage(
             action="extraction",
@@ -39,37 +80,139 @@ class Extract:
             **(prompts or {}),
         }
 
+        operation_id = None
         try:
-            response = requests.post(api_url, json=data, headers=headers, timeout=300)
+            response = self.session.post(
+                api_url,
+                json=data,
+                headers=headers,
+                token_provider=self.token_provider,
+                timeout=300,
+            )
             response.raise_for_status()  # Raise an exception for HTTP errors
 
             if response.status_code == 202:
                 print("Document submitted for extraction!\n")
-                response_data = response.json()
+                response_data = parse_response(response)
                 # Extract and return operationId
                 operation_id = response_data.get("operationId")
-
-                # Wait until extraction request is completed
                 if operation_id:
-                    extraction_results = submit_async_request(
+                    # Persist the operation so an interrupted run can resume it
+                    update_document_stage(
                         action="extraction",
-                        base_url=self.base_url,
-                        project_id=self.project_id,
-                        module_id=extractor_id,
-                        operation_id=operation_id,
                         document_id=document_id,
-                        bearer_token=self.bearer_token,
+                        operation_id=operation_id,
+                        new_stage="extraction-pending",
+                        extractor_id=extractor_id,
+                    )
+                    save_pending_extraction(
+                        document_id, extractor_id, page_range, operation_id
                     )
-                    if extraction_results:
-                        print("Document Extraction Complete!\n")
-                    return extraction_results
+                    return operation_id
 
             print(f"Error: {response.status_code} - {response.text}")
             return None
 
+        except ThrottledError as te:
+            # Still throttled after the session's retries; park the document
+            # so the next run submits it again
+            print(f"Extraction request throttled; parking document {document_id}.")
+            update_document_stage(
+                action="extraction",
+                document_id=document_id,
+                operation_id=None,
+                new_stage="extraction_parked",
+                error_code="Throttled",
+                error_message=str(te),
+            )
         except requests.exceptions.RequestException as e:
+            if is_unavailable_error(e):
+                breaker.record_failure()
             print(f"Error submitting extraction request: {e}")
             # Handle network-related errors
         except Exception as ex:
             print(f"An error occurred during extraction: {ex}")
             # Handle any other unexpected errors
+        finally:
+            # A half-open probe that never got an operation frees the next probe
+            if not operation_id:
+                breaker.release_probe()
+
+    def track_extraction(
+        self,
+        extractor_id: str,
+        document_id: str,
+        operation_id: str,
+        page_range: str = None,
+        prompts: dict = None,
+    ) -> Future:
+        """
+        Return a future of a started extraction, including one started by an earlier run.
+
+        Completed results are stored in the result cache under the page range
+        and prompts the extraction was started with.
+        """
+
+        def finish(extraction_results: dict | None) -> dict | None:
+            clear_pending_extraction(document_id, extractor_id, page_range)
+            if extraction_results:
+                print("Document Extraction Complete!\n")
+                self.result_cache.put(
+                    document_id,
+                    extractor_id,
+                    page_range,
+                    prompts,
+                    extraction_results,
+                    operation_id,
+                )
+            return extraction_results
+
+        return then(
+            start_async_request(
+                action="extraction",
+                base_url=self.base_url,
+                project_id=self.project_id,
+                module_id=extractor_id,
+                operation_id=operation_id,
+                document_id=document_id,
+                bearer_token=self.token_provider,
+                session=self.session,
+            ),
+            finish,
+        )
+
+    def extract_future(
+        self,
+        extractor_id: str,
+        document_id: str,
+        page_range: str = None,
+        prompts: dict = None,
+    ) -> Future:
+        """Start an extraction and return a future of its results."""
+        cached_results = self.result_cache.get(
+            document_id, extractor_id, page_range, prompts
+        )
+        if cached_results is not None:
+            print(f"Using cached extraction results for document {document_id}")
+            return resolved(cached_results)
+
+        operation_id = self.start_extraction(
+            extractor_id, document_id, page_range, prompts
+        )
+        if not operation_id:
+            return resolved(None)
+
+        return self.track_extraction(
+            extractor_id, document_id, operation_id, page_range, prompts
+        )
+
+    def extract_document(
+        self,
+        extractor_id: str,
+        document_id: str,
+        page_range: str = None,
+        prompts: dict = None,
+    ) -> dict | None:
+        return self.extract_future(
+            extractor_id, document_id, page_range, prompts
+        ).result()
@@ -0,0 +1,149 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+from project_config import POLL_INTERVAL, POLLER_WORKERS
+
+
+class PollAgain(Exception):
+    """Raised by a poll function when the operation has not finished yet."""
+
+    def __init__(self, delay: float | None = None):
+        super().__init__(delay)
+        self.delay = delay
+
+
+class _PendingOperation:
+    def __init__(self, operation_id, poll_fn, interval, future):
+        self.operation_id = operation_id
+        self.poll_fn = poll_fn
+        self.interval = interval
+        self.future = future
+        self.polls = 0
+
+
+class OperationPoller:
+    """
+    Single scheduler for every outstanding asynchronous operation.
+
+    Digitization, classification, extraction and validation operations are
+    registered with `track` right after their `/start` call. One scheduler
+    thread keeps them on a shared timeline and hands due polls to a small,
+    fixed pool of workers, so the number of threads no longer grows with the
+    number of documents in flight. Each operation resolves a `Future`.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float = POLL_INTERVAL,
+        max_workers: int = POLLER_WORKERS,
+    ):
+        self.poll_interval = poll_interval
+        self._schedule = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="OperationPoller"
+        )
+        self._thread = None
+        self._in_flight = 0
+
+    def track(
+        self,
+        operation_id: str,
+        poll_fn: Callable[[], Any],
+        first_delay: float = 0.0,
+        interval: float | None = None,
+        callback: Callable[[Future], None] | None = None,
+    ) -> Future:
+        """
+        Register an operation and return a future resolved with its result.
+
+        Args:
+            operation_id (str): Identifier of the operation, used for reporting.
+            poll_fn (callable): Polls the operation once. Returns the final
+                result, or raises `PollAgain` to be polled again later.
+            first_delay (float): Seconds to wait before the first poll.
+            interval (float | None): Default seconds between polls.
+            callback (callable | None): Called with the future once resolved.
+        """
+        future = Future()
+        if callback:
+            future.add_done_callback(callback)
+
+        operation = _PendingOperation(
+            operation_id, poll_fn, interval or self.poll_interval, future
+        )
+        with self._condition:
+            self._in_flight += 1
+            self._schedule_locked(operation, first_delay)
+            self._ensure_running_locked()
+        return future
+
+    def pending_count(self) -> int:
+        """Return the number of operations that have not resolved yet."""
+        with self._condition:
+            return self._in_flight
+
+    def _ensure_running_locked(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, daemon=True, name="OperationPollerScheduler"
+            )
+            self._thread.start()
+
+    def _schedule_locked(self, operation: _PendingOperation, delay: float):
+        due = time.monotonic() + max(0.0, delay)
+        heapq.heappush(self._schedule, (due, next(self._sequence), operation))
+        self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._schedule:
+                    self._condition.wait()
+                due, _, operation = self._schedule[0]
+                wait_time = due - time.monotonic()
+                if wait_time > 0:
+                    self._condition.wait(timeout=wait_time)
+                    continue
+                heapq.heappop(self._schedule)
+            self._executor.submit(self._poll, operation)
+
+    def _poll(self, operation: _PendingOperation):
+        operation.polls += 1
+        try:
+            result = operation.poll_fn()
+        except PollAgain as retry:
+            delay = operation.interval if retry.delay is None else retry.delay
+            with self._condition:
+                self._schedule_locked(operation, delay)
+            return
+        except BaseException as ex:
+            self._resolve(operation, exception=ex)
+            return
+        self._resolve(operation, result=result)
+
+    def _resolve(self, operation: _PendingOperation, result=None, exception=None):
+        with self._condition:
+            self._in_flight -= 1
+        if exception is not None:
+            operation.future.set_exception(exception)
+        else:
+            operation.future.set_result(result)
+
+
+_shared_poller: OperationPoller | None = None
+_shared_poller_lock = threading.Lock()
+
+
+def get_poller() -> OperationPoller:
+    """Return the process-wide operation poller, creating it on first use."""
+    global _shared_poller
+    if _shared_poller is None:
+        with _shared_poller_lock:
+            if _shared_poller is None:
+                _shared_poller = OperationPoller()
+    return _shared_poller
@@ -0,0 +1,139 @@
+import random
+import sqlite3
+import statistics
+import threading
+from collections import deque
+from project_config import (
+    POLL_BACKOFF,
+    POLL_FIRST_FRACTION,
+    POLL_HISTORY_SIZE,
+    POLL_INTERVAL,
+    POLL_JITTER,
+    POLL_MAX_INTERVAL,
+)
+from utils.db_utils import execute_query
+
+# Column on the documents table holding the module used for each action
+MODULE_COLUMNS = {
+    "digitization": None,
+    "classification": "classifier_id",
+    "classification_validation": "classifier_id",
+    "extraction": "extractor_id",
+    "extraction_validation": "extractor_id",
+}
+
+
+class PollingPolicy:
+    """
+    Polling schedule learned from the durations recorded in the documents table.
+
+    For every (action, classifier/extractor ID) the policy keeps the most recent
+    completion times. The first poll is delayed until shortly before the
+    expected median duration; later polls back off exponentially with jitter.
+    Without any history it falls back to polling every `min_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = POLL_INTERVAL,
+        max_interval: float = POLL_MAX_INTERVAL,
+        first_poll_fraction: float = POLL_FIRST_FRACTION,
+        backoff: float = POLL_BACKOFF,
+        jitter: float = POLL_JITTER,
+        history_size: int = POLL_HISTORY_SIZE,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.first_poll_fraction = first_poll_fraction
+        self.backoff = backoff
+        self.jitter = jitter
+        self.history_size = history_size
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def _load_history(self, action: str, module_id: str | None) -> deque:
+        """Load the most recent recorded durations for an action and module."""
+        samples = deque(maxlen=self.history_size)
+        if action not in MODULE_COLUMNS:
+            return samples
+
+        duration_column = f"{action}_duration"
+        module_column = MODULE_COLUMNS[action]
+        query = f"SELECT {duration_column} FROM documents WHERE {duration_column} IS NOT NULL"
+        params = []
+        if module_column and module_id:
+            query += f" AND {module_column} = ?"
+            params.append(module_id)
+        query += " ORDER BY timestamp DESC LIMIT ?"
+        params.append(self.history_size)
+
+        try:
+            rows = execute_query(query, tuple(params))
+        except sqlite3.Error as e:
+            print(f"Unable to load polling history for {action}: {e}")
+            return samples
+
+        samples.extend(row[0] for row in reversed(rows))
+        return samples
+
+    def _history(self, action: str, module_id: str | None) -> deque:
+        key = (action, module_id)
+        with self._lock:
+            samples = self._samples.get(key)
+        if samples is not None:
+            return samples
+
+        # Query outside the lock; a concurrent first load of the same key
+        # keeps whichever history was stored first
+        loaded = self._load_history(action, module_id)
+        with self._lock:
+            return self._samples.setdefault(key, loaded)
+
+    def expected_duration(self, action: str, module_id: str | None) -> float | None:
+        """Return the median completion time in seconds, if any is known."""
+        samples = self._history(action, module_id)
+        with self._lock:
+            if not samples:
+                return None
+            return statistics.median(samples)
+
+    def record(self, action: str, module_id: str | None, duration: float) -> None:
+        """Record an observed completion time for future scheduling."""
+        samples = self._history(action, module_id)
+        with self._lock:
+            samples.append(duration)
+
+    def first_delay(self, action: str, module_id: str | None) -> float:
+        """Seconds to wait after `/start` before the first status poll."""
+        expected = self.expected_duration(action, module_id)
+        if expected is None:
+            return 0.0
+        return max(0.0, expected * self.first_poll_fraction)
+
+    def next_delay(
+        self,
+        action: str,
+        module_id: str | None,
+        attempt: int,
+        min_interval: float | None = None,
+    ) -> float:
+        """Seconds to wait before poll number `attempt + 1` of an operation."""
+        base = self.min_interval if min_interval is None else min_interval
+        delay = min(
+            max(base, self.max_interval), base * self.backoff ** max(0, attempt)
+        )
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+_shared_policy: PollingPolicy | None = None
+_shared_policy_lock = threading.Lock()
+
+
+def get_polling_policy() -> PollingPolicy:
+    """Return the process-wide polling policy, creating it on first use."""
+    global _shared_policy
+    if _shared_policy is None:
+        with _shared_policy_lock:
+            if _shared_policy is None:
+                _shared_policy = PollingPolicy()
+    return _shared_policy
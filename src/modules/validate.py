@@ -1,36 +1,35 @@
 import requests
+from concurrent.futures import Future
 from utils.db_utils import update_document_stage
-from .async_request_handler import submit_validation_request
+from utils.futures import resolved, then
+from utils.http_session import get_session
+from utils.token_provider import as_token_provider
+from utils.json_codec import parse_response
+from utils.result_model import parse_classifications
+from .async_request_handler import start_validation_request
 
 
 class Validate:
-    def __init__(self, base_url, project_id, bearer_token):
+    def __init__(self, base_url, project_id, bearer_token, session=None):
         self.base_url = base_url
         self.project_id = project_id
-        self.bearer_token = bearer_token
+        self.token_provider = as_token_provider(bearer_token)
+        self.session = session or get_session()
 
-    def validate_extraction_results(
+    @property
+    def bearer_token(self) -> str:
+        """Current bearer token; read on every request so refreshed tokens are used."""
+        return self.token_provider.token()
+
+    def start_extraction_validation(
         self,
         filename: str,
         extractor_id: str,
         document_id: str,
         extraction_results: dict,
         extraction_prompts: dict,
-        validate_extraction_later: bool = False,
-    ) -> dict | None:
-        """
-        Submits a validation request for extraction results and optionally waits for the result.
-
-        Args:
-            extractor_id (str): The ID of the extractor.
-            document_id (str): The ID of the document.
-            extraction_results (dict): The extraction results to validate.
-            extraction_prompts (dict): Additional prompts for extraction validation.
-            validate_extraction_later (bool): If True, submits the request but does not wait for results.
-
-        Returns:
-            dict | None: The validation results, or None if validation is deferred.
-        """
+    ) -> str | None:
+        """Submit extraction results for validation and return the operation ID."""
         # Define the API endpoint for validation
         api_url = f"{self.base_url}{self.project_id}/extractors/{extractor_id}/validation/start?api-version=1.1"
 
@@ -55,13 +54,19 @@ class Validate:
 
         try:
             # Make the POST request to initiate validation
-            response = requests.post(api_url, json=data, headers=headers, timeout=60)
+            response = self.session.post(
+                api_url,
+                json=data,
+                headers=headers,
+                token_provider=self.token_provider,
+                timeout=60,
+            )
             response.raise_for_status()  # Raise an exception for HTTP errors
 
             if response.status_code == 202:
                 print("\nExtraction Validation request sent!")
                 # Parse the JSON response
-                response_data = response.json()
+                response_data = parse_response(response)
                 # Extract and return the operationId
                 operation_id = response_data.get("operationId")
 
@@ -75,25 +80,7 @@ class Validate:
                         error_code=None,
                         error_message=None,
                     )
-
-                    if validate_extraction_later:
-                        # If deferred, do not wait for the result
-                        print(
-                            f"Validation request for document {document_id} submitted and deferred."
-                        )
-                        return None
-
-                    # Wait for the validation result
-                    validation_result = submit_validation_request(
-                        action="extraction_validation",
-                        bearer_token=self.bearer_token,
-                        base_url=self.base_url,
-                        project_id=self.project_id,
-                        operation_id=operation_id,
-                        module_id=extractor_id,
-                    )
-                    print("Extraction Validation Complete!\n")
-                    return validation_result
+                    return operation_id
                 print(f"Error: {response.status_code} - {response.text}")
                 return None
 
@@ -104,19 +91,96 @@ class Validate:
             print(f"An error occurred during extraction validation: {ex}")
             # Handle any other unexpected errors
 
-    def validate_classification_results(
+    def validate_extraction_future(
+        self,
+        filename: str,
+        extractor_id: str,
+        document_id: str,
+        extraction_results: dict,
+        extraction_prompts: dict,
+        validate_extraction_later: bool = False,
+    ) -> Future:
+        """
+        Submit extraction results for validation and return a future of the result.
+
+        The future holds None when the request failed or `validate_extraction_later`
+        is set, in which case the validation is not awaited.
+        """
+        operation_id = self.start_extraction_validation(
+            filename, extractor_id, document_id, extraction_results, extraction_prompts
+        )
+        if not operation_id:
+            return resolved(None)
+
+        if validate_extraction_later:
+            # If deferred, do not wait for the result
+            print(
+                f"Validation request for document {document_id} submitted and deferred."
+            )
+            return resolved(None)
+
+        def finish(validation_result: dict | None) -> dict | None:
+            print("Extraction Validation Complete!\n")
+            return validation_result
+
+        return then(
+            start_validation_request(
+                action="extraction_validation",
+                bearer_token=self.token_provider,
+                base_url=self.base_url,
+                project_id=self.project_id,
+                operation_id=operation_id,
+                module_id=extractor_id,
+                session=self.session,
+            ),
+            finish,
+        )
+
+    def validate_extraction_results(
+        self,
+        filename: str,
+        extractor_id: str,
+        document_id: str,
+        extraction_results: dict,
+        extraction_prompts: dict,
+        validate_extraction_later: bool = False,
+    ) -> dict | None:
+        """
+        Submits a validation request for extraction results and optionally waits for the result.
+
+        Args:
+            extractor_id (str): The ID of the extractor.
+            document_id (str): The ID of the document.
+            extraction_results (dict): The extraction results to validate.
+            extraction_prompts (dict): Additional prompts for extraction validation.
+            validate_extraction_later (bool): If True, submits the request but does not wait for results.
+
+        Returns:
+            dict | None: The validation results, or None if validation is deferred.
+        """
+        return self.validate_extraction_future(
+            filename,
+            extractor_id,
+            document_id,
+            extraction_results,
+            extraction_prompts,
+            validate_extraction_later,
+        ).result()
+
+    def start_classification_validation(
         self,
         document_id: str,
         classifier_id: str,
         classification_results: dict,
         classificastion_prompts: dict,
     ) -> str | None:
+        """Submit classification results for validation and return the operation ID."""
         # Define the API endpoint for validation
         api_url = f"{self.base_url}{self.project_id}/classifiers/{classifier_id}/validation/start?api-version=1.1"
 
-        document_type_id = classification_results["classificationResults"][0][
-            "DocumentTypeId"
-        ]
+        document_type_id = parse_classifications(classification_results)[
+            0
+        ].document_type_id
 
         # Define the headers with the Bearer token and content type
         headers = {
@@ -140,17 +204,22 @@ class Validate:
 
         try:
             # Make the POST request to initiate validation
-            response = requests.post(api_url, json=data, headers=headers, timeout=60)
+            response = self.session.post(
+                api_url,
+                json=data,
+                headers=headers,
+                token_provider=self.token_provider,
+                timeout=60,
+            )
             response.raise_for_status()  # Raise an exception for HTTP errors
 
             if response.status_code == 202:
                 print("\nClassification Validation request sent!")
                 # Parse the JSON response
-                response_data = response.json()
+                response_data = parse_response(response)
                 # Extract and return the operationId
                 operation_id = response_data.get("operationId")
 
-                # Wait until the validation operation is completed
                 if operation_id:
                     update_document_stage(
                         action="classification_validation",
@@ -160,21 +229,7 @@ class Validate:
                         error_code=None,
                         error_message=None,
                     )
-                    validation_result = submit_validation_request(
-                        action="classification_validation",
-                        bearer_token=self.bearer_token,
-                        base_url=self.base_url,
-                        project_id=self.project_id,
-                        operation_id=operation_id,
-                        module_id=classifier_id,
-                    )
-                    print("Classification Validation Complete!\n")
-
-                    if validation_result:
-                        document_type_id = validation_result["result"][
-                            "validatedClassificationResults"
-                        ][0]["DocumentTypeId"]
-                        return document_type_id
+                    return operation_id
 
             print(f"Error: {response.status_code} - {response.text}")
             return None
@@ -185,3 +240,56 @@ class Validate:
         except Exception as ex:
             print(f"An error occurred during classification validation: {ex}")
             # Handle any other unexpected errors
+
+    def finish_classification_validation(
+        self, validation_result: dict | None
+    ) -> str | None:
+        """Return the validated document type from a classification validation result."""
+        print("Classification Validation Complete!\n")
+        if not validation_result:
+            return None
+        try:
+            return validation_result["result"]["validatedClassificationResults"][0][
+                "DocumentTypeId"
+            ]
+        except (KeyError, IndexError, TypeError) as ex:
+            print(f"An error occurred during classification validation: {ex}")
+            return None
+
+    def validate_classification_future(
+        self,
+        document_id: str,
+        classifier_id: str,
+        classification_results: dict,
+        classificastion_prompts: dict,
+    ) -> Future:
+        """Submit classification results for validation and return a future of the validated type."""
+        operation_id = self.start_classification_validation(
+            document_id, classifier_id, classification_results, classificastion_prompts
+        )
+        if not operation_id:
+            return resolved(None)
+
+        return then(
+            start_validation_request(
+                action="classification_validation",
+                bearer_token=self.token_provider,
+                base_url=self.base_url,
+                project_id=self.project_id,
+                operation_id=operation_id,
+                module_id=classifier_id,
+                session=self.session,
+            ),
+            self.finish_classification_validation,
+        )
+
+    def validate_classification_results(
+        self,
+        document_id: str,
+        classifier_id: str,
+        classification_results: dict,
+        classificastion_prompts: dict,
+    ) -> str | None:
+        return self.validate_classification_future(
+            document_id, classifier_id, classification_results, classificastion_prompts
+        ).result()
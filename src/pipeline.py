@@ -0,0 +1,456 @@
+import inspect
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Generator, Iterable, Iterator
+from project_config import (
+    ProcessingConfig,
+    DocumentProcessingContext,
+    PipelineConfig,
+)
+
+SUPPORTED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".pdf", ".tif")
+
+# Sentinel telling a stage worker to exit
+_STOP = object()
+
+
+def iter_document_paths(folder_path: str) -> Iterator[str]:
+    """Yield supported document paths in a folder without listing it all in memory."""
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(SUPPORTED_EXTENSIONS):
+                yield entry.path
+
+
+class Stage:
+    """
+    A bounded stage of work drained by a fixed number of worker threads.
+
+    A handler that waits on a cloud operation is a generator yielding the
+    operation's future. The worker moves on to the next item meanwhile, and
+    the handler resumes on a worker of this stage once the future completes,
+    so no thread is held while an operation runs.
+
+    At most `queue_size` items wait in front of the stage and `max_in_flight`
+    more are being handled or awaited; `put` blocks while the stage is full,
+    which pushes back on the stage feeding it instead of buffering an
+    unbounded amount of work in memory.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Any],
+        workers: int,
+        queue_size: int,
+        max_in_flight: int | None = None,
+    ):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.max_in_flight = max(self.workers, max_in_flight or 0)
+        # Holds new items and resumed handlers; only new items count as waiting
+        self.queue = queue.Queue()
+        self.processed = 0
+        self.failed = 0
+        self.max_depth = 0
+        self._waiting = 0
+        self._active = 0
+        self._lock = threading.Condition()
+        self._threads = []
+
+    def start(self) -> None:
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, daemon=True, name=f"{self.name}-{index}"
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    @property
+    def depth(self) -> int:
+        """Number of items waiting in front of the stage."""
+        with self._lock:
+            return self._waiting
+
+    def put(self, item: Any) -> None:
+        limit = self.queue_size + self.max_in_flight
+        with self._lock:
+            self._lock.wait_for(
+                lambda: self._waiting < self.queue_size and self._active < limit
+            )
+            self._waiting += 1
+            self._active += 1
+            self.max_depth = max(self.max_depth, self._waiting)
+        self.queue.put(item)
+
+    def close(self) -> None:
+        """Wait for queued and awaited items to finish and stop the workers."""
+        with self._lock:
+            self._lock.wait_for(lambda: self._active == 0)
+        for _ in self._threads:
+            self.queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "depth": self._waiting,
+                "max_depth": self.max_depth,
+                "in_flight": self._active - self._waiting,
+                "processed": self.processed,
+                "failed": self.failed,
+                "workers": self.workers,
+            }
+
+    def _work(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+            if isinstance(item, _Resume):
+                self._advance(item.handler, item.future)
+                continue
+            with self._lock:
+                self._waiting -= 1
+                self._lock.notify_all()
+            try:
+                result = self.handler(item)
+            except Exception as e:
+                self._finish(e)
+                continue
+            if inspect.isgenerator(result):
+                self._advance(result, None)
+            else:
+                self._finish()
+
+    def _advance(self, handler: Generator, future: Future | None) -> None:
+        """Run a generator handler until it yields an unfinished future or returns."""
+        value, error = _outcome(future)
+        try:
+            while True:
+                if error is not None:
+                    step = handler.throw(error)
+                else:
+                    step = handler.send(value)
+                if isinstance(step, Future) and not step.done():
+                    break
+                # Plain values, such as mocked or cached results, go straight back
+                value, error = (
+                    _outcome(step) if isinstance(step, Future) else (step, None)
+                )
+        except StopIteration:
+            self._finish()
+            return
+        except Exception as e:
+            self._finish(e)
+            return
+
+        step.add_done_callback(lambda done: self.queue.put(_Resume(handler, done)))
+
+    def _finish(self, error: Exception | None = None) -> None:
+        with self._lock:
+            if error is None:
+                self.processed += 1
+            else:
+                self.failed += 1
+            self._active -= 1
+            self._lock.notify_all()
+        if error is not None:
+            print(f"Error in {self.name} stage: {error}")
+
+
+def _outcome(future: Future | None) -> tuple[Any, Exception | None]:
+    if future is None:
+        return None, None
+    try:
+        return future.result(), None
+    except Exception as e:
+        return None, e
+
+
+class _Resume:
+    """A generator handler waiting to continue with the result of `future`."""
+
+    __slots__ = ("handler", "future")
+
+    def __init__(self, handler: Generator, future: Future):
+        self.handler = handler
+        self.future = future
+
+
+class StagedPipeline:
+    """
+    Digitize -> classify -> extract -> validate, each with its own worker pool.
+
+    Every stage is bounded, so a slow extraction stage cannot starve
+    digitization uploads and the number of documents held in memory stays
+    bounded no matter how many files are in the folder. Workers only send
+    requests and handle results; running operations are awaited through the
+    futures of the shared poller.
+    """
+
+    def __init__(
+        self,
+        processor,
+        config: ProcessingConfig,
+        context: DocumentProcessingContext,
+        pipeline_config: PipelineConfig | None = None,
+    ):
+        self.processor = processor
+        self.config = config
+        self.context = context
+        self.pipeline_config = pipeline_config or PipelineConfig()
+        queue_sizes = self.pipeline_config.queue_sizes
+
+        # Waits on operations left in the cloud by an interrupted run
+        self.resume = Stage(
+            "resume",
+            self._resume,
+            self.pipeline_config.digitization_workers,
+            queue_sizes["digitization"],
+            self.pipeline_config.max_in_flight,
+        )
+        self.digitization = Stage(
+            "digitization",
+            self._digitize,
+            self.pipeline_config.digitization_workers,
+            queue_sizes["digitization"],
+            self.pipeline_config.max_in_flight,
+        )
+        self.classification = Stage(
+            "classification",
+            self._classify,
+            self.pipeline_config.classification_workers,
+            queue_sizes["classification"],
+            self.pipeline_config.max_in_flight,
+        )
+        self.extraction = Stage(
+            "extraction",
+            self._extract,
+            self.pipeline_config.extraction_workers,
+            queue_sizes["extraction"],
+            self.pipeline_config.max_in_flight,
+        )
+        self.validation = Stage(
+            "validation",
+            self._validate,
+            self.pipeline_config.validation_workers,
+            queue_sizes["validation"],
+            self.pipeline_config.max_in_flight,
+        )
+        self.stages = [
+            self.resume,
+            self.digitization,
+            self.classification,
+            self.extraction,
+            self.validation,
+        ]
+        self._finished = threading.Event()
+        # (document_id, extractor_id, page_range) of extractions being resumed
+        self._resumed_extractions = set()
+
+    def queue_depths(self) -> dict:
+        """Return the number of items waiting in front of each stage."""
+        return {stage.name: stage.depth for stage in self.stages}
+
+    def metrics(self) -> dict:
+        return {stage.name: stage.metrics() for stage in self.stages}
+
+    def run(self, document_paths: Iterable[str], pending: Iterable[tuple] = ()) -> None:
+        """
+        Feed documents into the pipeline and block until every stage drains.
+
+        `pending` holds (stage, document_path, document_id, module_id,
+        operation_id, page_range) items for operations started by an earlier
+        run; they are polled again and continue from the stage after the one
+        in flight. Resumed extractions are not submitted again when their
+        document also comes through `document_paths`.
+        """
+        pending = list(pending)
+        self._resumed_extractions = {
+            (document_id, module_id, page_range)
+            for stage, _, document_id, module_id, _, page_range in pending
+            if stage == "extraction-pending"
+        }
+        for stage in self.stages:
+            stage.start()
+        reporter = self._start_reporter()
+
+        try:
+            for item in pending:
+                self.resume.put(item)
+            for document_path in document_paths:
+                print(f"Submitting document for processing: {document_path}")
+                self.digitization.put(document_path)
+        finally:
+            # Upstream stages are closed first since their workers feed the next stage
+            for stage in self.stages:
+                stage.close()
+            self._finished.set()
+            if reporter:
+                reporter.join()
+
+        print(f"Pipeline finished: {self.metrics()}")
+
+    def _start_reporter(self) -> threading.Thread | None:
+        interval = self.pipeline_config.metrics_interval
+        if not interval or interval <= 0:
+            return None
+
+        def report():
+            while not self._finished.wait(interval):
+                print(f"Pipeline queue depths: {self.queue_depths()}")
+
+        reporter = threading.Thread(target=report, daemon=True, name="PipelineMetrics")
+        reporter.start()
+        return reporter
+
+    def _resume(self, item: tuple) -> Iterator:
+        stage, document_path, document_id, module_id, operation_id, page_range = item
+        if stage == "digitize-pending":
+            document_id = yield self.processor.resume_digitization(
+                document_path, document_id
+            )
+            if document_id:
+                self._queue_classification(document_path, document_id)
+        elif stage == "classify-pending":
+            classification_results = yield self.processor.resume_classification(
+                document_id, document_path, module_id, operation_id, self.config
+            )
+            document_classifications = yield self.processor.validate_classification(
+                document_id, classification_results, self.config, self.context
+            )
+            self._queue_extractions(
+                document_path, document_id, document_classifications
+            )
+        elif stage == "extraction-pending":
+            extraction_results, extraction_prompts = yield (
+                self.processor.resume_extraction(
+                    document_id,
+                    document_path,
+                    module_id,
+                    operation_id,
+                    page_range,
+                    self.context,
+                )
+            )
+            self.processor.write_extraction_results(extraction_results, document_path)
+            self._queue_validation(
+                document_path,
+                document_id,
+                module_id,
+                extraction_results,
+                extraction_prompts,
+            )
+
+    def _digitize(self, document_path: str) -> Iterator:
+        document_id = yield self.processor.start_digitization(document_path)
+        if document_id:
+            self._queue_classification(document_path, document_id)
+
+    def _queue_classification(self, document_path: str, document_id: str) -> None:
+        if self.config.perform_classification:
+            self.classification.put((document_path, document_id))
+        else:
+            self._queue_extractions(document_path, document_id, [])
+
+    def _classify(self, item: tuple) -> Iterator:
+        document_path, document_id = item
+        classification_results = yield self.processor.classify_document(
+            document_id, document_path, self.config, self.context
+        )
+        document_classifications = yield self.processor.validate_classification(
+            document_id, classification_results, self.config, self.context
+        )
+        self._queue_extractions(document_path, document_id, document_classifications)
+
+    def _queue_extractions(
+        self, document_path: str, document_id: str, document_classifications
+    ) -> None:
+        if not self.config.perform_extraction:
+            return
+
+        # If no classification, assume a single default document type with no page range
+        for document_type_id, page_range in document_classifications or [(None, None)]:
+            extractor_id, extractor_name = self.processor.get_extractor(
+                self.context, document_type_id
+            )
+            if (document_id, extractor_id, page_range) in self._resumed_extractions:
+                continue
+            if extractor_id and extractor_name:
+                self.extraction.put(
+                    (
+                        document_path,
+                        document_id,
+                        extractor_id,
+                        extractor_name,
+                        page_range,
+                    )
+                )
+
+    def _extract(self, item: tuple) -> Iterator:
+        document_path, document_id, extractor_id, extractor_name, page_range = item
+        extraction_results, extraction_prompts = yield self.processor.extract_document(
+            document_id,
+            document_path,
+            extractor_id,
+            extractor_name,
+            page_range,
+            self.context,
+        )
+        self.processor.write_extraction_results(extraction_results, document_path)
+        self._queue_validation(
+            document_path,
+            document_id,
+            extractor_id,
+            extraction_results,
+            extraction_prompts,
+        )
+
+    def _queue_validation(
+        self,
+        document_path: str,
+        document_id: str,
+        extractor_id: str,
+        extraction_results,
+        extraction_prompts,
+    ) -> None:
+        if self.config.validate_extraction:
+            self.validation.put(
+                (
+                    document_path,
+                    document_id,
+                    extractor_id,
+                    extraction_results,
+                    extraction_prompts,
+                )
+            )
+
+    def _validate(self, item: tuple) -> Iterator:
+        (
+            document_path,
+            document_id,
+            extractor_id,
+            extraction_results,
+            extraction_prompts,
+        ) = item
+        validated_results = yield self.processor.validate_extraction(
+            document_id,
+            document_path,
+            extractor_id,
+            extraction_results,
+            extraction_prompts,
+            self.config,
+        )
+        self.processor.finish_validation(
+            document_id,
+            document_path,
+            extraction_results,
+            validated_results,
+            self.config,
+        )
@@ -1,10 +1,14 @@
 import os
-import concurrent.futures
+from concurrent.futures import Future
 from project_setup import load_prompts
 from project_config import (
     ProcessingConfig,
     DocumentProcessingContext,
+    PipelineConfig,
 )
+from pipeline import StagedPipeline, iter_document_paths
+from utils.db_utils import get_parked_documents, get_pending_operations
+from utils.futures import resolved, then
 from utils.write_results import WriteResults
 
 
@@ -25,11 +29,18 @@ class DocumentProcessor:
     ) -> None:
         """Process a document using the provided configuration and context."""
         try:
-            document_id = self.start_digitization(document_path)
+            document_id = self.start_digitization(document_path).result()
 
             # Perform classification if required
             document_classifications = (
-                self.classify_document(document_id, document_path, config, context)
+                self.validate_classification(
+                    document_id,
+                    self.classify_document(
+                        document_id, document_path, config, context
+                    ).result(),
+                    config,
+                    context,
+                ).result()
                 if config.perform_classification
                 else []
             )
@@ -58,8 +69,9 @@ class DocumentProcessor:
         except Exception as e:
             print(f"Error processing {document_path}: {e}")
 
-    def start_digitization(self, document_path: str) -> str:
-        return self.digitize_client.digitize(document_path)
+    def start_digitization(self, document_path: str) -> Future:
+        """Upload a document and return a future of its document ID."""
+        return self.digitize_client.digitize_future(document_path)
 
     def classify_document(
         self,
@@ -67,27 +79,44 @@ class DocumentProcessor:
         document_path: str,
         config: ProcessingConfig,
         context: DocumentProcessingContext,
-    ) -> str | None:
-        classification_prompts = (
+    ) -> Future:
+        """
+        Start classifying a document and return a future of its page ranges.
+
+        With `validate_classification` the future holds the raw results for
+        `validate_classification` to submit.
+        """
+        return self.classify_client.classify_future(
+            document_path,
+            document_id,
+            context.classifier,
+            self._classification_prompts(context),
+            config.validate_classification,
+        )
+
+    def _classification_prompts(self, context: DocumentProcessingContext):
+        return (
             load_prompts("classification")
             if context.classifier == "generative_classifier"
             else None
         )
-        document_type_id = self.classify_client.classify_document(
-            document_path,
+
+    def validate_classification(
+        self,
+        document_id: str,
+        document_type_id,
+        config: ProcessingConfig,
+        context: DocumentProcessingContext,
+    ) -> Future:
+        """Return a future of the classification, validated if the config asks for it."""
+        if not config.validate_classification:
+            return resolved(document_type_id)
+        return self.validate_client.validate_classification_future(
             document_id,
             context.classifier,
-            classification_prompts,
-            config.validate_classification,
+            document_type_id,
+            self._classification_prompts(context),
         )
-        if config.validate_classification:
-            document_type_id = self.validate_client.validate_classification_results(
-                document_id,
-                context.classifier,
-                document_type_id,
-                classification_prompts,
-            )
-        return document_type_id
 
     def get_extractor(
         self, context: DocumentProcessingContext, document_type_id: str | None
@@ -117,38 +146,207 @@ class DocumentProcessor:
         config: ProcessingConfig,
         context: DocumentProcessingContext,
     ) -> None:
-        extraction_prompts = (
-            load_prompts(extractor_name)
-            if context.project_id == "00000000-0000-0000-0000-000000000001"
-            else None
-        )
-        extraction_results = self.extract_client.extract_document(
-            extractor_id, document_id, page_range, extraction_prompts
-        )
+        extraction_results, extraction_prompts = self.extract_document(
+            document_id,
+            document_path,
+            extractor_id,
+            extractor_name,
+            page_range,
+            context,
+        ).result()
         self.write_extraction_results(extraction_results, document_path)
 
         if config.validate_extraction:
-            # Submit the validation request, optionally deferring the validation process
-            filename = os.path.basename(document_path)
-
-            validated_results = self.validate_client.validate_extraction_results(
-                filename,
-                extractor_id,
+            validated_results = self.validate_extraction(
                 document_id,
+                document_path,
+                extractor_id,
                 extraction_results,
                 extraction_prompts,
-                validate_extraction_later=config.validate_extraction_later,
+                config,
+            ).result()
+            self.finish_validation(
+                document_id,
+                document_path,
+                extraction_results,
+                validated_results,
+                config,
             )
 
-            if config.validate_extraction_later:
-                print(
-                    f"Extraction validation will be performed later for document {document_id}"
-                )
-            elif validated_results:
-                # Handle and write results only if validation was immediate
-                self.write_validated_results(
-                    validated_results, extraction_results, document_path
+    def extract_document(
+        self,
+        document_id: str,
+        document_path: str,
+        extractor_id: str,
+        extractor_name: str,
+        page_range: str,
+        context: DocumentProcessingContext,
+    ) -> Future:
+        """Start extracting one classified document; the future holds (results, prompts)."""
+        extraction_prompts = self._extraction_prompts(extractor_name, context)
+        return then(
+            self.extract_client.extract_future(
+                extractor_id, document_id, page_range, extraction_prompts
+            ),
+            lambda extraction_results: (extraction_results, extraction_prompts),
+        )
+
+    def _extraction_prompts(
+        self, extractor_name: str | None, context: DocumentProcessingContext
+    ) -> dict | None:
+        return (
+            load_prompts(extractor_name)
+            if extractor_name
+            and context.project_id == "00000000-0000-0000-0000-000000000001"
+            else None
+        )
+
+    def find_pending_operations(
+        self, folder_path: str, context: DocumentProcessingContext
+    ) -> list[tuple]:
+        """
+        Return the operations an interrupted run left running for this folder.
+
+        Each item is (stage, document_path, document_id, module_id, operation_id,
+        page_range), with one item per page range for extractions. Stages that
+        never got an operation ID are not returned; those documents are simply
+        submitted again.
+        """
+        pending = []
+        for (
+            filename,
+            document_id,
+            stage,
+            module_id,
+            operation_id,
+            page_range,
+        ) in get_pending_operations(context.project_id):
+            document_path = os.path.join(folder_path, filename)
+            if operation_id and os.path.isfile(document_path):
+                pending.append(
+                    (
+                        stage,
+                        document_path,
+                        document_id,
+                        module_id,
+                        operation_id,
+                        page_range or None,
+                    )
                 )
+        return pending
+
+    def find_parked_documents(
+        self, folder_path: str, context: DocumentProcessingContext
+    ) -> list[str]:
+        """Return the paths of documents parked while a circuit was open."""
+        document_paths = (
+            os.path.join(folder_path, filename)
+            for filename, _, _, _ in get_parked_documents(context.project_id)
+        )
+        return [path for path in document_paths if os.path.isfile(path)]
+
+    def resume_digitization(self, document_path: str, document_id: str) -> Future:
+        """Return a future of a digitization started by an earlier run."""
+        print(f"Resuming digitization of {document_path}")
+        return then(
+            self.digitize_client.track_digitization(document_id),
+            lambda digitize_results: self.digitize_client.finish_digitization(
+                document_path, digitize_results
+            ),
+        )
+
+    def resume_classification(
+        self,
+        document_id: str,
+        document_path: str,
+        classifier_id: str,
+        operation_id: str,
+        config: ProcessingConfig,
+    ) -> Future:
+        """
+        Return a future of a classification started by an earlier run.
+
+        Like `classify_document`, the future holds the raw results when the
+        classification is validated.
+        """
+        print(f"Resuming classification of {document_path}")
+        return then(
+            self.classify_client.track_classification(
+                document_id, classifier_id, operation_id
+            ),
+            lambda classification_results: self.classify_client.finish_classification(
+                document_path,
+                classification_results,
+                operation_id,
+                config.validate_classification,
+            ),
+        )
+
+    def resume_extraction(
+        self,
+        document_id: str,
+        document_path: str,
+        extractor_id: str,
+        operation_id: str,
+        page_range: str | None,
+        context: DocumentProcessingContext,
+    ) -> Future:
+        """Return a future of (results, prompts) of an extraction started by an earlier run."""
+        print(f"Resuming extraction of {document_path} (pages {page_range or 'all'})")
+        extractor_name = next(
+            (
+                extractor.get("name")
+                for extractor in (context.extractor_dict or {}).values()
+                if extractor.get("id") == extractor_id
+            ),
+            None,
+        )
+        extraction_prompts = self._extraction_prompts(extractor_name, context)
+        return then(
+            self.extract_client.track_extraction(
+                extractor_id, document_id, operation_id, page_range, extraction_prompts
+            ),
+            lambda extraction_results: (extraction_results, extraction_prompts),
+        )
+
+    def validate_extraction(
+        self,
+        document_id: str,
+        document_path: str,
+        extractor_id: str,
+        extraction_results: dict,
+        extraction_prompts: dict | None,
+        config: ProcessingConfig,
+    ) -> Future:
+        """Submit the validation request and return a future of the validated results."""
+        filename = os.path.basename(document_path)
+        return self.validate_client.validate_extraction_future(
+            filename,
+            extractor_id,
+            document_id,
+            extraction_results,
+            extraction_prompts,
+            validate_extraction_later=config.validate_extraction_later,
+        )
+
+    def finish_validation(
+        self,
+        document_id: str,
+        document_path: str,
+        extraction_results: dict,
+        validated_results: dict | None,
+        config: ProcessingConfig,
+    ) -> None:
+        """Write validated results, unless the validation was deferred."""
+        if config.validate_extraction_later:
+            print(
+                f"Extraction validation will be performed later for document {document_id}"
+            )
+        elif validated_results:
+            # Handle and write results only if validation was immediate
+            self.write_validated_results(
+                validated_results, extraction_results, document_path
+            )
 
     def write_extraction_results(self, extraction_results, document_path):
         write_results = WriteResults(
@@ -171,26 +369,37 @@ class DocumentProcessor:
         folder_path: str,
         config: ProcessingConfig,
         context: DocumentProcessingContext,
+        pipeline_config: PipelineConfig | None = None,
+        resume: bool = False,
     ) -> None:
-        """Process all documents in the specified folder."""
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = []
-
-            for filename in os.listdir(folder_path):
-                if filename.lower().endswith((".png", ".jpg", ".jpeg", ".pdf", ".tif")):
-                    document_path = os.path.join(folder_path, filename)
-                    print(f"Submitting document for processing: {document_path}")
-                    futures.append(
-                        executor.submit(
-                            self.process_document,
-                            document_path,
-                            config,
-                            context,
-                        )
-                    )
+        """
+        Process all documents in the specified folder through the staged pipeline.
+
+        With `resume`, operations an interrupted run left in the cloud are
+        polled again instead of being resubmitted. Completed work is reused
+        through the digitization and result caches either way.
 
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    print(f"Error in thread execution: {e}")
+        Documents with a resumed digitization or classification continue from
+        there. Documents with resumed extractions are also submitted normally
+        so page ranges that never got an operation are extracted; the pipeline
+        skips the page ranges being resumed.
+        """
+        pending = self.find_pending_operations(folder_path, context) if resume else []
+        if pending:
+            print(f"Resuming {len(pending)} in-flight operations")
+        parked = self.find_parked_documents(folder_path, context)
+        if parked:
+            # Parked documents have no cached result, so they are submitted
+            # again below and probe the circuit once its reset timeout passed
+            print(f"Resubmitting {len(parked)} parked documents")
+        resumed_paths = {item[1] for item in pending if item[0] != "extraction-pending"}
+
+        pipeline = StagedPipeline(self, config, context, pipeline_config)
+        pipeline.run(
+            (
+                document_path
+                for document_path in iter_document_paths(folder_path)
+                if document_path not in resumed_paths
+            ),
+            pending,
+        )
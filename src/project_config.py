@@ -11,6 +11,86 @@ SQLITE_DB_PATH = os.path.join(CACHE_DIR, "document_cache.db")
 load_dotenv()
 BASE_URL = os.getenv("BASE_URL")
 
+# Settings file of headless (non-interactive) runs; unset runs Discovery prompts
+HEADLESS_CONFIG = os.getenv("HEADLESS_CONFIG") or None
+
+# Bearer tokens cached on disk (readable by the owner only) and reused while valid
+TOKEN_CACHE = os.getenv("TOKEN_CACHE", "true").lower() in ("1", "true", "yes")
+TOKEN_CACHE_FILE = os.getenv(
+    "TOKEN_CACHE_FILE", os.path.join(CACHE_DIR, "token_cache.json")
+)
+
+# SQLite connections (one per thread, WAL journaling)
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "30"))
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_CACHED_STATEMENTS = int(os.getenv("SQLITE_CACHED_STATEMENTS", "256"))
+
+# Write-behind database writer: writes are queued and group-committed
+DB_WRITE_BEHIND = os.getenv("DB_WRITE_BEHIND", "true").lower() in ("1", "true", "yes")
+DB_WRITER_FLUSH_MS = float(os.getenv("DB_WRITER_FLUSH_MS", "50"))
+DB_WRITER_BATCH_SIZE = int(os.getenv("DB_WRITER_BATCH_SIZE", "500"))
+DB_WRITER_QUEUE_SIZE = int(os.getenv("DB_WRITER_QUEUE_SIZE", "10000"))
+DB_WRITER_FLUSH_TIMEOUT = float(os.getenv("DB_WRITER_FLUSH_TIMEOUT", "60"))
+
+# HTTP connection pooling shared by all API clients
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "50"))
+
+# Requests per second for each endpoint group (0 disables the limit)
+RATE_LIMIT_START = float(os.getenv("RATE_LIMIT_START", "10"))
+RATE_LIMIT_POLL = float(os.getenv("RATE_LIMIT_POLL", "20"))
+RATE_LIMIT_DISCOVERY = float(os.getenv("RATE_LIMIT_DISCOVERY", "5"))
+MAX_THROTTLE_RETRIES = int(os.getenv("MAX_THROTTLE_RETRIES", "5"))
+
+# Result bodies at least this large are parsed incrementally when ijson is installed
+JSON_STREAM_THRESHOLD_MB = float(os.getenv("JSON_STREAM_THRESHOLD_MB", "8"))
+
+# Cached classification/extraction results (a TTL of 0 disables the cache)
+RESULT_CACHE_TTL_DAYS = float(os.getenv("RESULT_CACHE_TTL_DAYS", "30"))
+RESULT_CACHE_MAX_MB = float(os.getenv("RESULT_CACHE_MAX_MB", "512"))
+
+# Archive of raw API results (codec "auto" prefers zstd and falls back to gzip)
+RESPONSE_ARCHIVE = os.getenv("RESPONSE_ARCHIVE", "true").lower() in ("1", "true", "yes")
+RESPONSE_ARCHIVE_DIR = os.getenv(
+    "RESPONSE_ARCHIVE_DIR", os.path.join(CACHE_DIR, "responses")
+)
+RESPONSE_ARCHIVE_CODEC = os.getenv("RESPONSE_ARCHIVE_CODEC", "auto")
+
+# Offline replay of archived results (0 uses one process per CPU)
+REPLAY_WORKERS = int(os.getenv("REPLAY_WORKERS", "0"))
+REPLAY_BATCH_SIZE = int(os.getenv("REPLAY_BATCH_SIZE", "500"))
+
+# Columnar (Parquet/Arrow) export of the result tables
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "100000"))
+
+# Circuit breaker per classifier/extractor
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "300"))
+
+# Central poller for asynchronous operations
+POLL_INTERVAL = float(os.getenv("POLL_INTERVAL", "1"))
+VALIDATION_POLL_INTERVAL = float(os.getenv("VALIDATION_POLL_INTERVAL", "5"))
+POLLER_WORKERS = int(os.getenv("POLLER_WORKERS", "8"))
+
+# Adaptive polling learned from recorded durations
+POLL_MAX_INTERVAL = float(os.getenv("POLL_MAX_INTERVAL", "30"))
+POLL_FIRST_FRACTION = float(os.getenv("POLL_FIRST_FRACTION", "0.8"))
+POLL_BACKOFF = float(os.getenv("POLL_BACKOFF", "1.5"))
+POLL_JITTER = float(os.getenv("POLL_JITTER", "0.2"))
+POLL_HISTORY_SIZE = int(os.getenv("POLL_HISTORY_SIZE", "200"))
+
+# Documents in flight at once in the asyncio pipeline (main_async.py)
+ASYNC_CONCURRENCY = int(os.getenv("ASYNC_CONCURRENCY", "500"))
+
+# Staged pipeline used by DocumentProcessor.process_documents_in_folder
+DIGITIZATION_WORKERS = int(os.getenv("DIGITIZATION_WORKERS", "8"))
+CLASSIFICATION_WORKERS = int(os.getenv("CLASSIFICATION_WORKERS", "8"))
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "8"))
+VALIDATION_WORKERS = int(os.getenv("VALIDATION_WORKERS", "4"))
+STAGE_QUEUE_SIZE = int(os.getenv("STAGE_QUEUE_SIZE", "100"))
+STAGE_MAX_IN_FLIGHT = int(os.getenv("STAGE_MAX_IN_FLIGHT", "100"))
+PIPELINE_METRICS_INTERVAL = float(os.getenv("PIPELINE_METRICS_INTERVAL", "30"))
+
 
 class ProcessingConfig:
     """
@@ -60,3 +140,42 @@ class DocumentProcessingContext:
         self.project_id: str = project_id
         self.classifier: str | None = classifier
         self.extractor_dict: dict | None = extractor_dict
+
+
+class PipelineConfig:
+    """
+    Worker and queue sizing for each stage of the document pipeline.
+
+    Attributes:
+        digitization_workers (int): Threads uploading and digitizing documents.
+        classification_workers (int): Threads classifying digitized documents.
+        extraction_workers (int): Threads extracting classified documents.
+        validation_workers (int): Threads submitting and awaiting validation.
+        queue_sizes (dict): Maximum number of items waiting in front of each stage.
+        max_in_flight (int): Documents each stage handles or awaits at once.
+        metrics_interval (float): Seconds between queue-depth reports (0 disables them).
+    """
+
+    def __init__(
+        self,
+        digitization_workers: int = DIGITIZATION_WORKERS,
+        classification_workers: int = CLASSIFICATION_WORKERS,
+        extraction_workers: int = EXTRACTION_WORKERS,
+        validation_workers: int = VALIDATION_WORKERS,
+        queue_sizes: dict | None = None,
+        max_in_flight: int = STAGE_MAX_IN_FLIGHT,
+        metrics_interval: float = PIPELINE_METRICS_INTERVAL,
+    ):
+        self.digitization_workers: int = digitization_workers
+        self.classification_workers: int = classification_workers
+        self.extraction_workers: int = extraction_workers
+        self.validation_workers: int = validation_workers
+        self.queue_sizes: dict = {
+            "digitization": STAGE_QUEUE_SIZE,
+            "classification": STAGE_QUEUE_SIZE,
+            "extraction": STAGE_QUEUE_SIZE,
+            "validation": STAGE_QUEUE_SIZE,
+            **(queue_sizes or {}),
+        }
+        self.max_in_flight: int = max_in_flight
+        self.metrics_interval: float = metrics_interval
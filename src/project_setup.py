@@ -1,24 +1,29 @@
 import os
 import json
-import sqlite3
 from dotenv import load_dotenv
 from modules import Digitize, Classify, Extract, Validate, Discovery
-from utils.auth import initialize_authentication
+from utils.auth import get_authentication
+from utils.db_utils import get_connection
+from utils.migrations import run_migrations
+from utils.http_session import get_session
+from utils.token_provider import TokenProvider
 from project_config import (
     ProcessingConfig,
     DocumentProcessingContext,
     BASE_URL,
     CACHE_DIR,
-    SQLITE_DB_PATH,
 )
 
 
-# Load environment variables
-load_dotenv()
+def get_token_provider() -> TokenProvider:
+    """
+    Token provider of the process-wide authentication.
 
-# Initialize Authentication
-auth = initialize_authentication()
-bearer_token = auth.bearer_token
+    Authentication is initialized on the first call rather than on import.
+    Clients read the token through the provider on every request, so tokens
+    refreshed by the refresh thread are picked up.
+    """
+    return TokenProvider(get_authentication())
 
 
 def ensure_cache_directory():
@@ -28,90 +33,23 @@ def ensure_cache_directory():
 
 
 def ensure_database():
-    """Ensure the SQLite database and required tables exist."""
+    """Ensure the SQLite database exists and its schema is up to date."""
     ensure_cache_directory()
-
-    # Check if the database file exists
-    if not os.path.exists(SQLITE_DB_PATH):
-        conn = sqlite3.connect(SQLITE_DB_PATH)
-        cursor = conn.cursor()
-
-        # Create documents table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS documents (
-                document_id TEXT PRIMARY KEY,
-                filename TEXT NOT NULL,
-                stage TEXT NOT NULL,
-                digitization_operation_id TEXT,
-                classification_operation_id TEXT,
-                classification_validation_operation_id TEXT,
-                extraction_operation_id TEXT,
-                extraction_validation_operation_id TEXT,
-                digitization_duration REAL,
-                classification_duration REAL,
-                classification_validation_duration REAL,
-                extraction_duration REAL,
-                extraction_validation_duration REAL,
-                project_id TEXT,
-                classifier_id TEXT,
-                extractor_id TEXT,
-                error_code TEXT,
-                error_message TEXT,
-                timestamp REAL NOT NULL
-            )
-        """)
-
-        # Create classification table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS classification (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                document_id TEXT NOT NULL,
-                filename TEXT NOT NULL,
-                document_type_id TEXT NOT NULL,
-                classification_confidence REAL NOT NULL,
-                start_page INTEGER NOT NULL,
-                page_count INTEGER NOT NULL,
-                classifier_name TEXT NOT NULL,
-                operation_id TEXT NOT NULL
-            )
-        """)
-
-        # Create extraction table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS extraction (
-                filename TEXT NOT NULL,
-                document_id TEXT NOT NULL,
-                document_type_id TEXT NOT NULL,
-                field_id TEXT,
-                field TEXT,
-                is_missing BOOLEAN,
-                field_value TEXT,
-                field_unformatted_value TEXT,
-                validated_field_value TEXT,
-                is_correct BOOLEAN,
-                confidence REAL,
-                ocr_confidence REAL,
-                operator_confirmed BOOLEAN,
-                row_index INTEGER DEFAULT -1,
-                column_index INTEGER DEFAULT -1,
-                page_range TEXT,
-                timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY (filename, field_id, field, row_index, column_index)
-            )
-        """)
-
-        conn.commit()
-        conn.close()
+    run_migrations(get_connection())
 
 
 # Function to initialize clients
 def initialize_clients(
-    context: DocumentProcessingContext, base_url: str, bearer_token: str
+    context: DocumentProcessingContext,
+    base_url: str,
+    bearer_token: str | TokenProvider,
 ):
-    digitize_client = Digitize(base_url, context.project_id, bearer_token)
-    classify_client = Classify(base_url, context.project_id, bearer_token)
-    extract_client = Extract(base_url, context.project_id, bearer_token)
-    validate_client = Validate(base_url, context.project_id, bearer_token)
+    # All clients share one pooled session so connections are kept alive
+    session = get_session()
+    digitize_client = Digitize(base_url, context.project_id, bearer_token, session)
+    classify_client = Classify(base_url, context.project_id, bearer_token, session)
+    extract_client = Extract(base_url, context.project_id, bearer_token, session)
+    validate_client = Validate(base_url, context.project_id, bearer_token, session)
 
     return digitize_client, classify_client, extract_client, validate_client
 
@@ -163,7 +101,8 @@ def initialize_environment():
     # Ensure database exists
     ensure_database()
 
-    discovery_client = Discovery(BASE_URL, bearer_token)
+    token_provider = get_token_provider()
+    discovery_client = Discovery(BASE_URL, token_provider, get_session())
 
     # Get the actual processing configuration
     processing_config = get_processing_config(discovery_client)
@@ -184,6 +123,21 @@ def initialize_environment():
     config = get_processing_config(discovery_client)
 
     # Initialize clients
-    clients = initialize_clients(context, BASE_URL, bearer_token)
+    clients = initialize_clients(context, BASE_URL, token_provider)
+
+    return config, context, clients
+
 
+def initialize_headless_environment(
+    config: ProcessingConfig, context: DocumentProcessingContext
+):
+    """
+    Initialize the processing environment without Discovery.
+
+    The project, classifier, extractors and flags come from the caller
+    (see `headless.headless_settings`), so nothing is prompted for and the
+    Discovery cache is neither read nor rewritten.
+    """
+    ensure_database()
+    clients = initialize_clients(context, BASE_URL, get_token_provider())
     return config, context, clients
@@ -0,0 +1,251 @@
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Iterable, Optional
+from project_config import REPLAY_BATCH_SIZE, REPLAY_WORKERS, RESPONSE_ARCHIVE_DIR
+from utils.db_utils import get_connection, transaction
+from utils.migrations import run_migrations
+from utils.response_archive import ResponseArchive
+from utils.write_results import (
+    UPSERT_EXTRACTION_SQL,
+    classification_rows,
+    extraction_rows,
+    merge_validated_cells,
+    merge_validated_fields,
+    validated_cell_rows,
+    validated_field_rows,
+)
+
+# Archived actions in the order a document goes through them
+REPLAY_ACTIONS = (
+    "digitization",
+    "classification",
+    "classification_validation",
+    "extraction",
+    "extraction_validation",
+)
+
+INSERT_CLASSIFICATION_SQL = """
+    INSERT INTO classification (document_id, filename, document_type_id, classification_confidence,
+                                 start_page, page_count, classifier_name, operation_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def flatten_entry(task: tuple[str, tuple]) -> tuple[tuple, Any]:
+    """
+    Load one archived result and flatten it into table rows.
+
+    Runs in a worker process, so it only reads the archive blob and never
+    touches the database or the network.
+
+    Returns:
+        tuple: (entry, rows). Rows are None for actions that only update the
+        documents table.
+    """
+    root, entry = task
+    _, action, _, operation_id, _, filename, content_hash, codec = entry
+    if action not in ("classification", "extraction", "extraction_validation"):
+        return entry, None
+
+    payload = ResponseArchive(root, codec="auto", enabled=False).load_blob(
+        content_hash, codec
+    )
+    if action == "classification":
+        return entry, classification_rows(payload, filename, operation_id)
+    if action == "extraction":
+        return entry, extraction_rows(os.path.basename(filename), payload)
+    return entry, (validated_field_rows(payload), validated_cell_rows(payload))
+
+
+def _update_document(
+    cursor: sqlite3.Cursor, entry: tuple, stage: str, timestamp: float
+) -> None:
+    document_id, action, module_id, operation_id, project_id, filename, _, _ = entry
+    columns = {
+        "document_id": document_id,
+        "filename": filename,
+        "stage": stage,
+        "project_id": project_id,
+        "timestamp": timestamp,
+        f"{action}_operation_id": operation_id,
+    }
+    if action.startswith("classification"):
+        columns["classifier_id"] = module_id
+    elif action.startswith("extraction"):
+        columns["extractor_id"] = module_id
+
+    # Existing documents keep their stage and durations; only the IDs of the
+    # replayed operation are filled in
+    updates = [
+        f"{column} = excluded.{column}"
+        for column in columns
+        if column.endswith("_id") and column not in ("document_id", "project_id")
+    ]
+    updates.append("project_id = COALESCE(documents.project_id, excluded.project_id)")
+    cursor.execute(
+        f"""
+        INSERT INTO documents ({", ".join(columns)})
+        VALUES ({", ".join("?" * len(columns))})
+        ON CONFLICT(document_id) DO UPDATE SET {", ".join(updates)}
+        """,
+        tuple(columns.values()),
+    )
+
+
+def apply_entry(
+    cursor: sqlite3.Cursor, entry: tuple, rows: Any, stage: str, timestamp: float
+) -> None:
+    """Write the flattened rows of one archived result."""
+    document_id, action, _, operation_id, _, _, _, _ = entry
+    _update_document(cursor, entry, stage, timestamp)
+
+    if action == "classification":
+        # Replaying the same operation twice must not duplicate its rows
+        cursor.execute(
+            "DELETE FROM classification WHERE document_id = ? AND operation_id = ?",
+            (document_id, operation_id),
+        )
+        cursor.executemany(INSERT_CLASSIFICATION_SQL, rows)
+    elif action == "extraction":
+        cursor.executemany(UPSERT_EXTRACTION_SQL, rows)
+    elif action == "extraction_validation":
+        field_rows, cell_rows = rows
+        merge_validated_fields(cursor, field_rows)
+        merge_validated_cells(cursor, cell_rows)
+
+
+def _clear_results(cursor: sqlite3.Cursor, project_id: Optional[str]) -> None:
+    archived = "SELECT document_id FROM response_archive WHERE action = ?"
+    params: tuple = ()
+    if project_id:
+        archived += " AND project_id = ?"
+        params = (project_id,)
+    for table, action in (
+        ("extraction", "extraction"),
+        ("classification", "classification"),
+    ):
+        cursor.execute(
+            f"DELETE FROM {table} WHERE document_id IN ({archived})",
+            (action, *params),
+        )
+
+
+def _batches(entries: list, size: int) -> Iterable[list]:
+    for start in range(0, len(entries), size):
+        yield entries[start : start + size]
+
+
+def replay(
+    archive: ResponseArchive,
+    project_id: Optional[str] = None,
+    workers: int = REPLAY_WORKERS,
+    batch_size: int = REPLAY_BATCH_SIZE,
+    clear: bool = False,
+) -> dict[str, int]:
+    """
+    Rebuild the documents, classification and extraction tables from the archive.
+
+    Archived results are parsed and flattened in parallel by `workers`
+    processes (one per CPU when 0; 1 runs everything in this process), while
+    this process writes the rows, one transaction per `batch_size` results.
+    Results are applied in the order they were archived, so validated
+    values are merged after the extraction they belong to. No API calls
+    are made.
+
+    Args:
+        project_id (str, optional): Only replay results of this project.
+        clear (bool): Delete the stored classification and extraction rows of
+            the replayed documents first, so rows dropped by the flattening
+            logic disappear.
+
+    Returns:
+        dict[str, int]: Number of results replayed per action.
+    """
+    entries = []
+    for entry in archive.entries(REPLAY_ACTIONS, project_id):
+        if entry[5]:
+            entries.append(entry)
+        else:
+            print(
+                f"Skipping archived {entry[1]} result of document {entry[0]}: unknown filename"
+            )
+    counts = {action: 0 for action in REPLAY_ACTIONS}
+    if not entries:
+        return counts
+
+    # The stage of a replayed document is the last archived action
+    final_stage = {entry[0]: entry[1] for entry in entries}
+    workers = workers or os.cpu_count() or 1
+    now = time.time()
+
+    if clear:
+        with transaction() as cursor:
+            _clear_results(cursor, project_id)
+
+    executor: Optional[Executor] = None
+    if workers > 1:
+        # spawn avoids forking a process that runs the database writer thread
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    try:
+        for batch in _batches(entries, max(1, batch_size)):
+            tasks = [(archive.root, entry) for entry in batch]
+            if executor is not None:
+                chunksize = max(1, len(tasks) // (workers * 4))
+                flattened = executor.map(flatten_entry, tasks, chunksize=chunksize)
+            else:
+                flattened = map(flatten_entry, tasks)
+
+            with transaction() as cursor:
+                for entry, rows in flattened:
+                    apply_entry(cursor, entry, rows, final_stage[entry[0]], now)
+                    counts[entry[1]] += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rebuild the result tables from archived API responses (offline)."
+    )
+    parser.add_argument("--project-id", help="Only replay results of this project")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=REPLAY_WORKERS,
+        help="Parsing processes (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--archive-dir",
+        default=RESPONSE_ARCHIVE_DIR,
+        help=f"Folder of the archived responses (default: {RESPONSE_ARCHIVE_DIR})",
+    )
+    parser.add_argument(
+        "--clear",
+        action="store_true",
+        help="Delete the classification and extraction rows of replayed documents first",
+    )
+    args = parser.parse_args()
+
+    # Upgrade databases written by older versions before writing to them
+    run_migrations(get_connection())
+    start_time = time.time()
+    counts = replay(
+        ResponseArchive(args.archive_dir, enabled=False),
+        project_id=args.project_id,
+        workers=args.workers,
+        clear=args.clear,
+    )
+    summary = ", ".join(f"{count} {action}" for action, count in counts.items())
+    print(f"Replayed {summary} in {time.time() - start_time:.1f} seconds")
+
+
+if __name__ == "__main__":
+    main()
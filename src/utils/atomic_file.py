@@ -0,0 +1,58 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+
+
+def _read_umask() -> int:
+    # os.umask can only be read by setting it; done once at import, before
+    # worker threads create files
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _read_umask()
+
+
+def create_temp_file(path: str, suffix: str = ".tmp") -> tuple[int, str]:
+    """
+    Create a temporary file next to `path` for an atomic replace.
+
+    The file gets the permissions `open(path, "w")` would give it under the
+    process umask, instead of the owner-only mode of `tempfile.mkstemp`.
+
+    Returns:
+        tuple[int, str]: The open file descriptor and the temporary path.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=suffix)
+    try:
+        os.chmod(temp_path, 0o666 & ~_UMASK)
+    except BaseException:
+        os.close(fd)
+        os.remove(temp_path)
+        raise
+    return fd, temp_path
+
+
+def commit_temp_file(temp_path: str, path: str) -> None:
+    """Move a finished temporary file over `path` in one step."""
+    os.replace(temp_path, path)
+
+
+@contextmanager
+def atomic_write(path: str, suffix: str = ".tmp", **open_kwargs) -> Iterator:
+    """
+    Open a temporary file that replaces `path` when the block succeeds.
+
+    Readers never see a partially written file; on error the temporary file
+    is removed and `path` is left untouched.
+    """
+    fd, temp_path = create_temp_file(path, suffix)
+    try:
+        with os.fdopen(fd, **open_kwargs) as file:
+            yield file
+        commit_temp_file(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
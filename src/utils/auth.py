@@ -7,6 +7,8 @@ from typing import Optional
 from dataclasses import dataclass
 from urllib.parse import urlparse
 from dotenv import load_dotenv
+from project_config import TOKEN_CACHE, TOKEN_CACHE_FILE
+from utils.token_cache import TokenCache
 
 # Configure logging
 logging.basicConfig(
@@ -14,9 +16,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
-
 
 class AuthenticationError(Exception):
     """Base exception for authentication-related errors."""
@@ -36,6 +35,16 @@ class ConfigurationError(AuthenticationError):
     pass
 
 
+# Scopes requested for every token
+SCOPE = (
+    "Du.DocumentManager.Document "
+    "Du.Classification.Api "
+    "Du.Digitization.Api "
+    "Du.Extraction.Api "
+    "Du.Validation.Api"
+)
+
+
 @dataclass
 class TokenInfo:
     """Data class to store token information."""
@@ -46,10 +55,23 @@ class TokenInfo:
 
 
 class Authentication:
-    def __init__(self, app_id: str, app_secret: str, auth_url: str):
-        """Initialize the Authentication instance with validation."""
+    def __init__(
+        self,
+        app_id: str,
+        app_secret: str,
+        auth_url: str,
+        token_cache: Optional[TokenCache] = None,
+    ):
+        """
+        Initialize the Authentication instance with validation.
+
+        No token is fetched here: a valid token from `token_cache` is reused,
+        otherwise the first `get_bearer_token` call fetches one.
+        """
         # Initialize lock first, before any other operations
         self._lock = threading.Lock()
+        # Held while a new token is fetched so concurrent callers share one fetch
+        self._refresh_lock = threading.Lock()
 
         # Now use the lock for the initialization
         with self._lock:
@@ -60,13 +82,12 @@ class Authentication:
             self.auth_url = auth_url
             self.bearer_token: Optional[str] = None
             self.token_expiry: Optional[float] = None
+            self.token_cache = token_cache
 
-        # Get initial token
-        try:
-            self._initial_token_fetch()
-        except AuthenticationError as e:
-            logger.error(f"Failed to initialize authentication: {e}")
-            raise
+            cached = token_cache.get(app_id, SCOPE) if token_cache else None
+            if cached:
+                self.bearer_token, self.token_expiry = cached
+                logger.info("Using cached bearer token")
 
     @staticmethod
     def _validate_credentials(app_id: str, app_secret: str, auth_url: str) -> None:
@@ -84,59 +105,36 @@ class Authentication:
         except Exception as e:
             raise ConfigurationError(f"Invalid AUTH_URL: {e}")
 
-    def _initial_token_fetch(self):
-        """Fetch initial token without using the lock since we're already in a locked context."""
-        try:
-            data = {
-                "client_id": self.app_id,
-                "client_secret": self.app_secret,
-                "grant_type": "client_credentials",
-                "scope": (
-                    "Du.DocumentManager.Document "
-                    "Du.Classification.Api "
-                    "Du.Digitization.Api "
-                    "Du.Extraction.Api "
-                    "Du.Validation.Api"
-                ),
-            }
-
-            response = requests.post(
-                self.auth_url,
-                data=data,
-                timeout=10,
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-            )
-            response.raise_for_status()
-            token_data = response.json()
-
-            # Validate token response
-            self._validate_token_response(token_data)
-
-            # Set initial token values
-            self.bearer_token = token_data["access_token"]
-            self.token_expiry = time.time() + token_data["expires_in"]
-
-        except Exception as e:
-            logger.error(f"Failed to fetch initial token: {e}")
-            raise TokenError(f"Initial token fetch failed: {str(e)}")
-
     def get_bearer_token(self) -> str:
         """Get a valid bearer token, refreshing if necessary."""
-        # with self._lock:
         if self._is_token_valid():
             return self.bearer_token
 
+        with self._refresh_lock:
+            # Another thread may have refreshed the token while this one waited
+            if self._is_token_valid():
+                return self.bearer_token
+            return self._fetch_token()
+
+    def refresh_rejected_token(self, rejected_token: Optional[str]) -> str:
+        """
+        Fetch a new token after the API rejected `rejected_token` (HTTP 401).
+
+        Only the first of several threads rejected with the same token fetches
+        a new one; the others reuse it.
+        """
+        with self._refresh_lock:
+            if self.bearer_token != rejected_token and self._is_token_valid():
+                return self.bearer_token
+            return self._fetch_token()
+
+    def _fetch_token(self) -> str:
+        """Request a new token from the identity server; callers hold the refresh lock."""
         data = {
             "client_id": self.app_id,
             "client_secret": self.app_secret,
             "grant_type": "client_credentials",
-            "scope": (
-                "Du.DocumentManager.Document "
-                "Du.Classification.Api "
-                "Du.Digitization.Api "
-                "Du.Extraction.Api "
-                "Du.Validation.Api"
-            ),
+            "scope": SCOPE,
         }
 
         try:
@@ -194,6 +192,10 @@ class Authentication:
         with self._lock:
             self.bearer_token = token_info.access_token
             self.token_expiry = time.time() + token_info.expires_in
+        if self.token_cache:
+            self.token_cache.put(
+                self.app_id, SCOPE, token_info.access_token, self.token_expiry
+            )
 
     def _is_token_valid(self) -> bool:
         """Check if the current token is valid with a safety margin."""
@@ -205,9 +207,13 @@ class Authentication:
         )
 
     def refresh_token(self) -> None:
-        """Refresh the bearer token."""
+        """Refresh the bearer token ahead of its expiry."""
+        if self.bearer_token is None:
+            # No token has been needed yet; the first request fetches one
+            return
         try:
-            self.get_bearer_token()
+            with self._refresh_lock:
+                self._fetch_token()
         except AuthenticationError as e:
             logger.error(f"Failed to refresh token: {e}")
             raise
@@ -243,6 +249,7 @@ def initialize_authentication() -> Authentication:
     """Initialize authentication with environment variables."""
     try:
         # Retrieve and validate environment variables
+        load_dotenv()
         app_id = os.getenv("APP_ID")
         app_secret = os.getenv("APP_SECRET")
         auth_url = os.getenv("AUTH_URL")
@@ -253,8 +260,9 @@ def initialize_authentication() -> Authentication:
                 "Please ensure APP_ID, APP_SECRET, and AUTH_URL are set."
             )
 
-        # Initialize Authentication
-        auth = Authentication(app_id, app_secret, auth_url)
+        # Initialize Authentication; the token is fetched on first use
+        token_cache = TokenCache(TOKEN_CACHE_FILE) if TOKEN_CACHE else None
+        auth = Authentication(app_id, app_secret, auth_url, token_cache)
 
         # Create and start token refresh thread
         refresh_thread = threading.Thread(
@@ -271,3 +279,17 @@ def initialize_authentication() -> Authentication:
     except Exception as e:
         logger.error(f"Failed to initialize authentication: {e}")
         raise
+
+
+_shared_auth: Authentication | None = None
+_shared_auth_lock = threading.Lock()
+
+
+def get_authentication() -> Authentication:
+    """Return the process-wide authentication, initializing it on first use."""
+    global _shared_auth
+    if _shared_auth is None:
+        with _shared_auth_lock:
+            if _shared_auth is None:
+                _shared_auth = initialize_authentication()
+    return _shared_auth
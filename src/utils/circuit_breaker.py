@@ -0,0 +1,149 @@
+import sqlite3
+import threading
+import time
+import requests
+from project_config import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+from utils.db_utils import get_circuit_breaker_state, save_circuit_breaker_state
+from utils.rate_limiter import ThrottledError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one classifier or extractor, shared across the process.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests fail fast. Once `reset_timeout` seconds have passed a single
+    probe request is let through: success closes the circuit, failure opens
+    it again, and a probe that ends without either (for example a rejected
+    request) must call `release_probe` so the next request can probe.
+    Only errors showing the module is unavailable count as failures; see
+    `is_unavailable_error`. State is persisted in the `circuit_breakers` table so other
+    scripts and later runs see the same state.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+        persist: bool = True,
+    ):
+        self.key = key
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.persist = persist
+        self.state = CLOSED
+        self.failure_count = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+        if persist:
+            self._load()
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent to the module right now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.time() - (self.opened_at or 0) < self.reset_timeout:
+                    return False
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            # Half-open: only one probe at a time
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        self._save()
+        return True
+
+    def is_open(self) -> bool:
+        with self._lock:
+            return self.state == OPEN and (
+                time.time() - (self.opened_at or 0) < self.reset_timeout
+            )
+
+    def record_success(self) -> None:
+        with self._lock:
+            changed = self.state != CLOSED or self.failure_count
+            self.state = CLOSED
+            self.failure_count = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+        if changed:
+            self._save()
+
+    def release_probe(self) -> None:
+        """Let another request probe after one that ended without a verdict."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failure_count += 1
+            if self.state == HALF_OPEN or self.failure_count >= self.failure_threshold:
+                if self.state != OPEN:
+                    print(f"Circuit opened for {self.key}")
+                self.state = OPEN
+                self.opened_at = time.time()
+            self._probe_in_flight = False
+        self._save()
+
+    def _load(self) -> None:
+        try:
+            row = get_circuit_breaker_state(self.key)
+        except sqlite3.Error as e:
+            print(f"Unable to load circuit breaker state for {self.key}: {e}")
+            return
+        if row:
+            self.state, self.failure_count, self.opened_at = row
+            if self.state == HALF_OPEN:
+                # A probe from a previous run never reported back
+                self.state = OPEN
+
+    def _save(self) -> None:
+        if not self.persist:
+            return
+        with self._lock:
+            state = (self.key, self.state, self.failure_count, self.opened_at)
+        try:
+            # Queued on the database writer, which reports failed writes
+            save_circuit_breaker_state(*state)
+        except (sqlite3.Error, RuntimeError) as e:
+            print(f"Unable to save circuit breaker state for {self.key}: {e}")
+
+
+def is_unavailable_error(error: Exception) -> bool:
+    """
+    Return True if a failed request shows that the module is unavailable.
+
+    Connection errors, timeouts and 5xx responses count; client errors such
+    as a bad request, and throttling, say nothing about the module.
+    """
+    if isinstance(error, ThrottledError):
+        return False
+    if isinstance(
+        error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    ):
+        return True
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code >= 500
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(module_type: str, module_id: str) -> CircuitBreaker:
+    """Return the shared circuit breaker for a classifier or extractor."""
+    key = f"{module_type}:{module_id}"
+    with _breakers_lock:
+        if key not in _breakers:
+            _breakers[key] = CircuitBreaker(key)
+        return _breakers[key]
@@ -0,0 +1,301 @@
+import os
+import sqlite3
+from typing import Iterable, Optional
+from urllib.parse import quote
+from project_config import EXPORT_CHUNK_ROWS
+from utils.atomic_file import commit_temp_file, create_temp_file
+from utils.db_utils import get_connection
+
+# pyarrow is optional; only the columnar export needs it
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+FORMATS = ("parquet", "arrow")
+TABLES = ("extraction", "classification")
+
+# Partition value (and file name) of rows without a document type, day or project
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# (column, SQL expression, arrow type name) of each exported table. Every
+# query ends with the document_type_id and day partition columns, which are
+# encoded in the directory names instead of the files, and the project ID,
+# which names the file inside the partition.
+_COLUMNS = {
+    "extraction": [
+        ("filename", "e.filename", "string"),
+        ("document_id", "e.document_id", "string"),
+        ("project_id", "d.project_id", "string"),
+        ("field_id", "e.field_id", "string"),
+        ("field", "e.field", "string"),
+        ("is_missing", "e.is_missing", "bool"),
+        ("field_value", "e.field_value", "string"),
+        ("field_unformatted_value", "e.field_unformatted_value", "string"),
+        ("validated_field_value", "e.validated_field_value", "string"),
+        ("is_correct", "e.is_correct", "bool"),
+        ("confidence", "e.confidence", "float"),
+        ("ocr_confidence", "e.ocr_confidence", "float"),
+        ("operator_confirmed", "e.operator_confirmed", "bool"),
+        ("row_index", "e.row_index", "int"),
+        ("column_index", "e.column_index", "int"),
+        ("page_range", "e.page_range", "string"),
+        ("timestamp", "CAST(strftime('%s', e.timestamp) AS INTEGER)", "timestamp"),
+    ],
+    "classification": [
+        ("document_id", "c.document_id", "string"),
+        ("filename", "c.filename", "string"),
+        ("project_id", "d.project_id", "string"),
+        ("classification_confidence", "c.classification_confidence", "float"),
+        ("start_page", "c.start_page", "int"),
+        ("page_count", "c.page_count", "int"),
+        ("classifier_name", "c.classifier_name", "string"),
+        ("operation_id", "c.operation_id", "string"),
+        ("timestamp", "CAST(d.timestamp AS INTEGER)", "timestamp"),
+    ],
+}
+
+# FROM clause, day expression and time ordering of each exported table.
+# Extraction rows carry their own timestamp; classification rows use the
+# timestamp of their document.
+_SOURCES = {
+    "extraction": (
+        "extraction e LEFT JOIN documents d ON d.document_id = e.document_id",
+        "e.document_type_id",
+        "substr(e.timestamp, 1, 10)",
+        "e.timestamp",
+    ),
+    "classification": (
+        "classification c LEFT JOIN documents d ON d.document_id = c.document_id",
+        "c.document_type_id",
+        "date(d.timestamp, 'unixepoch')",
+        "d.timestamp",
+    ),
+}
+
+
+def pyarrow_available() -> bool:
+    return pa is not None
+
+
+def _arrow_type(name: str):
+    return {
+        "string": pa.string(),
+        "bool": pa.bool_(),
+        "float": pa.float64(),
+        "int": pa.int64(),
+        "timestamp": pa.timestamp("s", tz="UTC"),
+    }[name]
+
+
+def table_schema(table: str):
+    """Return the Arrow schema of the files exported for `table`."""
+    return pa.schema(
+        [(name, _arrow_type(type_name)) for name, _, type_name in _COLUMNS[table]]
+    )
+
+
+def build_query(
+    table: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    project_id: Optional[str] = None,
+    document_type_id: Optional[str] = None,
+) -> tuple[str, tuple]:
+    """
+    Return the SELECT streaming `table` ordered by document type and day.
+
+    `since` and `until` are inclusive YYYY-MM-DD days (UTC).
+    """
+    source, type_column, day_expression, order_column = _SOURCES[table]
+    columns = [expression for _, expression, _ in _COLUMNS[table]]
+    columns += [type_column, day_expression, "d.project_id"]
+
+    conditions, params = [], []
+    if since:
+        conditions.append(f"{day_expression} >= ?")
+        params.append(since)
+    if until:
+        conditions.append(f"{day_expression} <= ?")
+        params.append(until)
+    if project_id:
+        conditions.append("d.project_id = ?")
+        params.append(project_id)
+    if document_type_id:
+        conditions.append(f"{type_column} = ?")
+        params.append(document_type_id)
+
+    query = f"SELECT {', '.join(columns)} FROM {source}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    # Rows of one partition file are contiguous, so one file is open at a time
+    query += f" ORDER BY {type_column}, d.project_id, {order_column}"
+    return query, tuple(params)
+
+
+def partition_path(
+    output_dir: str,
+    table: str,
+    document_type_id: str,
+    day: str,
+    project_id: str,
+    file_format: str,
+) -> str:
+    """
+    Return the path of one project's file in a hive-style document type/day
+    partition.
+    """
+    return os.path.join(
+        output_dir,
+        table,
+        f"document_type_id={quote(document_type_id or NULL_PARTITION, safe='')}",
+        f"day={day or NULL_PARTITION}",
+        f"part-{quote(project_id or NULL_PARTITION, safe='')}.{file_format}",
+    )
+
+
+class PartitionWriter:
+    """
+    Write the record batches of one partition to a Parquet or Arrow IPC file.
+
+    Batches go to a temporary file in the partition folder that replaces
+    the previous export when the writer is closed, so a partition is never
+    seen half written.
+    """
+
+    def __init__(self, path: str, schema, file_format: str):
+        self.path = path
+        self.rows = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, self._temp_path = create_temp_file(path)
+        os.close(fd)
+        if file_format == "parquet":
+            self._writer = pq.ParquetWriter(self._temp_path, schema)
+        else:
+            self._writer = pa.ipc.new_file(self._temp_path, schema)
+
+    def write(self, batch) -> None:
+        self._writer.write_batch(batch)
+        self.rows += batch.num_rows
+
+    def close(self) -> None:
+        self._writer.close()
+        commit_temp_file(self._temp_path, self.path)
+
+    def abort(self) -> None:
+        try:
+            self._writer.close()
+        finally:
+            os.remove(self._temp_path)
+
+
+def _record_batch(table: str, schema, rows: list[tuple]):
+    columns = list(zip(*rows))
+    arrays = []
+    for index, (_, _, type_name) in enumerate(_COLUMNS[table]):
+        values = columns[index]
+        if type_name == "bool":
+            # SQLite stores booleans as 0/1
+            arrays.append(pa.array(values, type=pa.int8()).cast(pa.bool_()))
+        else:
+            arrays.append(pa.array(values, type=_arrow_type(type_name)))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def export_table(
+    table: str,
+    output_dir: str,
+    file_format: str = "parquet",
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    project_id: Optional[str] = None,
+    document_type_id: Optional[str] = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> dict[str, int]:
+    """
+    Stream a result table into files partitioned by document type and day.
+
+    Rows are fetched `chunk_rows` at a time and written as one record batch
+    (Parquet row group) per chunk, so memory stays bounded however large
+    the table is. Each partition holds one file per project, and each
+    exported file replaces its previous version; files outside the filters,
+    including other projects' files in the same partition, are left
+    untouched.
+
+    The output can be read back with, for example,
+    `pandas.read_parquet("<output_dir>/extraction", filters=[("day", ">=", "2024-05-01")])`.
+
+    Returns:
+        dict[str, int]: Rows written per partition file.
+    """
+    if not pyarrow_available():
+        raise RuntimeError(
+            "pyarrow is required for Parquet/Arrow exports: pip install pyarrow"
+        )
+    if file_format not in FORMATS:
+        raise ValueError(f"Unsupported export format '{file_format}'")
+
+    schema = table_schema(table)
+    width = len(_COLUMNS[table])
+    query, params = build_query(table, since, until, project_id, document_type_id)
+    cursor = get_connection().cursor()
+    cursor.execute(query, params)
+
+    written = {}
+    writer = None
+    partition = None
+    pending = []
+
+    def flush() -> None:
+        if pending:
+            writer.write(_record_batch(table, schema, pending))
+            pending.clear()
+
+    try:
+        while True:
+            rows = cursor.fetchmany(max(1, chunk_rows))
+            if not rows:
+                break
+            for row in rows:
+                key = row[width:]
+                if key != partition:
+                    if writer is not None:
+                        flush()
+                        writer.close()
+                        written[writer.path] = writer.rows
+                    partition = key
+                    writer = PartitionWriter(
+                        partition_path(output_dir, table, *key, file_format),
+                        schema,
+                        file_format,
+                    )
+                pending.append(row[:width])
+                if len(pending) >= chunk_rows:
+                    flush()
+        if writer is not None:
+            flush()
+            writer.close()
+            written[writer.path] = writer.rows
+    except BaseException:
+        if writer is not None and writer.path not in written:
+            writer.abort()
+        raise
+    return written
+
+
+def export_tables(
+    output_dir: str,
+    tables: Iterable[str] = TABLES,
+    file_format: str = "parquet",
+    **filters,
+) -> dict[str, int]:
+    """Export several result tables; see `export_table` for the filters."""
+    written = {}
+    for table in tables:
+        try:
+            written.update(export_table(table, output_dir, file_format, **filters))
+        except sqlite3.Error as e:
+            print(f"Unable to export table {table}: {e}")
+    return written
@@ -1,18 +1,141 @@
 import sqlite3
+import threading
 import time
+import weakref
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Any, Optional
-from project_config import SQLITE_DB_PATH, CACHE_EXPIRY_DAYS
+from concurrent.futures import Future
+from typing import Any, Callable, Iterator, Optional
+from project_config import (
+    DB_WRITE_BEHIND,
+    SQLITE_DB_PATH,
+    CACHE_EXPIRY_DAYS,
+    SQLITE_BUSY_TIMEOUT,
+    SQLITE_CACHED_STATEMENTS,
+    SQLITE_SYNCHRONOUS,
+)
+
+# Accepted values of PRAGMA synchronous, which cannot take a bound parameter
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+# Each thread keeps one open connection per database file
+_local = threading.local()
+
+
+class _ThreadConnections:
+    """A thread's open connections, closed when the thread exits."""
+
+    def __init__(self):
+        self.connections: dict[str, sqlite3.Connection] = {}
+        # Runs on the exiting thread once its thread-local data is released
+        weakref.finalize(self, _close_all, self.connections)
+
+
+def _close_all(connections: dict[str, sqlite3.Connection]) -> None:
+    for conn in connections.values():
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    connections.clear()
+
+
+def _synchronous_mode() -> str:
+    mode = str(SQLITE_SYNCHRONOUS).upper()
+    if mode not in SYNCHRONOUS_MODES:
+        raise ValueError(
+            f"Invalid SQLITE_SYNCHRONOUS {SQLITE_SYNCHRONOUS!r}; "
+            f"expected one of {', '.join(SYNCHRONOUS_MODES)}"
+        )
+    return mode
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Return this thread's connection to the cache database, opening it on first use.
+
+    Connections stay open for the life of the thread and are closed when it
+    exits. They use WAL journaling so readers never block the writer, wait up
+    to SQLITE_BUSY_TIMEOUT seconds on a locked database and keep a cache of
+    prepared statements.
+    """
+    local = getattr(_local, "connections", None)
+    if local is None:
+        local = _local.connections = _ThreadConnections()
+
+    conn = local.connections.get(SQLITE_DB_PATH)
+    if conn is None:
+        synchronous = _synchronous_mode()
+        conn = sqlite3.connect(
+            SQLITE_DB_PATH,
+            timeout=SQLITE_BUSY_TIMEOUT,
+            cached_statements=SQLITE_CACHED_STATEMENTS,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT * 1000)}")
+        conn.execute(f"PRAGMA synchronous={synchronous}")
+        local.connections[SQLITE_DB_PATH] = conn
+    return conn
+
+
+def close_connection() -> None:
+    """Close this thread's connections."""
+    local = getattr(_local, "connections", None)
+    if local is not None:
+        _close_all(local.connections)
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Cursor]:
+    """Run several statements in one transaction, committed on success."""
+    conn = get_connection()
+    with conn:
+        yield conn.cursor()
 
 
 def execute_query(query: str, params: tuple = ()) -> list[Any]:
     """Execute an SQL query and return results."""
-    with sqlite3.connect(SQLITE_DB_PATH) as conn:
-        cursor = conn.cursor()
+    with transaction() as cursor:
         cursor.execute(query, params)
         return cursor.fetchall()
 
 
+def submit_write(write: Callable[..., Any], *args, **kwargs) -> Future:
+    """
+    Run `write(cursor, *args, **kwargs)` on the database writer thread.
+
+    Returns a future instead of waiting for the commit. With DB_WRITE_BEHIND
+    disabled the write runs in a transaction on the calling thread.
+    """
+    if DB_WRITE_BEHIND:
+        # Imported here since the writer itself uses get_connection
+        from utils.db_writer import get_db_writer
+
+        return get_db_writer().submit(write, *args, **kwargs)
+
+    future = Future()
+    try:
+        with transaction() as cursor:
+            future.set_result(write(cursor, *args, **kwargs))
+    except Exception as e:
+        print(f"Database write {getattr(write, '__name__', write)} failed: {e}")
+        future.set_exception(e)
+    return future
+
+
+def flush_writes() -> None:
+    """Block until every write submitted so far is committed."""
+    if DB_WRITE_BEHIND:
+        from utils.db_writer import get_db_writer
+
+        get_db_writer().flush()
+
+
+def _execute(cursor: sqlite3.Cursor, *statements: tuple[str, tuple]) -> None:
+    for query, params in statements:
+        cursor.execute(query, params)
+
+
 def update_document_stage(
     action: str,
     document_id: str,
@@ -23,8 +146,8 @@ def update_document_stage(
     extractor_id: Optional[str] = None,
     error_code: Optional[str] = None,
     error_message: Optional[str] = None,
-) -> None:
-    """Update the stage of a document."""
+) -> Future:
+    """Queue an update of the stage of a document."""
     operation_id_column = f"{action}_operation_id"
     duration_column = f"{action}_duration"
 
@@ -49,7 +172,7 @@ def update_document_stage(
     query += " WHERE document_id = ?"
     params.append(document_id)
 
-    execute_query(query, tuple(params))
+    return submit_write(_execute, (query, tuple(params)))
 
 
 def insert_classification_results(
@@ -61,8 +184,8 @@ def insert_classification_results(
     page_count: int,
     classifier_name: str,
     operation_id: str,
-) -> None:
-    """Insert classification results into the database."""
+) -> Future:
+    """Queue an insert of classification results into the database."""
     query = """
         INSERT INTO classification (document_id, filename, document_type_id, classification_confidence,
                                      start_page, page_count, classifier_name, operation_id)
@@ -78,13 +201,10 @@ def insert_classification_results(
         classifier_name,
         operation_id,
     )
-    execute_query(query, params)
+    return submit_write(_execute, (query, params))
 
 
-def get_document_id_from_cache(filename: str) -> Optional[str]:
-    """Retrieve the document_id based on the filename."""
-    query = "SELECT document_id, timestamp FROM documents WHERE filename = ?"
-    result = execute_query(query, (filename,))
+def _unexpired_document_id(result: list) -> Optional[str]:
     if result:
         document_id, timestamp = result[0]
         cache_time = datetime.fromtimestamp(timestamp)
@@ -94,6 +214,95 @@ def get_document_id_from_cache(filename: str) -> Optional[str]:
     return None
 
 
+def get_document_id_by_hash(content_hash: str, project_id: str) -> Optional[str]:
+    """Retrieve the document_id of a file digitized with the same contents in the project."""
+    query = """
+        SELECT document_id, timestamp FROM documents
+        WHERE content_hash = ? AND project_id = ?
+            AND stage NOT IN ('digitize-pending', 'digitization_failed')
+        ORDER BY timestamp DESC
+        LIMIT 1
+    """
+    return _unexpired_document_id(execute_query(query, (content_hash, project_id)))
+
+
+def get_pending_operations(project_id: str) -> list[tuple]:
+    """
+    Return the operations an interrupted run left running in the cloud.
+
+    Each row is (filename, document_id, stage, module_id, operation_id,
+    page_range). For digitization the document ID doubles as the operation
+    ID. Extractions are returned one row per page range, with "" for a
+    document that was not split by classification.
+    """
+    query = """
+        SELECT filename, document_id, stage,
+            CASE stage WHEN 'classify-pending' THEN classifier_id END,
+            CASE stage
+                WHEN 'digitize-pending' THEN document_id
+                WHEN 'classify-pending' THEN classification_operation_id
+            END,
+            NULL
+        FROM documents
+        WHERE project_id = ? AND document_id IS NOT NULL
+            AND stage IN ('digitize-pending', 'classify-pending')
+        UNION ALL
+        SELECT d.filename, p.document_id, 'extraction-pending', p.extractor_id,
+            p.operation_id, p.page_range
+        FROM pending_extractions p
+        JOIN documents d ON d.document_id = p.document_id
+        WHERE d.project_id = ?
+    """
+    return execute_query(query, (project_id, project_id))
+
+
+def get_parked_documents(project_id: Optional[str] = None) -> list[tuple]:
+    """
+    Return (filename, document_id, stage, project_id) of documents parked
+    while a classifier or extractor circuit was open.
+    """
+    query = """
+        SELECT filename, document_id, stage, project_id FROM documents
+        WHERE stage IN ('classification_parked', 'extraction_parked')
+    """
+    params: tuple = ()
+    if project_id is not None:
+        query += " AND project_id = ?"
+        params = (project_id,)
+    return execute_query(query, params)
+
+
+def save_pending_extraction(
+    document_id: str, extractor_id: str, page_range: Optional[str], operation_id: str
+) -> Future:
+    """Queue a record of an extraction started for one page range of a document."""
+    query = """
+        INSERT OR REPLACE INTO pending_extractions
+            (document_id, extractor_id, page_range, operation_id, started_at)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    return submit_write(
+        _execute,
+        (
+            query,
+            (document_id, extractor_id, page_range or "", operation_id, time.time()),
+        ),
+    )
+
+
+def clear_pending_extraction(
+    document_id: str, extractor_id: str, page_range: Optional[str]
+) -> Future:
+    """Queue removal of the record of a finished extraction."""
+    query = """
+        DELETE FROM pending_extractions
+        WHERE document_id = ? AND extractor_id = ? AND page_range = ?
+    """
+    return submit_write(
+        _execute, (query, (document_id, extractor_id, page_range or ""))
+    )
+
+
 def update_cache(
     filename: str,
     document_id: Optional[str],
@@ -101,29 +310,47 @@ def update_cache(
     project_id: Optional[str] = None,
     error_code: Optional[str] = None,
     error_message: Optional[str] = None,
-) -> None:
-    """Insert or update the document cache."""
+    content_hash: Optional[str] = None,
+) -> Future:
+    """
+    Queue an insert or update of the document cache.
+
+    Entries are keyed by content hash and project when `content_hash` is
+    given, so the filename is only recorded as metadata. Without a hash the
+    entry is keyed by filename.
+    """
     timestamp = time.time()
-    query_update = """
+    if content_hash is not None:
+        key_clause = "content_hash = ? AND project_id = ?"
+        key_params = (content_hash, project_id)
+    else:
+        key_clause = "filename = ?"
+        key_params = (filename,)
+
+    query_update = f"""
         UPDATE documents
-        SET document_id = ?, stage = ?, timestamp = ?, project_id = ?, error_code = ?, error_message = ?
-        WHERE filename = ?
+        SET document_id = ?, filename = ?, stage = ?, timestamp = ?, project_id = ?,
+            error_code = ?, error_message = ?, content_hash = ?
+        WHERE {key_clause}
     """
     params_update = (
         document_id,
+        filename,
         stage,
         timestamp,
         project_id,
         error_code,
         error_message,
-        filename,
+        content_hash,
+        *key_params,
     )
 
-    query_insert = """
-        INSERT INTO documents (document_id, filename, stage, timestamp, project_id, error_code, error_message)
-        SELECT ?, ?, ?, ?, ?, ?, ?
+    query_insert = f"""
+        INSERT INTO documents (document_id, filename, stage, timestamp, project_id,
+                               error_code, error_message, content_hash)
+        SELECT ?, ?, ?, ?, ?, ?, ?, ?
         WHERE NOT EXISTS (
-            SELECT 1 FROM documents WHERE filename = ?
+            SELECT 1 FROM documents WHERE {key_clause}
         )
     """
     params_insert = (
@@ -134,8 +361,42 @@ def update_cache(
         project_id,
         error_code,
         error_message,
-        filename,
+        content_hash,
+        *key_params,
     )
 
-    execute_query(query_update, params_update)
-    execute_query(query_insert, params_insert)
+    # Both statements are applied in the same transaction
+    return submit_write(
+        _execute, (query_update, params_update), (query_insert, params_insert)
+    )
+
+
+def get_circuit_breaker_state(key: str) -> Optional[tuple]:
+    """Return the persisted (state, failure_count, opened_at) of a circuit breaker."""
+    query = "SELECT state, failure_count, opened_at FROM circuit_breakers WHERE key = ?"
+    result = execute_query(query, (key,))
+    return result[0] if result else None
+
+
+def get_circuit_breaker_states() -> list[tuple]:
+    """Return (key, state, failure_count, opened_at) for every circuit breaker."""
+    query = "SELECT key, state, failure_count, opened_at FROM circuit_breakers"
+    return execute_query(query)
+
+
+def save_circuit_breaker_state(
+    key: str, state: str, failure_count: int, opened_at: Optional[float]
+) -> Future:
+    """Queue an insert or update of the persisted state of a circuit breaker."""
+    query = """
+        INSERT INTO circuit_breakers (key, state, failure_count, opened_at, updated_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(key) DO UPDATE SET
+            state = excluded.state,
+            failure_count = excluded.failure_count,
+            opened_at = excluded.opened_at,
+            updated_at = excluded.updated_at
+    """
+    return submit_write(
+        _execute, (query, (key, state, failure_count, opened_at, time.time()))
+    )
@@ -0,0 +1,170 @@
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+from project_config import (
+    DB_WRITER_BATCH_SIZE,
+    DB_WRITER_FLUSH_MS,
+    DB_WRITER_FLUSH_TIMEOUT,
+    DB_WRITER_QUEUE_SIZE,
+)
+from utils.db_utils import get_connection
+
+# Sentinel telling the writer thread to exit
+_STOP = object()
+
+
+def _barrier(cursor: sqlite3.Cursor) -> None:
+    return None
+
+
+class DatabaseWriter:
+    """
+    Single writer thread applying queued database writes in group commits.
+
+    Workers hand over a write as a function taking a cursor and get a future
+    back immediately. The writer runs up to `batch_size` queued writes, or
+    whatever arrived within `flush_interval` seconds, in one transaction and
+    commits once. Each write runs in its own savepoint, so a failing write
+    is rolled back and reported without losing the rest of the batch.
+
+    Writes are applied in submission order. Write functions must only use
+    the cursor they are given (not `execute_query`, which would commit the
+    group transaction early).
+
+    Attributes:
+        flush_interval (float): Longest time a write waits for a batch to fill.
+        batch_size (int): Maximum number of writes per commit.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = DB_WRITER_FLUSH_MS / 1000,
+        batch_size: int = DB_WRITER_BATCH_SIZE,
+        queue_size: int = DB_WRITER_QUEUE_SIZE,
+    ):
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._lock = threading.Lock()
+        self.commits = 0
+        self.writes = 0
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="DatabaseWriter"
+        )
+        self._thread.start()
+
+    def submit(self, write: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queue `write(cursor, *args, **kwargs)` and return a future of its result."""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Database writer is closed")
+        if not self._thread.is_alive():
+            raise RuntimeError("Database writer thread is not running")
+        # Blocks only when the queue is full, which pushes back on producers
+        self._queue.put((write, args, kwargs, future))
+        return future
+
+    def flush(self, timeout: float | None = DB_WRITER_FLUSH_TIMEOUT) -> None:
+        """
+        Block until every write submitted before this call is committed.
+
+        Raises TimeoutError if that takes longer than `timeout` seconds.
+        """
+        self.submit(_barrier).result(timeout)
+
+    def close(self) -> None:
+        """Commit all queued writes and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = (
+                        self._queue.get(timeout=timeout)
+                        if timeout > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._commit(batch)
+
+    def _commit(self, batch: list) -> None:
+        outcomes = []
+        conn = None
+        try:
+            # Opened here so a database that cannot be opened fails the batch
+            # instead of the writer thread
+            conn = get_connection()
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            for write, args, kwargs, future in batch:
+                cursor.execute("SAVEPOINT write")
+                try:
+                    result = write(cursor, *args, **kwargs)
+                    cursor.execute("RELEASE write")
+                    outcomes.append((future, result, None))
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO write")
+                    cursor.execute("RELEASE write")
+                    print(
+                        f"Database write {getattr(write, '__name__', write)} failed: {e}"
+                    )
+                    outcomes.append((future, None, e))
+            conn.commit()
+        except Exception as e:
+            if conn is not None:
+                try:
+                    conn.rollback()
+                except sqlite3.Error:
+                    pass
+            print(f"Database group commit of {len(batch)} writes failed: {e}")
+            outcomes = [(future, None, e) for _, _, _, future in batch]
+
+        self.commits += 1
+        self.writes += len(batch)
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+_shared_writer: DatabaseWriter | None = None
+_shared_writer_lock = threading.Lock()
+
+
+def get_db_writer() -> DatabaseWriter:
+    """Return the process-wide database writer, starting it on first use."""
+    global _shared_writer
+    if _shared_writer is None:
+        with _shared_writer_lock:
+            if _shared_writer is None:
+                _shared_writer = DatabaseWriter()
+                # Queued writes are committed before the interpreter exits
+                atexit.register(_shared_writer.close)
+    return _shared_writer
@@ -0,0 +1,13 @@
+import hashlib
+
+# Read documents in 1 MiB chunks so large scans are never loaded into memory
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,29 @@
+from concurrent.futures import Future
+from typing import Any, Callable
+
+
+def resolved(value: Any) -> Future:
+    """Return a future that already holds `value`."""
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+def then(future: Future, fn: Callable[[Any], Any]) -> Future:
+    """
+    Return a future of `fn` applied to the result of `future`.
+
+    `fn` runs in the thread that completes `future`, usually a poller worker,
+    so it must only do short bookkeeping such as parsing a result or queueing
+    database writes. Exceptions from either step are set on the returned future.
+    """
+    chained = Future()
+
+    def done(completed: Future) -> None:
+        try:
+            chained.set_result(fn(completed.result()))
+        except BaseException as e:
+            chained.set_exception(e)
+
+    future.add_done_callback(done)
+    return chained
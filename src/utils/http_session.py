@@ -0,0 +1,217 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from project_config import HTTP_POOL_CONNECTIONS, HTTP_POOL_SIZE, MAX_THROTTLE_RETRIES
+from utils.json_codec import dumps
+from utils.rate_limiter import (
+    THROTTLE_STATUS_CODES,
+    RateLimiter,
+    ThrottledError,
+    endpoint_for,
+    get_rate_limiter,
+    parse_retry_after,
+)
+from utils.token_provider import TokenProvider
+
+UNAUTHORIZED = 401
+
+
+class HttpSession:
+    """
+    Thread-safe wrapper around a pooled `requests.Session`.
+
+    A single instance is shared by every API client so that status polls and
+    start calls reuse keep-alive connections instead of paying a new TCP+TLS
+    handshake per request. Connections are pooled per host by urllib3.
+
+    Every request first takes a token from the shared rate limiter. HTTP 429
+    and 503 responses pause the endpoint group for the Retry-After period and
+    are re-sent automatically. Requests sent with a `token_provider` are
+    re-sent once with a refreshed token when rejected with HTTP 401.
+
+    Attributes:
+        pool_connections (int): Number of per-host connection pools to cache.
+        pool_size (int): Maximum number of connections kept alive per host.
+        max_throttle_retries (int): Re-sends of a throttled request before giving up.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = HTTP_POOL_CONNECTIONS,
+        pool_size: int = HTTP_POOL_SIZE,
+        rate_limiter: RateLimiter | None = None,
+        max_throttle_retries: int = MAX_THROTTLE_RETRIES,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_size = pool_size
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.max_throttle_retries = max_throttle_retries
+        self._lock = threading.Lock()
+        self._request_count = 0
+        self._throttled_count = 0
+        self._reauthenticated_count = 0
+
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_size,
+            pool_block=False,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        endpoint: str | None = None,
+        retry_throttled: bool = True,
+        token_provider: TokenProvider | None = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a request through the shared connection pool.
+
+        A `json` body is serialized with `utils.json_codec` (orjson when
+        installed) and sent as `data`.
+
+        Args:
+            endpoint (str | None): Rate limit group (`start`, `poll` or
+                `discovery`); inferred from the URL when omitted.
+            retry_throttled (bool): Re-send throttled requests after waiting. When
+                False a `ThrottledError` is raised instead, so callers such as the
+                poller can re-queue the request without blocking a thread.
+            token_provider (TokenProvider | None): Source of the bearer token in
+                the Authorization header, refreshed after an HTTP 401.
+        """
+        endpoint = endpoint or endpoint_for(method, url)
+        send = getattr(self.session, method.lower())
+        if kwargs.get("json") is not None:
+            # Serialize request bodies with the fastest available JSON library
+            headers = CaseInsensitiveDict(kwargs.pop("headers", None) or {})
+            headers.setdefault("Content-Type", "application/json")
+            kwargs["data"] = dumps(kwargs.pop("json"))
+            kwargs["headers"] = headers
+        reauthenticated = token_provider is None
+        attempt = 0
+
+        while True:
+            self.rate_limiter.acquire(endpoint)
+            with self._lock:
+                self._request_count += 1
+            response = send(url, **kwargs)
+            if response.status_code == UNAUTHORIZED and not reauthenticated:
+                # The token expired or was revoked: refresh it once and re-send
+                reauthenticated = True
+                response.close()
+                kwargs["headers"] = self._reauthenticate(
+                    token_provider, kwargs.get("headers")
+                )
+                _rewind_files(kwargs.get("files"))
+                continue
+            if response.status_code not in THROTTLE_STATUS_CODES:
+                return response
+
+            retry_after = parse_retry_after(
+                response.headers.get("Retry-After"), attempt
+            )
+            # Release the connection of a streamed response that is not read
+            response.close()
+            self.rate_limiter.pause(endpoint, retry_after)
+            with self._lock:
+                self._throttled_count += 1
+
+            if not retry_throttled or attempt >= self.max_throttle_retries:
+                raise ThrottledError(
+                    f"{method} {url} throttled with HTTP {response.status_code}",
+                    retry_after=retry_after,
+                    response=response,
+                )
+
+            attempt += 1
+            print(
+                f"Request throttled (HTTP {response.status_code}). "
+                f"Retry {attempt}/{self.max_throttle_retries} in {retry_after:.1f} seconds..."
+            )
+            _rewind_files(kwargs.get("files"))
+
+    def _reauthenticate(
+        self, token_provider: TokenProvider, headers: dict | None
+    ) -> CaseInsensitiveDict:
+        """Return a copy of `headers` carrying a token refreshed after a 401."""
+        headers = CaseInsensitiveDict(headers or {})
+        authorization = headers.get("Authorization") or ""
+        rejected_token = authorization.removeprefix("Bearer ") or None
+        headers["Authorization"] = f"Bearer {token_provider.refresh(rejected_token)}"
+        with self._lock:
+            self._reauthenticated_count += 1
+        print("Request rejected with HTTP 401. Retrying with a refreshed token...")
+        return headers
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> dict:
+        """
+        Return connection reuse counters aggregated over all host pools.
+
+        Returns:
+            dict: `requests` sent through the session, `throttled` responses,
+            requests `reauthenticated` after a 401, `connections_opened` by urllib3, `connections_reused` and the
+            per-host breakdown.
+        """
+        hosts = {}
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                "requests": pool.num_requests,
+                "connections_opened": pool.num_connections,
+            }
+
+        pooled_requests = sum(host["requests"] for host in hosts.values())
+        connections_opened = sum(host["connections_opened"] for host in hosts.values())
+        with self._lock:
+            request_count = self._request_count
+            throttled_count = self._throttled_count
+            reauthenticated_count = self._reauthenticated_count
+
+        return {
+            "requests": request_count,
+            "throttled": throttled_count,
+            "reauthenticated": reauthenticated_count,
+            "connections_opened": connections_opened,
+            "connections_reused": max(0, pooled_requests - connections_opened),
+            "hosts": hosts,
+        }
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def _rewind_files(files: dict | None) -> None:
+    """Rewind uploaded file objects so a throttled upload can be re-sent."""
+    for value in (files or {}).values():
+        file_object = value[1] if isinstance(value, tuple) else value
+        if hasattr(file_object, "seek"):
+            file_object.seek(0)
+
+
+_shared_session: HttpSession | None = None
+_shared_session_lock = threading.Lock()
+
+
+def get_session() -> HttpSession:
+    """Return the process-wide shared HTTP session, creating it on first use."""
+    global _shared_session
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                _shared_session = HttpSession()
+    return _shared_session
@@ -0,0 +1,78 @@
+import json
+from typing import Any
+from project_config import JSON_STREAM_THRESHOLD_MB
+
+# orjson and ijson are optional; the standard library is used without them
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def backend() -> str:
+    """Name of the JSON library used for encoding and decoding."""
+    return "orjson" if orjson is not None else "json"
+
+
+def loads(data: bytes | bytearray | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(
+        obj, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def canonical_dumps(obj: Any) -> bytes:
+    """
+    Serialize to sorted, compact, ASCII-only JSON bytes.
+
+    Always uses the standard library so the output, and any hash taken of it,
+    does not depend on which JSON backend is installed.
+    """
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _is_large_body(response) -> bool:
+    # Chunked responses have no length and are usually small status polls
+    try:
+        length = int(response.headers.get("Content-Length"))
+    except (TypeError, ValueError):
+        return False
+    return length >= JSON_STREAM_THRESHOLD_MB * 1024 * 1024
+
+
+def parse_response(response, stream: bool = False) -> Any:
+    """
+    Decode the JSON body of an HTTP response.
+
+    Pass `stream=True` for responses requested with `stream=True` whose body
+    has not been read yet. Their bodies are parsed incrementally from the
+    connection with ijson when it is installed and the Content-Length is at
+    least JSON_STREAM_THRESHOLD_MB, so the raw body is never buffered in full
+    next to the parsed result. Other bodies are decoded with orjson when
+    available.
+    """
+    if stream and ijson is not None and _is_large_body(response):
+        response.raw.decode_content = True
+        result = next(ijson.items(response.raw, "", use_float=True))
+        # The body was read through `raw`, so hand the connection back here
+        response.raw.release_conn()
+        return result
+
+    content = getattr(response, "content", None)
+    if not isinstance(content, (bytes, bytearray)):
+        # Not a requests response body (e.g. a test double)
+        return response.json()
+    return loads(content)
@@ -0,0 +1,240 @@
+import sqlite3
+from typing import Callable
+
+
+def _create_base_tables(cursor: sqlite3.Cursor) -> None:
+    # Create documents table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS documents (
+            document_id TEXT PRIMARY KEY,
+            filename TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            digitization_operation_id TEXT,
+            classification_operation_id TEXT,
+            classification_validation_operation_id TEXT,
+            extraction_operation_id TEXT,
+            extraction_validation_operation_id TEXT,
+            digitization_duration REAL,
+            classification_duration REAL,
+            classification_validation_duration REAL,
+            extraction_duration REAL,
+            extraction_validation_duration REAL,
+            project_id TEXT,
+            classifier_id TEXT,
+            extractor_id TEXT,
+            error_code TEXT,
+            error_message TEXT,
+            timestamp REAL NOT NULL
+        )
+    """)
+
+    # Create classification table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS classification (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            document_id TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            document_type_id TEXT NOT NULL,
+            classification_confidence REAL NOT NULL,
+            start_page INTEGER NOT NULL,
+            page_count INTEGER NOT NULL,
+            classifier_name TEXT NOT NULL,
+            operation_id TEXT NOT NULL
+        )
+    """)
+
+    # Create extraction table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS extraction (
+            filename TEXT NOT NULL,
+            document_id TEXT NOT NULL,
+            document_type_id TEXT NOT NULL,
+            field_id TEXT,
+            field TEXT,
+            is_missing BOOLEAN,
+            field_value TEXT,
+            field_unformatted_value TEXT,
+            validated_field_value TEXT,
+            is_correct BOOLEAN,
+            confidence REAL,
+            ocr_confidence REAL,
+            operator_confirmed BOOLEAN,
+            row_index INTEGER DEFAULT -1,
+            column_index INTEGER DEFAULT -1,
+            page_range TEXT,
+            timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (filename, field_id, field, row_index, column_index)
+        )
+    """)
+
+
+def _add_content_hash(cursor: sqlite3.Cursor) -> None:
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(documents)")]
+    if "content_hash" not in columns:
+        cursor.execute("ALTER TABLE documents ADD COLUMN content_hash TEXT")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_documents_content_hash
+        ON documents (content_hash, project_id)
+    """)
+
+
+def _create_circuit_breakers(cursor: sqlite3.Cursor) -> None:
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS circuit_breakers (
+            key TEXT PRIMARY KEY,
+            state TEXT NOT NULL,
+            failure_count INTEGER NOT NULL DEFAULT 0,
+            opened_at REAL,
+            updated_at REAL NOT NULL
+        )
+    """)
+
+
+def _create_result_cache(cursor: sqlite3.Cursor) -> None:
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS result_cache (
+            document_id TEXT NOT NULL,
+            module_id TEXT NOT NULL,
+            page_range TEXT NOT NULL,
+            prompts_hash TEXT NOT NULL,
+            result TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            last_accessed REAL NOT NULL,
+            PRIMARY KEY (document_id, module_id, page_range, prompts_hash)
+        )
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_result_cache_last_accessed
+        ON result_cache (last_accessed)
+    """)
+
+
+def _add_lookup_indexes(cursor: sqlite3.Cursor) -> None:
+    # Filename cache lookups
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_documents_filename
+        ON documents (filename)
+    """)
+    # Deferred-validation and resume scans filter on stage (and project)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_documents_stage
+        ON documents (stage, project_id)
+    """)
+    # Merging validated results by document, field and cell. Lookups by
+    # extraction.filename use the primary key.
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_extraction_document_field
+        ON extraction (document_id, field_id, field, row_index, column_index)
+    """)
+
+
+def _add_export_index(cursor: sqlite3.Cursor) -> None:
+    # Columnar exports stream extraction rows by document type and time
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_extraction_type_timestamp
+        ON extraction (document_type_id, timestamp)
+    """)
+
+
+def _create_response_archive(cursor: sqlite3.Cursor) -> None:
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS response_archive (
+            document_id TEXT NOT NULL,
+            action TEXT NOT NULL,
+            module_id TEXT NOT NULL,
+            operation_id TEXT NOT NULL,
+            project_id TEXT,
+            filename TEXT,
+            content_hash TEXT NOT NULL,
+            codec TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            stored_bytes INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (document_id, action, module_id, operation_id)
+        )
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_response_archive_action
+        ON response_archive (action, created_at)
+    """)
+
+
+def _create_pending_extractions(cursor: sqlite3.Cursor) -> None:
+    # One row per extraction in flight; a classified document can have several
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS pending_extractions (
+            document_id TEXT NOT NULL,
+            extractor_id TEXT NOT NULL,
+            page_range TEXT NOT NULL,
+            operation_id TEXT NOT NULL,
+            started_at REAL NOT NULL,
+            PRIMARY KEY (document_id, extractor_id, page_range)
+        )
+    """)
+
+
+def _add_result_cache_operation_id(cursor: sqlite3.Cursor) -> None:
+    # Cache hits record the operation that produced the cached result
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(result_cache)")]
+    if "operation_id" not in columns:
+        cursor.execute("ALTER TABLE result_cache ADD COLUMN operation_id TEXT")
+
+
+# Ordered (version, description, migration). Append new migrations with the
+# next version number; never edit one that has been released.
+MIGRATIONS: list[tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, "create documents, classification and extraction tables", _create_base_tables),
+    (2, "key documents by content hash", _add_content_hash),
+    (3, "create circuit_breakers table", _create_circuit_breakers),
+    (4, "create result_cache table", _create_result_cache),
+    (5, "add lookup indexes for documents and extraction", _add_lookup_indexes),
+    (6, "index extraction by document type and timestamp", _add_export_index),
+    (7, "create response_archive table", _create_response_archive),
+    (8, "create pending_extractions table", _create_pending_extractions),
+    (9, "store operation ID with cached results", _add_result_cache_operation_id),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(conn: sqlite3.Connection) -> int:
+    """
+    Upgrade the database in place to SCHEMA_VERSION.
+
+    The applied version is tracked in `PRAGMA user_version`; each pending
+    migration runs in its own transaction together with the version bump.
+    Databases created before versioning report version 0, and the early
+    migrations tolerate tables and columns that already exist.
+
+    Returns:
+        int: The number of migrations applied.
+    """
+    version = get_schema_version(conn)
+    if version > SCHEMA_VERSION:
+        print(
+            f"Database schema version {version} is newer than this code "
+            f"({SCHEMA_VERSION}); skipping migrations."
+        )
+        return 0
+
+    applied = 0
+    for migration_version, description, migrate in MIGRATIONS:
+        if migration_version <= version:
+            continue
+        print(f"Migrating database to version {migration_version}: {description}")
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN")
+            migrate(cursor)
+            cursor.execute(f"PRAGMA user_version = {migration_version}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        applied += 1
+    return applied
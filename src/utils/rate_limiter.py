@@ -0,0 +1,141 @@
+import time
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import requests
+from project_config import (
+    RATE_LIMIT_DISCOVERY,
+    RATE_LIMIT_POLL,
+    RATE_LIMIT_START,
+)
+
+# HTTP status codes returned when the tenant quota is exceeded
+THROTTLE_STATUS_CODES = {429, 503}
+
+
+class ThrottledError(requests.exceptions.HTTPError):
+    """Raised when a request is still throttled after honouring Retry-After."""
+
+    def __init__(self, message: str, retry_after: float, response=None):
+        super().__init__(message, response=response)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at `rate` tokens per second.
+
+    Attributes:
+        rate (float): Tokens added per second. 0 disables the limit.
+        capacity (float): Maximum burst size.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill_locked(self, now: float) -> None:
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Block until a token is available and return the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait_time = self._paused_until - now
+                elif self.rate <= 0:
+                    return waited
+                else:
+                    self._refill_locked(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+            waited += wait_time
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller of this bucket for `seconds`."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+
+
+class RateLimiter:
+    """
+    Per-endpoint request budgets shared by every API client.
+
+    Requests are grouped into `start` calls, status `poll` calls and
+    `discovery` calls, each with its own token bucket. A throttled response
+    pauses the whole group for the Retry-After period.
+    """
+
+    def __init__(
+        self,
+        start_rate: float = RATE_LIMIT_START,
+        poll_rate: float = RATE_LIMIT_POLL,
+        discovery_rate: float = RATE_LIMIT_DISCOVERY,
+    ):
+        self.buckets = {
+            "start": TokenBucket(start_rate),
+            "poll": TokenBucket(poll_rate),
+            "discovery": TokenBucket(discovery_rate),
+        }
+
+    def acquire(self, endpoint: str) -> float:
+        return self.buckets[endpoint].acquire()
+
+    def pause(self, endpoint: str, seconds: float) -> None:
+        self.buckets[endpoint].pause(seconds)
+
+
+def endpoint_for(method: str, url: str) -> str:
+    """Return the rate limit group a request belongs to."""
+    path = urlparse(url).path
+    if "/result/" in path:
+        return "poll"
+    if method.upper() == "POST" or path.endswith("/start"):
+        return "start"
+    return "discovery"
+
+
+def parse_retry_after(
+    value: str | None, attempt: int, max_delay: float = 60.0
+) -> float:
+    """Parse a Retry-After header (seconds or HTTP date), with backoff as fallback."""
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+    return min(max_delay, 2.0**attempt)
+
+
+_shared_limiter: RateLimiter | None = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter, creating it on first use."""
+    global _shared_limiter
+    if _shared_limiter is None:
+        with _shared_limiter_lock:
+            if _shared_limiter is None:
+                _shared_limiter = RateLimiter()
+    return _shared_limiter
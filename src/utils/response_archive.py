@@ -0,0 +1,268 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Optional
+from project_config import (
+    RESPONSE_ARCHIVE,
+    RESPONSE_ARCHIVE_CODEC,
+    RESPONSE_ARCHIVE_DIR,
+)
+from utils.db_utils import execute_query, submit_write
+from utils.json_codec import canonical_dumps, loads
+
+# zstandard is optional; archives fall back to gzip without it
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CODECS = ("zstd", "gzip")
+_EXTENSIONS = {"zstd": ".json.zst", "gzip": ".json.gz"}
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    # mtime=0 keeps the output identical for identical payloads
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError(
+                "zstandard is required to read zstd archives: pip install zstandard"
+            )
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class ResponseArchive:
+    """
+    Content-addressed archive of the raw results returned by the API.
+
+    Each result is serialized to canonical JSON, compressed with zstd (or
+    gzip when zstandard is not installed) and stored once under
+    `<root>/<hash[:2]>/<hash[2:4]>/<hash>.json.zst`, so identical results
+    share a blob. The `response_archive` table maps (document_id, action,
+    module_id, operation_id) to the blob, which lets results be re-parsed or
+    re-exported without another cloud call.
+
+    Attributes:
+        root (str): Folder holding the sharded blobs.
+        codec (str): "zstd" or "gzip" for new blobs.
+        enabled (bool): Whether `store` archives anything.
+    """
+
+    def __init__(
+        self,
+        root: str = RESPONSE_ARCHIVE_DIR,
+        codec: str = RESPONSE_ARCHIVE_CODEC,
+        enabled: bool = RESPONSE_ARCHIVE,
+    ):
+        if codec == "auto":
+            codec = default_codec()
+        if codec not in CODECS:
+            raise ValueError(f"Unsupported archive codec '{codec}'")
+        if codec == "zstd" and zstandard is None:
+            print("zstandard is not installed; archiving responses with gzip.")
+            codec = "gzip"
+        self.root = root
+        self.codec = codec
+        self.enabled = enabled
+        # Whether the database has the response_archive table, checked on
+        # the first store
+        self._indexed: Optional[bool] = None
+
+    def blob_path(self, content_hash: str, codec: str) -> str:
+        return os.path.join(
+            self.root,
+            content_hash[:2],
+            content_hash[2:4],
+            content_hash + _EXTENSIONS[codec],
+        )
+
+    def put_blob(self, content_hash: str, data: bytes) -> int:
+        """
+        Compress and store serialized JSON unless an identical blob exists.
+
+        Returns:
+            int: Size of the stored blob in bytes.
+        """
+        path = self.blob_path(content_hash, self.codec)
+        if os.path.exists(path):
+            return os.path.getsize(path)
+
+        compressed = compress(data, self.codec)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as blob:
+                blob.write(compressed)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        return len(compressed)
+
+    def load_blob(self, content_hash: str, codec: str) -> Any:
+        with open(self.blob_path(content_hash, codec), "rb") as blob:
+            return loads(decompress(blob.read(), codec))
+
+    def store(
+        self,
+        document_id: str,
+        action: str,
+        module_id: str,
+        operation_id: str,
+        payload: Any,
+        project_id: Optional[str] = None,
+    ) -> Optional[Future]:
+        """
+        Queue a raw result for archiving.
+
+        The result is serialized on the calling thread, so later changes to it
+        are not archived. Compressing, writing the blob and indexing it run on
+        the database writer, keeping large results off the poller's threads.
+        Errors are printed rather than raised so archiving never fails the
+        operation whose result is being stored. Nothing is archived while the
+        database has no `response_archive` table (migrations not run); that is
+        checked once per archive.
+
+        Returns:
+            Future: The queued archive write, or None if nothing was archived.
+        """
+        if not self.enabled or payload is None or not document_id:
+            return None
+        if self._indexed is None:
+            self._indexed = self._has_index()
+        if not self._indexed:
+            return None
+        try:
+            data = canonical_dumps(payload)
+        except (TypeError, ValueError) as e:
+            print(f"Unable to archive {action} result of document {document_id}: {e}")
+            return None
+
+        return submit_write(
+            self._archive,
+            (document_id, action, module_id or "", operation_id or "", project_id),
+            data,
+        )
+
+    def _has_index(self) -> bool:
+        try:
+            return bool(
+                execute_query(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                    ("response_archive",),
+                )
+            )
+        except sqlite3.Error:
+            return False
+
+    def _archive(self, cursor: sqlite3.Cursor, key: tuple, data: bytes) -> None:
+        content_hash = hashlib.sha256(data).hexdigest()
+        try:
+            stored_bytes = self.put_blob(content_hash, data)
+        except OSError as e:
+            print(f"Unable to archive {key[1]} result of document {key[0]}: {e}")
+            return
+        self._index(
+            cursor,
+            key,
+            (content_hash, self.codec, len(data), stored_bytes, time.time()),
+        )
+
+    def _index(self, cursor: sqlite3.Cursor, key: tuple, blob: tuple) -> None:
+        # The filename is copied from the document's cache entry, which is
+        # written before any of its operations complete
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO response_archive (document_id, action, module_id,
+                operation_id, project_id, filename, content_hash, codec, size_bytes,
+                stored_bytes, created_at)
+            VALUES (?, ?, ?, ?, ?,
+                (SELECT filename FROM documents WHERE document_id = ?),
+                ?, ?, ?, ?, ?)
+            """,
+            (*key, key[0], *blob),
+        )
+
+    def get(
+        self,
+        document_id: str,
+        action: str,
+        module_id: Optional[str] = None,
+        operation_id: Optional[str] = None,
+    ) -> Optional[Any]:
+        """Return the most recently archived result matching the key, or None."""
+        query = "SELECT content_hash, codec FROM response_archive WHERE document_id = ? AND action = ?"
+        params = [document_id, action]
+        if module_id is not None:
+            query += " AND module_id = ?"
+            params.append(module_id)
+        if operation_id is not None:
+            query += " AND operation_id = ?"
+            params.append(operation_id)
+        query += " ORDER BY created_at DESC LIMIT 1"
+
+        rows = execute_query(query, tuple(params))
+        if not rows:
+            return None
+        return self.load_blob(*rows[0])
+
+    def entries(
+        self,
+        actions: Optional[tuple[str, ...]] = None,
+        project_id: Optional[str] = None,
+    ) -> list[tuple]:
+        """
+        Return (document_id, action, module_id, operation_id, project_id,
+        filename, content_hash, codec) for archived results, oldest first.
+
+        The project and filename fall back to the document's cache entry for
+        results archived before it was written.
+        """
+        query = """
+            SELECT a.document_id, a.action, a.module_id, a.operation_id,
+                COALESCE(a.project_id, d.project_id), COALESCE(a.filename, d.filename),
+                a.content_hash, a.codec
+            FROM response_archive a
+            LEFT JOIN documents d ON d.document_id = a.document_id
+        """
+        conditions, params = [], []
+        if actions:
+            conditions.append(f"a.action IN ({', '.join('?' * len(actions))})")
+            params.extend(actions)
+        if project_id:
+            conditions.append("COALESCE(a.project_id, d.project_id) = ?")
+            params.append(project_id)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY a.created_at, a.rowid"
+        return execute_query(query, tuple(params))
+
+
+_shared_archive: ResponseArchive | None = None
+_shared_archive_lock = threading.Lock()
+
+
+def get_response_archive() -> ResponseArchive:
+    """Return the process-wide response archive, creating it on first use."""
+    global _shared_archive
+    if _shared_archive is None:
+        with _shared_archive_lock:
+            if _shared_archive is None:
+                _shared_archive = ResponseArchive()
+    return _shared_archive
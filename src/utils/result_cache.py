@@ -0,0 +1,226 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+from project_config import RESULT_CACHE_MAX_MB, RESULT_CACHE_TTL_DAYS
+from utils.db_utils import execute_query, submit_write
+from utils.json_codec import dumps, loads
+
+# Seconds between sweeps that drop expired entries and recount the cache size
+SWEEP_INTERVAL = 3600
+# Fraction of the size limit the cache is trimmed to once it is exceeded
+EVICT_TO_FRACTION = 0.9
+
+
+def prompts_hash(prompts: Optional[dict]) -> str:
+    """Return a stable hash of the generative prompts sent with a request."""
+    if not prompts:
+        return ""
+    # Kept on the standard library so cache keys do not depend on the JSON backend
+    encoded = json.dumps(prompts, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent cache of classification and extraction results.
+
+    Results are stored in the `result_cache` table keyed by document ID,
+    classifier/extractor ID, page range and the hash of the prompts, so a
+    rerun on the same documents returns the stored payload instead of
+    starting a new cloud operation. Entries older than `ttl_days` are ignored
+    and removed; when the cache grows beyond `max_mb` the least recently used
+    entries are evicted. The total size is tracked in memory between sweeps,
+    so a put does not scan the table unless the limit is exceeded.
+
+    Attributes:
+        ttl_days (float): Age after which an entry expires. 0 disables the cache.
+        max_mb (float): Maximum total size of the stored payloads.
+    """
+
+    def __init__(
+        self,
+        ttl_days: float = RESULT_CACHE_TTL_DAYS,
+        max_mb: float = RESULT_CACHE_MAX_MB,
+    ):
+        self.ttl_days = ttl_days
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        # Both are only touched from the database writer thread
+        self._total_bytes: Optional[int] = None
+        self._next_sweep = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_days > 0
+
+    def _key(
+        self,
+        document_id: str,
+        module_id: str,
+        page_range: Optional[str],
+        prompts: Optional[dict],
+    ) -> tuple:
+        # NULL never matches in a primary key, so a missing page range is stored as ""
+        return (document_id, module_id, page_range or "", prompts_hash(prompts))
+
+    def get(
+        self,
+        document_id: str,
+        module_id: str,
+        page_range: Optional[str] = None,
+        prompts: Optional[dict] = None,
+    ) -> Optional[Any]:
+        """Return the cached result payload, or None on a miss."""
+        entry = self.get_entry(document_id, module_id, page_range, prompts)
+        return entry[0] if entry is not None else None
+
+    def get_entry(
+        self,
+        document_id: str,
+        module_id: str,
+        page_range: Optional[str] = None,
+        prompts: Optional[dict] = None,
+    ) -> Optional[tuple[Any, Optional[str]]]:
+        """Return the cached payload and the operation ID that produced it."""
+        if not self.enabled or not document_id:
+            return None
+
+        key = self._key(document_id, module_id, page_range, prompts)
+        min_created_at = time.time() - self.ttl_days * 86400
+        try:
+            rows = execute_query(
+                """
+                SELECT result, operation_id FROM result_cache
+                WHERE document_id = ? AND module_id = ? AND page_range = ?
+                    AND prompts_hash = ? AND created_at >= ?
+                """,
+                (*key, min_created_at),
+            )
+        except sqlite3.Error as e:
+            print(f"Unable to read result cache: {e}")
+            return None
+        if not rows:
+            return None
+
+        submit_write(self._touch, key, time.time())
+        result, operation_id = rows[0]
+        return loads(result), operation_id
+
+    def _touch(self, cursor: sqlite3.Cursor, key: tuple, accessed_at: float) -> None:
+        cursor.execute(
+            """
+            UPDATE result_cache SET last_accessed = ?
+            WHERE document_id = ? AND module_id = ? AND page_range = ?
+                AND prompts_hash = ?
+            """,
+            (accessed_at, *key),
+        )
+
+    def put(
+        self,
+        document_id: str,
+        module_id: str,
+        page_range: Optional[str],
+        prompts: Optional[dict],
+        result: Any,
+        operation_id: Optional[str] = None,
+    ) -> None:
+        """Store a result payload and evict expired or least recently used entries."""
+        if not self.enabled or not document_id or result is None:
+            return
+
+        payload = dumps(result).decode("utf-8")
+        submit_write(
+            self._put,
+            self._key(document_id, module_id, page_range, prompts),
+            payload,
+            operation_id,
+            time.time(),
+        )
+
+    def _put(
+        self,
+        cursor: sqlite3.Cursor,
+        key: tuple,
+        payload: str,
+        operation_id: Optional[str],
+        now: float,
+    ) -> None:
+        replaced = cursor.execute(
+            """
+            SELECT size_bytes FROM result_cache
+            WHERE document_id = ? AND module_id = ? AND page_range = ?
+                AND prompts_hash = ?
+            """,
+            key,
+        ).fetchone()
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO result_cache (document_id, module_id, page_range,
+                prompts_hash, result, size_bytes, created_at, last_accessed,
+                operation_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (*key, payload, len(payload), now, now, operation_id),
+        )
+
+        if self._total_bytes is None or now >= self._next_sweep:
+            self.evict(cursor, now)
+            return
+
+        self._total_bytes += len(payload) - (replaced[0] if replaced else 0)
+        if self._total_bytes > self.max_bytes:
+            self._evict_lru(cursor)
+
+    def evict(self, cursor: sqlite3.Cursor, now: Optional[float] = None) -> None:
+        """Remove expired entries, then LRU entries until the size limit is met."""
+        now = time.time() if now is None else now
+        cursor.execute(
+            "DELETE FROM result_cache WHERE created_at < ?",
+            (now - self.ttl_days * 86400,),
+        )
+        # Resynchronise the running total with the table on every sweep
+        self._total_bytes = cursor.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM result_cache"
+        ).fetchone()[0]
+        self._next_sweep = now + SWEEP_INTERVAL
+        if self._total_bytes > self.max_bytes:
+            self._evict_lru(cursor)
+
+    def _evict_lru(self, cursor: sqlite3.Cursor) -> None:
+        # Trim below the limit so a full cache is not scanned again on the next put
+        excess = self._total_bytes - int(self.max_bytes * EVICT_TO_FRACTION)
+
+        # Delete the least recently used entries whose sizes cover the excess
+        rows = cursor.execute(
+            """
+            SELECT rowid, size_bytes FROM (
+                SELECT rowid, size_bytes, SUM(size_bytes) OVER (
+                    ORDER BY last_accessed, rowid
+                ) AS running_total
+                FROM result_cache
+            )
+            WHERE running_total - size_bytes < ?
+            """,
+            (excess,),
+        ).fetchall()
+        cursor.executemany(
+            "DELETE FROM result_cache WHERE rowid = ?", [(row[0],) for row in rows]
+        )
+        self._total_bytes -= sum(row[1] for row in rows)
+
+
+_shared_cache: ResultCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide result cache, creating it on first use."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = ResultCache()
+    return _shared_cache
@@ -0,0 +1,267 @@
+from typing import Iterator, Optional
+
+# Data sources marking a value that a reviewer entered or corrected
+_MANUAL_SOURCES = {"ManuallyChanged", "Manual"}
+
+
+class ClassificationResult:
+    """One classified document type and the pages it covers."""
+
+    __slots__ = (
+        "document_id",
+        "document_type_id",
+        "confidence",
+        "start_page",
+        "page_count",
+        "page_range",
+        "classifier_name",
+    )
+
+    def __init__(self, result: dict):
+        bounds = result["DocumentBounds"]
+        self.document_id = result["DocumentId"]
+        self.document_type_id = result["DocumentTypeId"]
+        self.confidence = result["Confidence"]
+        self.start_page = bounds["StartPage"]
+        self.page_count = bounds["PageCount"]
+        self.page_range = bounds.get("PageRange")
+        self.classifier_name = result["ClassifierName"]
+
+    def row(self, filename: str, operation_id: str) -> tuple:
+        """Row of the classification table."""
+        return (
+            self.document_id,
+            filename,
+            self.document_type_id,
+            self.confidence,
+            self.start_page,
+            self.page_count,
+            self.classifier_name,
+            operation_id,
+        )
+
+
+def parse_classifications(classification_results: dict) -> list[ClassificationResult]:
+    """Parse the `classificationResults` of a classification response."""
+    return [
+        ClassificationResult(result)
+        for result in classification_results.get("classificationResults") or []
+    ]
+
+
+# Attributes taken from the first value of a field or table cell
+_VALUE_SLOTS = (
+    "value",
+    "unformatted_value",
+    "confidence",
+    "ocr_confidence",
+    "value_confirmed",
+    "value_source",
+)
+
+
+def _set_first_value(target, values: Optional[list]) -> None:
+    first = values[0] if values else {}
+    target.value = first.get("Value")
+    target.unformatted_value = first.get("UnformattedValue")
+    target.confidence = first.get("Confidence")
+    target.ocr_confidence = first.get("OcrConfidence")
+    target.value_confirmed = first.get("OperatorConfirmed")
+    target.value_source = first.get("DataSource")
+
+
+class ExtractedField:
+    """An extracted or validated field with its first value."""
+
+    __slots__ = (
+        "field_id",
+        "name",
+        "is_missing",
+        "operator_confirmed",
+        "data_source",
+    ) + _VALUE_SLOTS
+
+    def __init__(self, field: dict):
+        self.field_id = field.get("FieldId")
+        self.name = field.get("FieldName")
+        self.is_missing = field.get("IsMissing")
+        self.operator_confirmed = field.get("OperatorConfirmed")
+        self.data_source = field.get("DataSource")
+        _set_first_value(self, field.get("Values"))
+
+
+class TableCell:
+    """A non-header table cell with its first value."""
+
+    __slots__ = (
+        "row_index",
+        "column_index",
+        "is_missing",
+        "operator_confirmed",
+        "data_source",
+    ) + _VALUE_SLOTS
+
+    def __init__(self, cell: dict):
+        self.row_index = cell["RowIndex"]
+        self.column_index = cell["ColumnIndex"]
+        self.is_missing = cell.get("IsMissing", False)
+        self.operator_confirmed = cell.get("OperatorConfirmed")
+        self.data_source = cell.get("DataSource")
+        # Inlined rather than calling _set_first_value: tables hold most values
+        values = cell.get("Values", [{}])
+        first = values[0] if values else {}
+        self.value = first.get("Value")
+        self.unformatted_value = first.get("UnformattedValue")
+        self.confidence = first.get("Confidence")
+        self.ocr_confidence = first.get("OcrConfidence")
+        self.value_confirmed = first.get("OperatorConfirmed")
+        self.value_source = first.get("DataSource")
+
+
+class ExtractedTable:
+    __slots__ = ("field_id", "headers", "cells")
+
+    def __init__(self, table: dict):
+        self.field_id = table["FieldId"]
+        # Column headers come from the header cells of row 0
+        self.headers = headers = {}
+        self.cells = cells = []
+        for value in table["Values"]:
+            for cell in value["Cells"]:
+                if cell["RowIndex"] == 0 and cell["IsHeader"]:
+                    headers[cell["ColumnIndex"]] = cell["Values"][0]["Value"]
+                elif cell["RowIndex"] != 0 and not cell["IsHeader"]:
+                    cells.append(TableCell(cell))
+
+    def header(self, cell: TableCell) -> Optional[str]:
+        """Header of the column of a cell, or None without a header cell."""
+        return self.headers.get(cell.column_index)
+
+
+class ResultsDocument:
+    """
+    Fields and tables of one extracted or validated document split.
+
+    Built once from the `ResultsDocument` of a response; the raw dict is not
+    kept, so every consumer flattens the same parsed objects.
+    """
+
+    __slots__ = ("document_id", "document_type_id", "page_range", "fields", "tables")
+
+    def __init__(self, document_id: str, results_document: dict):
+        self.document_id = document_id
+        self.document_type_id = results_document.get("DocumentTypeId")
+        self.page_range = (results_document.get("Bounds") or {}).get("PageRange")
+        self.fields = [
+            ExtractedField(field) for field in results_document.get("Fields") or []
+        ]
+        self.tables = [
+            ExtractedTable(table) for table in results_document.get("Tables") or []
+        ]
+
+    @classmethod
+    def from_extraction(cls, extraction_results: dict) -> "ResultsDocument":
+        """Parse the `extractionResult` of an extraction response."""
+        extraction_result = extraction_results["extractionResult"]
+        return cls(
+            extraction_result["DocumentId"], extraction_result["ResultsDocument"]
+        )
+
+    @classmethod
+    def from_validation(cls, validation_results: dict) -> "ResultsDocument":
+        """Parse the `validatedExtractionResults` of an extraction validation response."""
+        validated = validation_results["result"]["validatedExtractionResults"]
+        return cls(validated["DocumentId"], validated.get("ResultsDocument", {}))
+
+    def field_rows(self, filename: str) -> Iterator[tuple]:
+        """Yield the fields as extraction rows ordered like EXTRACTION_COLUMNS."""
+        for field in self.fields:
+            yield (
+                filename,
+                self.document_id,
+                self.document_type_id,
+                field.field_id,
+                field.name,
+                field.is_missing,
+                field.value,
+                field.unformatted_value,
+                field.confidence,
+                field.ocr_confidence,
+                field.value_confirmed,
+                True,
+                self.page_range,
+                -1,
+                -1,
+            )
+
+    def cell_rows(self, filename: str) -> Iterator[tuple]:
+        """Yield the table cells as extraction rows ordered like EXTRACTION_COLUMNS."""
+        for table in self.tables:
+            headers = table.headers
+            for cell in table.cells:
+                yield (
+                    filename,
+                    self.document_id,
+                    self.document_type_id,
+                    table.field_id,
+                    headers.get(cell.column_index),
+                    cell.is_missing,
+                    cell.value,
+                    cell.unformatted_value,
+                    cell.confidence,
+                    cell.ocr_confidence,
+                    cell.value_confirmed,
+                    cell.value_source != "ManuallyChanged",
+                    self.page_range,
+                    cell.row_index,
+                    cell.column_index,
+                )
+
+    def rows(self, filename: str) -> Iterator[tuple]:
+        """Yield every field and table cell as an extraction row."""
+        yield from self.field_rows(filename)
+        yield from self.cell_rows(filename)
+
+    def validated_field_rows(self) -> Iterator[tuple]:
+        """Yield (document_id, field_id, value, confirmed, is_correct) per field."""
+        for field in self.fields:
+            yield (
+                self.document_id,
+                field.field_id,
+                field.value,
+                field.operator_confirmed,
+                field.data_source not in _MANUAL_SOURCES,
+            )
+
+    def validated_cell_rows(self) -> Iterator[tuple]:
+        """
+        Yield (document_id, field_id, field, row_index, column_index, value,
+        confirmed, is_correct) per table cell with a known column header.
+        """
+        for table in self.tables:
+            for cell in table.cells:
+                header = table.header(cell)
+                if header is None:
+                    print(
+                        f"Warning: Column index {cell.column_index} not found in headers."
+                    )
+                    continue
+                yield (
+                    self.document_id,
+                    table.field_id,
+                    header,
+                    cell.row_index,
+                    cell.column_index,
+                    cell.value,
+                    cell.operator_confirmed,
+                    cell.data_source not in _MANUAL_SOURCES,
+                )
+
+
+def validation_status(validation_results: Optional[dict]) -> Optional[str]:
+    """Return the action status (e.g. "Completed") of a validation response."""
+    if not isinstance(validation_results, dict):
+        return None
+    return ((validation_results.get("result") or {}).get("actionData") or {}).get(
+        "status"
+    )
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Optional
+
+# Tokens are not reused once they expire within this many seconds
+MIN_REMAINING_SECONDS = 120
+
+
+class TokenCache:
+    """
+    Bearer tokens kept on disk between runs, keyed by app ID and scope.
+
+    The file is created readable and writable by its owner only (mode 0600)
+    and never holds the app secret. Short runs reuse a token fetched by an
+    earlier run instead of starting with a round trip to the identity server.
+
+    Attributes:
+        path (str): JSON file holding the cached tokens.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(app_id: str, scope: str) -> str:
+        return hashlib.sha256(f"{app_id}\n{scope}".encode("utf-8")).hexdigest()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, app_id: str, scope: str) -> Optional[tuple[str, float]]:
+        """Return (access_token, expires_at) if a token is cached and still valid."""
+        entry = self._read().get(self.key(app_id, scope))
+        if not isinstance(entry, dict):
+            return None
+        token, expires_at = entry.get("access_token"), entry.get("expires_at")
+        if not token or not isinstance(expires_at, (int, float)):
+            return None
+        if expires_at - time.time() < MIN_REMAINING_SECONDS:
+            return None
+        return token, expires_at
+
+    def put(self, app_id: str, scope: str, token: str, expires_at: float) -> None:
+        """
+        Store a token, dropping expired entries.
+
+        Errors are printed rather than raised; the token is still used for
+        this run.
+        """
+        with self._lock:
+            now = time.time()
+            entries = {
+                key: entry
+                for key, entry in self._read().items()
+                if isinstance(entry, dict) and entry.get("expires_at", 0) > now
+            }
+            entries[self.key(app_id, scope)] = {
+                "access_token": token,
+                "expires_at": expires_at,
+            }
+            try:
+                directory = os.path.dirname(self.path) or "."
+                os.makedirs(directory, exist_ok=True)
+                # mkstemp creates the file with mode 0600
+                fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as file:
+                        json.dump(entries, file)
+                    os.chmod(temp_path, 0o600)
+                    os.replace(temp_path, self.path)
+                except BaseException:
+                    os.remove(temp_path)
+                    raise
+            except OSError as e:
+                print(f"Unable to cache bearer token: {e}")
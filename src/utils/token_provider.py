@@ -0,0 +1,36 @@
+class TokenProvider:
+    """
+    Hands out the current bearer token to the API clients.
+
+    Wraps either an `Authentication` instance, whose refreshed tokens are
+    picked up by the next request, or a fixed token string. Clients read the
+    token on every request instead of keeping the string they were created
+    with, so long runs keep working after the first token expires.
+    """
+
+    def __init__(self, source):
+        self._source = source
+
+    def token(self) -> str:
+        """Return a valid bearer token."""
+        if isinstance(self._source, str):
+            return self._source
+        return self._source.get_bearer_token()
+
+    def refresh(self, rejected_token: str | None = None) -> str:
+        """
+        Return a new token after the API rejected `rejected_token` with HTTP 401.
+
+        Concurrent callers rejected with the same token share one refresh.
+        A fixed token cannot be refreshed and is returned unchanged.
+        """
+        if isinstance(self._source, str):
+            return self._source
+        return self._source.refresh_rejected_token(rejected_token)
+
+
+def as_token_provider(token) -> TokenProvider:
+    """Wrap a token string or `Authentication` instance in a `TokenProvider`."""
+    if isinstance(token, TokenProvider):
+        return token
+    return TokenProvider(token)
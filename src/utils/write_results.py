@@ -1,7 +1,208 @@
 import os
 import csv
 import sqlite3
-from project_config import SQLITE_DB_PATH
+from itertools import groupby
+from concurrent.futures import Future
+from typing import Iterable, Optional
+from utils.atomic_file import atomic_write
+from utils.db_utils import get_connection, submit_write
+from utils.result_model import ResultsDocument, parse_classifications
+
+# Folder receiving one "<document>-pages_<page range>.csv" file per split
+OUTPUT_DIR = "output_results"
+
+# Column order of the rows built by WriteResults.extraction_rows
+EXTRACTION_COLUMNS = (
+    "filename",
+    "document_id",
+    "document_type_id",
+    "field_id",
+    "field",
+    "is_missing",
+    "field_value",
+    "field_unformatted_value",
+    "confidence",
+    "ocr_confidence",
+    "operator_confirmed",
+    "is_correct",
+    "page_range",
+    "row_index",
+    "column_index",
+)
+
+# Columns written to the CSV exports
+CSV_COLUMNS = (
+    "filename",
+    "page_range",
+    "field_id",
+    "field",
+    "is_missing",
+    "field_value",
+    "field_unformatted_value",
+    "confidence",
+    "ocr_confidence",
+)
+_CSV_INDEXES = [EXTRACTION_COLUMNS.index(column) for column in CSV_COLUMNS]
+
+UPSERT_EXTRACTION_SQL = f"""
+    INSERT INTO extraction ({", ".join(EXTRACTION_COLUMNS)})
+    VALUES ({", ".join("?" * len(EXTRACTION_COLUMNS))})
+    ON CONFLICT(filename, field_id, field, row_index, column_index)
+    DO UPDATE SET {", ".join(f"{column} = excluded.{column}" for column in EXTRACTION_COLUMNS)}
+"""
+
+# Validated results are staged in per-connection temp tables and merged into
+# `extraction` with one UPDATE ... FROM join each
+CREATE_VALIDATED_FIELDS_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS validated_fields (
+        document_id TEXT,
+        field_id TEXT,
+        validated_field_value TEXT,
+        operator_confirmed BOOLEAN,
+        is_correct BOOLEAN
+    )
+"""
+
+MERGE_VALIDATED_FIELDS_SQL = """
+    UPDATE extraction
+    SET validated_field_value = v.validated_field_value,
+        operator_confirmed = v.operator_confirmed,
+        is_correct = v.is_correct
+    FROM temp.validated_fields AS v
+    WHERE extraction.document_id = v.document_id
+        AND extraction.field_id = v.field_id
+"""
+
+CREATE_VALIDATED_CELLS_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS validated_cells (
+        document_id TEXT,
+        field_id TEXT,
+        field TEXT,
+        row_index INTEGER,
+        column_index INTEGER,
+        validated_field_value TEXT,
+        operator_confirmed BOOLEAN,
+        is_correct BOOLEAN
+    )
+"""
+
+MERGE_VALIDATED_CELLS_SQL = """
+    UPDATE extraction
+    SET validated_field_value = v.validated_field_value,
+        operator_confirmed = v.operator_confirmed,
+        is_correct = v.is_correct
+    FROM temp.validated_cells AS v
+    WHERE extraction.document_id = v.document_id
+        AND extraction.field_id = v.field_id
+        AND extraction.field = v.field
+        AND extraction.row_index = v.row_index
+        AND extraction.column_index = v.column_index
+"""
+
+
+def csv_path(filename: str, page_range: str, output_dir: Optional[str] = None) -> str:
+    """Return the CSV path of one page range (split) of a document."""
+    base_filename = os.path.splitext(os.path.basename(filename))[0]
+    return os.path.join(
+        output_dir or OUTPUT_DIR, f"{base_filename}-pages_{page_range}.csv"
+    )
+
+
+def write_csv(
+    filename: str,
+    page_range: str,
+    rows: Iterable[tuple],
+    output_dir: Optional[str] = None,
+) -> str:
+    """
+    Write the CSV of one page range, atomically replacing an existing file.
+
+    Rows are ordered like CSV_COLUMNS. They are written to a temporary file
+    in the same folder that is then renamed over the target, so readers
+    never see a partially written CSV.
+
+    Returns:
+        str: The path of the written file.
+    """
+    csv_filepath = csv_path(filename, page_range, output_dir)
+    directory = os.path.dirname(csv_filepath)
+    os.makedirs(directory, exist_ok=True)
+
+    with atomic_write(
+        csv_filepath, ".csv.tmp", mode="w", newline="", encoding="utf-8"
+    ) as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(CSV_COLUMNS)
+        writer.writerows(rows)
+    return csv_filepath
+
+
+def group_csv_rows(rows: Iterable[tuple]) -> Iterable[tuple[str, str, list[tuple]]]:
+    """
+    Yield (filename, page_range, rows) for consecutive rows of the same split.
+
+    Rows are ordered like CSV_COLUMNS and sorted by filename and page range.
+    """
+    for (filename, page_range), group in groupby(rows, key=lambda row: row[:2]):
+        yield filename, page_range, list(group)
+
+
+# The flattening functions below are pure, so offline replay can run them
+# in worker processes. Each parses the response once into the slot-based
+# model of utils.result_model and flattens it in a single pass.
+
+
+def extraction_rows(filename: str, extraction_results: dict) -> list[tuple]:
+    """Flatten the extracted fields and table cells into rows ordered like EXTRACTION_COLUMNS."""
+    return list(ResultsDocument.from_extraction(extraction_results).rows(filename))
+
+
+def validated_field_rows(validation_results: dict) -> list[tuple]:
+    """Flatten validated fields into (document_id, field_id, value, confirmed, is_correct)."""
+    return list(
+        ResultsDocument.from_validation(validation_results).validated_field_rows()
+    )
+
+
+def validated_cell_rows(validation_results: dict) -> list[tuple]:
+    """
+    Flatten validated table cells into (document_id, field_id, field,
+    row_index, column_index, value, confirmed, is_correct).
+    """
+    return list(
+        ResultsDocument.from_validation(validation_results).validated_cell_rows()
+    )
+
+
+def classification_rows(
+    classification_results: dict, filename: str, operation_id: str
+) -> list[tuple]:
+    """
+    Flatten classification results into rows of the classification table:
+    (document_id, filename, document_type_id, confidence, start_page,
+    page_count, classifier_name, operation_id).
+    """
+    return [
+        result.row(filename, operation_id)
+        for result in parse_classifications(classification_results)
+    ]
+
+
+def merge_validated_fields(cursor: sqlite3.Cursor, rows: Iterable[tuple]) -> None:
+    # Load the validated values in bulk, then merge them with one join
+    cursor.execute(CREATE_VALIDATED_FIELDS_SQL)
+    cursor.execute("DELETE FROM temp.validated_fields")
+    cursor.executemany("INSERT INTO temp.validated_fields VALUES (?, ?, ?, ?, ?)", rows)
+    cursor.execute(MERGE_VALIDATED_FIELDS_SQL)
+
+
+def merge_validated_cells(cursor: sqlite3.Cursor, rows: Iterable[tuple]) -> None:
+    cursor.execute(CREATE_VALIDATED_CELLS_SQL)
+    cursor.execute("DELETE FROM temp.validated_cells")
+    cursor.executemany(
+        "INSERT INTO temp.validated_cells VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+    )
+    cursor.execute(MERGE_VALIDATED_CELLS_SQL)
 
 
 class WriteResults:
@@ -10,312 +211,102 @@ class WriteResults:
     ):
         self.extraction_results = extraction_results
         self.validation_results = validation_extraction_results
-        self.conn = sqlite3.connect(SQLITE_DB_PATH)
+        # Direct calls use the calling thread's pooled connection; write_results
+        # runs on the database writer's connection instead
+        self.conn = get_connection()
         self.cursor = self.conn.cursor()
         self.filename = os.path.basename(document_path)
-
-    def create_headers_lookup_dict(self, table_data):
-        header_dict = {}
-        for field in table_data:
-            field_id = field["FieldId"]
-            field_headers = {}
-            for value in field["Values"]:
-                for cell in value["Cells"]:
-                    if cell["RowIndex"] == 0 and cell["IsHeader"]:
-                        column_index = cell["ColumnIndex"]
-                        header_value = cell["Values"][0]["Value"]
-                        field_headers[column_index] = header_value
-            header_dict[field_id] = field_headers
-        return header_dict
-
-    def insert_field_data(self):
-        document_id = self.extraction_results["extractionResult"]["DocumentId"]
-        document_type_id = self.extraction_results["extractionResult"][
-            "ResultsDocument"
-        ]["DocumentTypeId"]
-        page_range = self.extraction_results["extractionResult"]["ResultsDocument"][
-            "Bounds"
-        ]["PageRange"]
-
-        for field in self.extraction_results["extractionResult"]["ResultsDocument"][
-            "Fields"
-        ]:
-            field_data = {
-                "filename": self.filename,
-                "document_id": document_id,
-                "document_type_id": document_type_id,
-                "field_id": field.get("FieldId"),
-                "field": field.get("FieldName"),
-                "is_missing": field.get("IsMissing"),
-                "field_value": None,
-                "field_unformatted_value": None,
-                "confidence": None,
-                "ocr_confidence": None,
-                "operator_confirmed": None,
-                "is_correct": True,
-                "page_range": page_range,
-            }
-            if "Values" in field and field["Values"]:
-                field_data.update(
-                    {
-                        "field_value": field["Values"][0].get("Value"),
-                        "field_unformatted_value": field["Values"][0].get(
-                            "UnformattedValue"
-                        ),
-                        "confidence": field["Values"][0].get("Confidence"),
-                        "ocr_confidence": field["Values"][0].get("OcrConfidence"),
-                        "operator_confirmed": field["Values"][0].get(
-                            "OperatorConfirmed"
-                        ),
-                    }
-                )
-            columns = ", ".join(field_data.keys())
-            placeholders = ", ".join(["?"] * len(field_data))
-            update_assignments = ", ".join(
-                f"{key} = excluded.{key}" for key in field_data.keys()
-            )
-
-            # Upsert SQL query
-            sql = f"""
-                INSERT INTO extraction ({columns})
-                VALUES ({placeholders})
-                ON CONFLICT(filename, field_id, field, row_index, column_index)
-                DO UPDATE SET {update_assignments}
-            """
-
-            self.cursor.execute(sql, list(field_data.values()))
-
-    def insert_table_data(self):
-        document_id = self.extraction_results["extractionResult"]["DocumentId"]
-        document_type_id = self.extraction_results["extractionResult"][
-            "ResultsDocument"
-        ]["DocumentTypeId"]
-
-        page_range = self.extraction_results["extractionResult"]["ResultsDocument"][
-            "Bounds"
-        ]["PageRange"]
-
-        tables = (
-            self.extraction_results.get("extractionResult", {})
-            .get("ResultsDocument", {})
-            .get("Tables", [])
-        )
-        if tables:
-            for table in tables:
-                headers_lookup = self.create_headers_lookup_dict([table])
-                field_id = table["FieldId"]
-                headers = headers_lookup.get(field_id, {})
-
-                for value in table["Values"]:
-                    for cell in value["Cells"]:
-                        # Skip header row
-                        if cell["RowIndex"] != 0 and not cell["IsHeader"]:
-                            cell_values = cell.get("Values", [{}])
-                            first_value = cell_values[0] if cell_values else {}
-
-                            row_data = {
-                                "filename": self.filename,
-                                "document_id": document_id,
-                                "document_type_id": document_type_id,
-                                "field_id": field_id,
-                                "field": headers.get(cell["ColumnIndex"]),
-                                "is_missing": cell.get("IsMissing", False),
-                                "field_value": first_value.get("Value"),
-                                "field_unformatted_value": first_value.get(
-                                    "UnformattedValue"
-                                ),
-                                "confidence": first_value.get("Confidence"),
-                                "ocr_confidence": first_value.get("OcrConfidence"),
-                                "operator_confirmed": first_value.get(
-                                    "OperatorConfirmed"
-                                ),
-                                "is_correct": (
-                                    first_value.get("DataSource") != "ManuallyChanged"
-                                ),
-                                "page_range": page_range,
-                                "row_index": cell["RowIndex"],
-                                "column_index": cell["ColumnIndex"],
-                            }
-
-                            # Dynamic upsert SQL query
-                            columns = ", ".join(row_data.keys())
-                            placeholders = ", ".join(["?"] * len(row_data))
-                            update_assignments = ", ".join(
-                                f"{key} = excluded.{key}" for key in row_data.keys()
-                            )
-
-                            sql = f"""
-                                INSERT INTO extraction ({columns})
-                                VALUES ({placeholders})
-                                ON CONFLICT(filename, field_id, field, row_index, column_index)
-                                DO UPDATE SET {update_assignments}
-                            """
-                            self.cursor.execute(sql, list(row_data.values()))
+        self._extraction: Optional[ResultsDocument] = None
+        self._validated: Optional[ResultsDocument] = None
+
+    @property
+    def extraction(self) -> ResultsDocument:
+        """The extraction results, parsed once."""
+        if self._extraction is None:
+            self._extraction = ResultsDocument.from_extraction(self.extraction_results)
+        return self._extraction
+
+    @property
+    def validated(self) -> ResultsDocument:
+        """The validated extraction results, parsed once."""
+        if self._validated is None:
+            self._validated = ResultsDocument.from_validation(self.validation_results)
+        return self._validated
 
     def update_validated_field_data(self):
-        document_id = self.validation_results["result"]["validatedExtractionResults"][
-            "DocumentId"
-        ]
-
-        # Iterate through each field in the validatedExtractionResults
-        for field in self.validation_results["result"]["validatedExtractionResults"][
-            "ResultsDocument"
-        ]["Fields"]:
-            field_id = field.get("FieldId")
-            operator_confirmed = field.get("OperatorConfirmed")
-            validated_value = (
-                field.get("Values", [{}])[0].get("Value", None)
-                if field.get("Values")
-                else None
-            )
-
-            # Determine is_correct based on the DataSource
-            if field.get("DataSource") in {"ManuallyChanged", "Manual"}:
-                is_correct = False
-            else:
-                is_correct = True
-
-            # Update the validated_field_value in the database for the corresponding DocumentId and FieldId
-            sql = """
-                UPDATE extraction
-                SET validated_field_value = ?, operator_confirmed = ?, is_correct = ?
-                WHERE document_id = ? AND field_id = ?
-            """
-            self.cursor.execute(
-                sql,
-                (
-                    validated_value,
-                    operator_confirmed,
-                    is_correct,
-                    document_id,
-                    field_id,
-                ),
-            )
+        merge_validated_fields(self.cursor, self.validated.validated_field_rows())
 
     def update_validated_table_data(self):
-        document_id = self.validation_results["result"]["validatedExtractionResults"][
-            "DocumentId"
-        ]
-
-        # Retrieve tables from validatedExtractionResults
-        tables = (
-            self.validation_results["result"]
-            .get("validatedExtractionResults", {})
-            .get("ResultsDocument", {})
-            .get("Tables", [])
+        merge_validated_cells(self.cursor, self.validated.validated_cell_rows())
+
+    def extraction_rows(self) -> list[tuple]:
+        return list(self.extraction.rows(self.filename))
+
+    def write_extraction_results(self, rows: Optional[list[tuple]] = None):
+        # One prepared statement for every field and table cell of the document
+        self.cursor.executemany(
+            UPSERT_EXTRACTION_SQL,
+            self.extraction.rows(self.filename) if rows is None else rows,
         )
-        if tables:
-            for table in tables:
-                headers_lookup = self.create_headers_lookup_dict([table])
-                field_id = table["FieldId"]
-                headers = headers_lookup.get(field_id, {})
-
-                # Iterate over each row in the table
-                for value in table["Values"]:
-                    for cell in value["Cells"]:
-                        # Only process non-header rows
-                        if cell["RowIndex"] != 0 and not cell["IsHeader"]:
-                            cell_values = cell.get("Values", [{}])
-                            first_value = cell_values[0] if cell_values else {}
-
-                            # Get validated_field_value and other relevant data
-                            validated_field_value = first_value.get("Value", None)
-                            operator_confirmed = cell.get("OperatorConfirmed")
-                            is_correct = cell.get("DataSource") not in {
-                                "ManuallyChanged",
-                                "Manual",
-                            }
-
-                            # Map to the appropriate database field name for the cell's column
-                            field_name = headers.get(cell["ColumnIndex"])
-                            if field_name is None:
-                                print(
-                                    f"Warning: Column index {cell['ColumnIndex']} not found in headers."
-                                )
-                                continue  # Skip if field name is not found
-
-                            # Execute a separate update for each cell to ensure accurate row-by-row updates
-                            sql = """
-                                UPDATE extraction
-                                SET validated_field_value = ?, operator_confirmed = ?, is_correct = ?
-                                WHERE document_id = ? AND field_id = ? AND field = ? AND row_index = ? AND column_index = ?
-                            """
-                            # Execute the update with the prepared data
-                            self.cursor.execute(
-                                sql,
-                                (
-                                    validated_field_value,
-                                    operator_confirmed,
-                                    is_correct,
-                                    document_id,
-                                    field_id,
-                                    field_name,
-                                    cell["RowIndex"],  # Unique row index
-                                    cell["ColumnIndex"],  # Unique column index
-                                ),
-                            )
-
-    def write_extraction_results(self):
-        self.insert_field_data()
-        self.insert_table_data()
 
     def write_validated_results(self):
         self.update_validated_field_data()
         self.update_validated_table_data()
 
-    def export_query_to_csv(self):
+    def export_rows_to_csv(
+        self, rows: list[tuple], output_dir: Optional[str] = None
+    ) -> None:
         """
-        Exports the result of an SQLite query to CSV files.
+        Export the rows of the current write, replacing only their page range files.
+
+        Args:
+            rows (list[tuple]): Extraction rows ordered like EXTRACTION_COLUMNS.
+        """
+        if not rows:
+            print(f"No extraction rows to export for filename '{self.filename}'.")
+            return
+
+        # An extraction result covers one split, but group to be safe
+        rows_by_page_range = {}
+        for row in rows:
+            csv_row = tuple(row[index] for index in _CSV_INDEXES)
+            rows_by_page_range.setdefault(csv_row[1], []).append(csv_row)
+
+        for page_range, csv_rows in rows_by_page_range.items():
+            try:
+                csv_filepath = write_csv(
+                    self.filename, page_range, csv_rows, output_dir
+                )
+            except OSError as e:
+                print(f"Unable to export {self.filename} pages {page_range}: {e}")
+                continue
+            print(f"Data exported to {csv_filepath}")
+
+    def export_query_to_csv(self, output_dir: Optional[str] = None):
+        """
+        Re-export every stored extraction row of the file to CSV files.
         The CSV files are named as "filename-page_range.csv" to handle multiple document splits.
 
         Raises:
             ValueError: If the query doesn't return rows for the specified filename.
         """
         try:
-            query = """
-                SELECT filename, page_range, field_id, field, is_missing,
-                    field_value, field_unformatted_value, confidence, ocr_confidence
+            query = f"""
+                SELECT {", ".join(CSV_COLUMNS)}
                 FROM extraction
-                WHERE filename = ?;
+                WHERE filename = ?
+                ORDER BY page_range, rowid;
             """
-
-            # Execute the query with self.filename as a parameter
-            self.cursor.execute(query, (self.filename,))
-            rows = self.cursor.fetchall()
-            column_names = [description[0] for description in self.cursor.description]
+            rows = self.cursor.execute(query, (self.filename,)).fetchall()
 
             # Check if rows are returned
             if not rows:
                 raise ValueError(f"No rows returned for filename '{self.filename}'.")
 
-            # Group data by page_range
-            data_by_page_range = {}
-            for row in rows:
-                page_range = row[1]  # Assuming page_range is the second column
-                if page_range not in data_by_page_range:
-                    data_by_page_range[page_range] = []
-                data_by_page_range[page_range].append(row)
-
-            # Define the output directory
-            output_dir = "output_results"
-            os.makedirs(output_dir, exist_ok=True)  # Ensure the directory exists
-
-            base_filename = os.path.splitext(os.path.basename(self.filename))[
-                0
-            ]  # Get filename without extension
-
-            # Create separate CSV files for each page_range
-            for page_range, data_rows in data_by_page_range.items():
-                csv_filename = f"{base_filename}-pages_{page_range}.csv"
-                csv_filepath = os.path.join(output_dir, csv_filename)
-
-                with open(
-                    csv_filepath, mode="w", newline="", encoding="utf-8"
-                ) as csv_file:
-                    writer = csv.writer(csv_file)
-                    writer.writerow(column_names)  # Write the header
-                    writer.writerows(data_rows)  # Write the data
-
+            for _, page_range, data_rows in group_csv_rows(rows):
+                csv_filepath = write_csv(
+                    self.filename, page_range, data_rows, output_dir
+                )
                 print(f"Data exported to {csv_filepath}")
 
         except sqlite3.Error as e:
@@ -323,21 +314,29 @@ class WriteResults:
         except ValueError as e:
             print(f"ValueError: {e}")
 
-    def write_results(self):
-        try:
-            # Write regular and validated results
-            if self.extraction_results:
-                self.write_extraction_results()
-            if self.validation_results:
-                self.write_validated_results()
-
-            self.export_query_to_csv()
-            # Commit once after all data is written
-            self.conn.commit()
-
-        except Exception as e:
-            print(f"An error occurred: {e}")
-            self.conn.rollback()  # Rollback in case of error
-        finally:
-            # Close the connection after all operations
-            self.conn.close()
+    def write_results(self) -> Future:
+        """
+        Queue the results on the database writer and export them to CSV.
+
+        The inserts and the validated merge run together in one savepoint of
+        the writer's group commit; on error they are rolled back as a unit.
+        The CSV export is built from the rows of this write on the calling
+        thread, so only the page range it covers is rewritten and the file
+        is not re-queried from the database. Validated values are not part
+        of the CSV, so validation-only writes skip the export.
+        """
+        rows = self.extraction_rows() if self.extraction_results else None
+        future = submit_write(self._write_results, rows)
+        if rows is not None:
+            self.export_rows_to_csv(rows)
+        return future
+
+    def _write_results(
+        self, cursor: sqlite3.Cursor, rows: Optional[list[tuple]] = None
+    ) -> None:
+        self.cursor = cursor
+        # Write regular and validated results
+        if rows is not None:
+            self.write_extraction_results(rows)
+        if self.validation_results:
+            self.write_validated_results()
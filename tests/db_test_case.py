@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from utils import db_utils
+from utils.migrations import run_migrations
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """
+    Test case backed by a throwaway cache database.
+
+    Each test gets `self.temp_dir` and a database at `self.db_path` that
+    `utils.db_utils` uses in place of the real cache. Migrations are applied
+    unless `migrate` is False. Queued writes are flushed and this thread's
+    connection closed before the directory is removed, even when a subclass
+    `setUp` fails part way.
+    """
+
+    migrate = True
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.db_path = os.path.join(self.temp_dir.name, "document_cache.db")
+        db_patch = patch("utils.db_utils.SQLITE_DB_PATH", self.db_path)
+        db_patch.start()
+        self.addCleanup(db_patch.stop)
+        # Cleanups run last-in first-out: flush, close, unpatch, remove
+        self.addCleanup(db_utils.close_connection)
+        self.addCleanup(db_utils.flush_writes)
+        if self.migrate:
+            run_migrations(db_utils.get_connection())
@@ -0,0 +1,141 @@
+import os
+import sys
+import asyncio
+import threading
+import unittest
+from concurrent.futures import Future
+from unittest.mock import AsyncMock, Mock, patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from db_test_case import DatabaseTestCase
+from modules.async_clients import AsyncDigitize, AsyncExtract, AsyncValidate
+from modules.digitize import Digitize
+from modules.extract import Extract
+from modules.validate import Validate
+from utils import db_utils
+from utils.futures import resolved
+
+
+class TestAsyncClients(unittest.TestCase):
+    def setUp(self):
+        self.base_url = "https://example.com/"
+        self.project_id = "project123"
+        self.bearer_token = "bearerToken"
+
+    def test_digitize_uses_cached_document_id(self):
+        client = Digitize(self.base_url, self.project_id, self.bearer_token)
+
+        with (
+            patch.object(
+                client, "start_digitization", return_value=("12345", True)
+            ) as mock_start,
+            patch("modules.async_clients.hash_file", return_value="hash"),
+            patch(
+                "modules.async_clients.asubmit_async_request", new_callable=AsyncMock
+            ) as mock_submit,
+        ):
+            document_id = asyncio.run(AsyncDigitize(client).digitize("doc.pdf"))
+
+        self.assertEqual(document_id, "12345")
+        mock_start.assert_called_once_with("doc.pdf", "hash")
+        mock_submit.assert_not_called()
+
+    def test_extract_awaits_result_without_blocking(self):
+        client = Extract(self.base_url, self.project_id, self.bearer_token)
+        extraction_results = {"extractionResult": {"DocumentId": "12345"}}
+
+        def slow_result(**kwargs):
+            future = Future()
+            threading.Timer(0.05, future.set_result, (extraction_results,)).start()
+            return future
+
+        async def run_many():
+            extractor = AsyncExtract(client)
+            return await asyncio.gather(
+                *(extractor.extract_document("invoices", f"doc{i}") for i in range(20))
+            )
+
+        with (
+            patch.object(client, "start_extraction", return_value="op1"),
+            patch(
+                "modules.extract.start_async_request",
+                new=Mock(side_effect=slow_result),
+            ) as mock_start,
+            patch("modules.extract.clear_pending_extraction"),
+            patch.object(client.result_cache, "put"),
+        ):
+            results = asyncio.run(run_many())
+
+        self.assertEqual(results, [extraction_results] * 20)
+        self.assertEqual(mock_start.call_count, 20)
+
+    def test_extract_returns_none_when_start_fails(self):
+        client = Extract(self.base_url, self.project_id, self.bearer_token)
+
+        with patch.object(client, "start_extraction", return_value=None):
+            result = asyncio.run(
+                AsyncExtract(client).extract_document("invoices", "12345")
+            )
+
+        self.assertIsNone(result)
+
+    def test_classification_validation_finishes_off_the_event_loop(self):
+        client = Validate(self.base_url, self.project_id, self.bearer_token)
+        finished_on = []
+
+        def finish(validation_result):
+            finished_on.append(threading.current_thread())
+            return "invoices"
+
+        with (
+            patch.object(client, "start_classification_validation", return_value="op1"),
+            patch.object(
+                client, "finish_classification_validation", side_effect=finish
+            ),
+            patch(
+                "modules.async_clients.asubmit_validation_request",
+                new_callable=AsyncMock,
+                return_value={"result": {}},
+            ),
+        ):
+            result = asyncio.run(
+                AsyncValidate(client).validate_classification_results(
+                    "doc1", "classifier1", {}, None
+                )
+            )
+
+        self.assertEqual(result, "invoices")
+        self.assertIsNot(finished_on[0], threading.main_thread())
+
+
+class TestAsyncExtractPendingRows(DatabaseTestCase):
+    def test_completed_extraction_clears_pending_row(self):
+        client = Extract("https://example.com/", "project123", "token")
+        extraction_results = {"extractionResult": {"DocumentId": "doc1"}}
+
+        def start(extractor_id, document_id, page_range, prompts):
+            db_utils.save_pending_extraction(
+                document_id, extractor_id, page_range, "op1"
+            )
+            return "op1"
+
+        with (
+            patch.object(client, "start_extraction", side_effect=start),
+            patch(
+                "modules.extract.start_async_request",
+                return_value=resolved(extraction_results),
+            ),
+        ):
+            result = asyncio.run(
+                AsyncExtract(client).extract_document("invoices", "doc1", "1-2")
+            )
+        db_utils.flush_writes()
+
+        self.assertEqual(result, extraction_results)
+        self.assertEqual(
+            db_utils.execute_query("SELECT COUNT(*) FROM pending_extractions"), [(0,)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
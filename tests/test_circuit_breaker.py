@@ -0,0 +1,106 @@
+import os
+import sys
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from utils.db_utils import flush_writes
+from utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    is_unavailable_error,
+)
+from utils.rate_limiter import ThrottledError
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker("extractor:invoices", 3, 60, persist=False)
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertTrue(breaker.allow_request())
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertTrue(breaker.is_open())
+        self.assertFalse(breaker.allow_request())
+
+    def test_single_probe_when_half_open(self):
+        breaker = CircuitBreaker("extractor:invoices", 1, 0.01, persist=False)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        self.assertTrue(breaker.allow_request())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow_request())
+
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertTrue(breaker.allow_request())
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("extractor:invoices", 5, 0.01, persist=False)
+        for _ in range(5):
+            breaker.record_failure()
+        time.sleep(0.02)
+
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow_request())
+
+    def test_released_probe_lets_next_request_probe(self):
+        breaker = CircuitBreaker("extractor:invoices", 1, 0.01, persist=False)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+        # The probe ended without a verdict, e.g. a rejected start request
+        breaker.release_probe()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+
+    def test_only_unavailable_errors_count(self):
+        def http_error(status_code):
+            return requests.exceptions.HTTPError(response=Mock(status_code=status_code))
+
+        self.assertTrue(is_unavailable_error(requests.exceptions.ConnectionError()))
+        self.assertTrue(is_unavailable_error(requests.exceptions.Timeout()))
+        self.assertTrue(is_unavailable_error(http_error(502)))
+        self.assertFalse(is_unavailable_error(http_error(400)))
+        self.assertFalse(
+            is_unavailable_error(
+                ThrottledError("throttled", 1.0, response=Mock(status_code=503))
+            )
+        )
+
+    def test_state_is_persisted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "cache.db")
+            with patch("utils.db_utils.SQLITE_DB_PATH", db_path):
+                with sqlite3.connect(db_path) as conn:
+                    conn.execute(
+                        "CREATE TABLE circuit_breakers (key TEXT PRIMARY KEY, state TEXT NOT NULL, "
+                        "failure_count INTEGER NOT NULL DEFAULT 0, opened_at REAL, updated_at REAL NOT NULL)"
+                    )
+
+                breaker = CircuitBreaker("classifier:ml", 1, 60)
+                breaker.record_failure()
+                flush_writes()
+
+                reloaded = CircuitBreaker("classifier:ml", 1, 60)
+                self.assertEqual(reloaded.state, OPEN)
+                self.assertEqual(reloaded.failure_count, 1)
+                self.assertFalse(reloaded.allow_request())
+
+
+if __name__ == "__main__":
+    unittest.main()
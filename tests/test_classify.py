@@ -30,7 +30,9 @@ class TestClassify(unittest.TestCase):
         response.status_code = 200
         response.json.return_value = response_data
 
-        with unittest.mock.patch("requests.post", return_value=response) as mock_post:
+        with unittest.mock.patch(
+            "requests.Session.post", return_value=response
+        ) as mock_post:
             classifier = Classify(base_url, project_id, bearer_token)
             result = classifier.classify_document(
                 document_id,
@@ -54,7 +56,9 @@ class TestClassify(unittest.TestCase):
         response = Mock()
         response.status_code = 400
 
-        with unittest.mock.patch("requests.post", return_value=response) as mock_post:
+        with unittest.mock.patch(
+            "requests.Session.post", return_value=response
+        ) as mock_post:
             classifier = Classify(base_url, project_id, bearer_token)
             result = classifier.classify_document(
                 document_id,
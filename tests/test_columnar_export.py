@@ -0,0 +1,178 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from db_test_case import DatabaseTestCase
+from utils import atomic_file, db_utils
+from utils.columnar_export import build_query, export_table, pyarrow_available
+
+if pyarrow_available():
+    import pyarrow.dataset as ds
+
+
+def extraction_row(filename, document_type_id, field_id, timestamp):
+    return (
+        filename,
+        f"doc-{filename}",
+        document_type_id,
+        field_id,
+        field_id.title(),
+        0,
+        "value",
+        "value",
+        1,
+        0.9,
+        0.95,
+        0,
+        "1-1",
+        timestamp,
+    )
+
+
+class TestColumnarExport(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.output_dir = os.path.join(self.temp_dir.name, "exports")
+
+        with db_utils.transaction() as cursor:
+            cursor.executemany(
+                """
+                INSERT INTO documents (document_id, filename, stage, project_id, timestamp)
+                VALUES (?, ?, 'extraction', ?, ?)
+                """,
+                [
+                    ("doc-a.pdf", "a.pdf", "project-1", 1714521600),  # 2024-05-01
+                    ("doc-b.pdf", "b.pdf", "project-2", 1714608000),  # 2024-05-02
+                ],
+            )
+            cursor.executemany(
+                """
+                INSERT INTO extraction (filename, document_id, document_type_id, field_id,
+                    field, is_missing, field_value, field_unformatted_value, is_correct,
+                    confidence, ocr_confidence, operator_confirmed, page_range, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    extraction_row("a.pdf", "invoices", "total", "2024-05-01 10:00:00"),
+                    extraction_row("a.pdf", "invoices", "date", "2024-05-01 10:00:01"),
+                    extraction_row("b.pdf", "invoices", "total", "2024-05-02 09:00:00"),
+                    extraction_row(
+                        "b.pdf", "receipts", "vendor", "2024-05-02 09:00:00"
+                    ),
+                ],
+            )
+            cursor.execute(
+                """
+                INSERT INTO classification (document_id, filename, document_type_id,
+                    classification_confidence, start_page, page_count, classifier_name,
+                    operation_id)
+                VALUES ('doc-a.pdf', 'a.pdf', 'invoices', 0.98, 0, 1, 'ml-classification', 'op')
+                """
+            )
+
+    def test_build_query_filters_and_orders_by_partition(self):
+        query, params = build_query(
+            "extraction", since="2024-05-01", until="2024-05-31", project_id="p"
+        )
+        self.assertIn("d.project_id = ?", query)
+        self.assertTrue(
+            query.endswith("ORDER BY e.document_type_id, d.project_id, e.timestamp")
+        )
+        self.assertEqual(params, ("2024-05-01", "2024-05-31", "p"))
+
+    @unittest.skipUnless(pyarrow_available(), "pyarrow is not installed")
+    def test_exports_partitioned_parquet_in_chunks(self):
+        written = export_table("extraction", self.output_dir, chunk_rows=1)
+
+        self.assertEqual(len(written), 3)
+        self.assertEqual(sum(written.values()), 4)
+        dataset = ds.dataset(
+            os.path.join(self.output_dir, "extraction"),
+            format="parquet",
+            partitioning="hive",
+        )
+        table = dataset.to_table(filter=ds.field("day") == "2024-05-01")
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(
+            set(table.column("document_type_id").to_pylist()), {"invoices"}
+        )
+        self.assertEqual(set(table.column("project_id").to_pylist()), {"project-1"})
+        self.assertEqual(table.column("is_correct").to_pylist(), [True, True])
+
+    @unittest.skipUnless(pyarrow_available(), "pyarrow is not installed")
+    @unittest.skipIf(os.name == "nt", "POSIX permission bits")
+    def test_partition_permissions_follow_umask(self):
+        with patch.object(atomic_file, "_UMASK", 0o022):
+            written = export_table("extraction", self.output_dir)
+
+        for path in written:
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o644)
+
+    @unittest.skipUnless(pyarrow_available(), "pyarrow is not installed")
+    def test_filters_and_arrow_format(self):
+        written = export_table(
+            "extraction",
+            self.output_dir,
+            file_format="arrow",
+            project_id="project-2",
+            document_type_id="receipts",
+        )
+        self.assertEqual(
+            list(written),
+            [
+                os.path.join(
+                    self.output_dir,
+                    "extraction",
+                    "document_type_id=receipts",
+                    "day=2024-05-02",
+                    "part-project-2.arrow",
+                )
+            ],
+        )
+
+        written = export_table("classification", self.output_dir, since="2024-05-01")
+        self.assertEqual(sum(written.values()), 1)
+        dataset = ds.dataset(
+            os.path.join(self.output_dir, "classification"), partitioning="hive"
+        )
+        self.assertEqual(dataset.to_table().column("filename").to_pylist(), ["a.pdf"])
+
+    @unittest.skipUnless(pyarrow_available(), "pyarrow is not installed")
+    def test_project_export_keeps_other_projects_in_partition(self):
+        with db_utils.transaction() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO documents (document_id, filename, stage, project_id, timestamp)
+                VALUES ('doc-c.pdf', 'c.pdf', 'extraction', 'project-2', 1714521600)
+                """
+            )
+            cursor.execute(
+                """
+                INSERT INTO extraction (filename, document_id, document_type_id, field_id,
+                    field, is_missing, field_value, field_unformatted_value, is_correct,
+                    confidence, ocr_confidence, operator_confirmed, page_range, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                extraction_row("c.pdf", "invoices", "total", "2024-05-01 11:00:00"),
+            )
+
+        def day_rows():
+            dataset = ds.dataset(
+                os.path.join(self.output_dir, "extraction"),
+                format="parquet",
+                partitioning="hive",
+            )
+            table = dataset.to_table(filter=ds.field("day") == "2024-05-01")
+            return sorted(table.column("filename").to_pylist())
+
+        export_table("extraction", self.output_dir)
+        self.assertEqual(day_rows(), ["a.pdf", "a.pdf", "c.pdf"])
+
+        export_table("extraction", self.output_dir, project_id="project-2")
+        self.assertEqual(day_rows(), ["a.pdf", "a.pdf", "c.pdf"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from db_test_case import DatabaseTestCase
+from utils import db_utils
+from utils.migrations import run_migrations
+
+
+class TestDbUtils(DatabaseTestCase):
+    migrate = False
+
+    def setUp(self):
+        super().setUp()
+        db_utils.execute_query(
+            "CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)"
+        )
+
+    def test_connection_is_reused_per_thread(self):
+        conn = db_utils.get_connection()
+        self.assertIs(db_utils.get_connection(), conn)
+
+        other = []
+        thread = threading.Thread(
+            target=lambda: (
+                other.append(db_utils.get_connection()),
+                db_utils.close_connection(),
+            )
+        )
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], conn)
+
+    def test_connection_is_closed_when_thread_exits(self):
+        other = []
+        with patch(
+            "utils.db_utils._close_all", wraps=db_utils._close_all
+        ) as mock_close:
+            thread = threading.Thread(
+                target=lambda: other.append(db_utils.get_connection())
+            )
+            thread.start()
+            thread.join()
+
+        mock_close.assert_called_once()
+        self.assertEqual(mock_close.call_args.args[0], {})
+
+    def test_invalid_synchronous_mode_is_rejected(self):
+        db_utils.close_connection()
+        with patch("utils.db_utils.SQLITE_SYNCHRONOUS", "OFF; DROP TABLE items"):
+            with self.assertRaises(ValueError):
+                db_utils.get_connection()
+
+        with patch("utils.db_utils.SQLITE_SYNCHRONOUS", "full"):
+            conn = db_utils.get_connection()
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 2)
+
+    def test_wal_journaling(self):
+        mode = db_utils.get_connection().execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode.lower(), "wal")
+
+    def test_concurrent_writers(self):
+        errors = []
+
+        def write(worker):
+            try:
+                for i in range(50):
+                    db_utils.execute_query(
+                        "INSERT INTO items (value) VALUES (?)", (f"{worker}-{i}",)
+                    )
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db_utils.close_connection()
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(db_utils.execute_query("SELECT COUNT(*) FROM items"), [(400,)])
+
+    def test_transaction_rolls_back_on_error(self):
+        with self.assertRaises(ValueError):
+            with db_utils.transaction() as cursor:
+                cursor.execute("INSERT INTO items (value) VALUES ('a')")
+                raise ValueError("boom")
+
+        self.assertEqual(db_utils.execute_query("SELECT COUNT(*) FROM items"), [(0,)])
+
+    def test_pending_extractions_are_tracked_per_page_range(self):
+        run_migrations(db_utils.get_connection())
+        db_utils.update_cache("a.pdf", "doc1", "classified", project_id="p1")
+        db_utils.save_pending_extraction("doc1", "invoices", "1-2", "op1")
+        db_utils.save_pending_extraction("doc1", "receipts", "3", "op2")
+        db_utils.save_pending_extraction("doc1", "invoices", "4", "op3")
+        db_utils.clear_pending_extraction("doc1", "invoices", "4")
+        db_utils.flush_writes()
+
+        pending = sorted(db_utils.get_pending_operations("p1"))
+        self.assertEqual(
+            pending,
+            [
+                ("a.pdf", "doc1", "extraction-pending", "invoices", "op1", "1-2"),
+                ("a.pdf", "doc1", "extraction-pending", "receipts", "op2", "3"),
+            ],
+        )
+        self.assertEqual(db_utils.get_pending_operations("p2"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from db_test_case import DatabaseTestCase
+from utils import db_utils
+from utils.db_writer import DatabaseWriter
+
+
+def insert(cursor, value):
+    cursor.execute("INSERT INTO items (value) VALUES (?)", (value,))
+    return value
+
+
+def fail(cursor):
+    cursor.execute("INSERT INTO items (value) VALUES ('rolled back')")
+    raise ValueError("boom")
+
+
+class TestDatabaseWriter(DatabaseTestCase):
+    migrate = False
+
+    def setUp(self):
+        super().setUp()
+        db_utils.execute_query("CREATE TABLE items (value TEXT)")
+
+    def _values(self):
+        return [row[0] for row in db_utils.execute_query("SELECT value FROM items")]
+
+    def test_writes_are_group_committed_in_order(self):
+        writer = DatabaseWriter(flush_interval=0.2, batch_size=100)
+        futures = [writer.submit(insert, f"v{i}") for i in range(50)]
+        writer.flush()
+
+        self.assertEqual(
+            [future.result() for future in futures], [f"v{i}" for i in range(50)]
+        )
+        self.assertEqual(self._values(), [f"v{i}" for i in range(50)])
+        self.assertLess(writer.commits, 50)
+        writer.close()
+
+    def test_failed_write_does_not_affect_batch(self):
+        writer = DatabaseWriter(flush_interval=0.2, batch_size=100)
+        first = writer.submit(insert, "a")
+        failed = writer.submit(fail)
+        last = writer.submit(insert, "b")
+        writer.flush()
+
+        self.assertEqual(first.result(), "a")
+        self.assertIsInstance(failed.exception(), ValueError)
+        self.assertEqual(last.result(), "b")
+        self.assertEqual(self._values(), ["a", "b"])
+        writer.close()
+
+    def test_close_flushes_queued_writes(self):
+        writer = DatabaseWriter(flush_interval=1, batch_size=1000)
+        for i in range(10):
+            writer.submit(insert, str(i))
+        writer.close()
+
+        self.assertEqual(len(self._values()), 10)
+        with self.assertRaises(RuntimeError):
+            writer.submit(insert, "late")
+
+    def test_unopenable_database_fails_batch_and_keeps_writer(self):
+        writer = DatabaseWriter(flush_interval=0.01, batch_size=10)
+        with patch(
+            "utils.db_utils.SQLITE_DB_PATH",
+            os.path.join(self.temp_dir.name, "missing", "document_cache.db"),
+        ):
+            failed = writer.submit(insert, "lost")
+            with self.assertRaises(Exception):
+                failed.result(timeout=5)
+
+        self.assertTrue(writer._thread.is_alive())
+        self.assertEqual(writer.submit(insert, "kept").result(timeout=5), "kept")
+        writer.flush(timeout=5)
+        writer.close()
+
+    def test_flush_raises_when_writer_is_not_running(self):
+        writer = DatabaseWriter(flush_interval=0.01, batch_size=10)
+        writer.close()
+        writer._closed = False
+        with self.assertRaises(RuntimeError):
+            writer.flush()
+
+
+if __name__ == "__main__":
+    unittest.main()
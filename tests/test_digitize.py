@@ -1,13 +1,31 @@
 import os
 import sys
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import Mock
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 from modules.digitize import Digitize
+from utils.db_utils import flush_writes
+from utils.file_hash import hash_file
+from utils.futures import resolved
 
 
 class TestDigitize(unittest.TestCase):
+    def setUp(self):
+        # Keep completed digitizations out of the working tree's response archive
+        self.archive_patch = unittest.mock.patch(
+            "modules.async_request_handler.get_response_archive"
+        )
+        self.archive_patch.start()
+
+    def tearDown(self):
+        self.archive_patch.stop()
+
     def test_digitize_successful(self):
         base_url = "https://example.com/"
         project_id = "project123"
@@ -27,9 +45,11 @@ class TestDigitize(unittest.TestCase):
 
         with (
             unittest.mock.patch(
-                "requests.post", return_value=post_response
+                "requests.Session.post", return_value=post_response
             ) as mock_post,
-            unittest.mock.patch("requests.get", return_value=get_response) as mock_get,
+            unittest.mock.patch(
+                "requests.Session.get", return_value=get_response
+            ) as mock_get,
         ):
             digitizer = Digitize(base_url, project_id, bearer_token)
             digitize_results = digitizer.digitize("./example_documents/id_card.jpg")
@@ -48,7 +68,7 @@ class TestDigitize(unittest.TestCase):
         post_response.status_code = 400
 
         with unittest.mock.patch(
-            "requests.post", return_value=post_response
+            "requests.Session.post", return_value=post_response
         ) as mock_post:
             digitizer = Digitize(base_url, project_id, bearer_token)
             digitize_results = digitizer.digitize("./example_documents/id_card.jpg")
@@ -56,6 +76,97 @@ class TestDigitize(unittest.TestCase):
             self.assertIsNone(digitize_results)
             mock_post.assert_called_once()
 
+    def test_renamed_copy_uses_cached_document(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "document_cache.db")
+            with sqlite3.connect(db_path) as conn:
+                conn.execute(
+                    """
+                    CREATE TABLE documents (
+                        document_id TEXT PRIMARY KEY,
+                        filename TEXT NOT NULL,
+                        stage TEXT NOT NULL,
+                        project_id TEXT,
+                        error_code TEXT,
+                        error_message TEXT,
+                        timestamp REAL NOT NULL,
+                        content_hash TEXT
+                    )
+                    """
+                )
+            original = os.path.join(tmp, "invoice.jpg")
+            renamed = os.path.join(tmp, "invoice_copy.jpg")
+            shutil.copy("./example_documents/id_card.jpg", original)
+            shutil.copy(original, renamed)
+
+            post_response = Mock()
+            post_response.status_code = 202
+            post_response.json.return_value = {"documentId": "12345"}
+
+            with (
+                unittest.mock.patch("utils.db_utils.SQLITE_DB_PATH", db_path),
+                unittest.mock.patch(
+                    "requests.Session.post", return_value=post_response
+                ) as mock_post,
+            ):
+                digitizer = Digitize("https://example.com/", "project123", "token")
+                self.assertEqual(
+                    digitizer.start_digitization(original), ("12345", False)
+                )
+                # Only completed digitizations are reused
+                flush_writes()
+                with sqlite3.connect(db_path) as conn:
+                    conn.execute("UPDATE documents SET stage = 'digitization'")
+                self.assertEqual(digitizer.start_digitization(renamed), ("12345", True))
+                mock_post.assert_called_once()
+
+                # The same bytes in another project are digitized again
+                other = Digitize("https://example.com/", "project456", "token")
+                post_response.json.return_value = {"documentId": "67890"}
+                self.assertEqual(other.start_digitization(renamed), ("67890", False))
+
+            self.assertEqual(hash_file(original), hash_file(renamed))
+
+    def test_identical_files_in_flight_are_uploaded_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, f"mail_{i}.jpg") for i in range(3)]
+            for path in paths:
+                shutil.copy("./example_documents/id_card.jpg", path)
+
+            def slow_start(document_path, content_hash=None):
+                time.sleep(0.1)
+                return "12345", False
+
+            digitizer = Digitize("https://example.com/", "project123", "token")
+            results = []
+            with (
+                unittest.mock.patch.object(
+                    digitizer, "start_digitization", side_effect=slow_start
+                ) as mock_start,
+                unittest.mock.patch.object(
+                    digitizer,
+                    "track_digitization",
+                    return_value=resolved(
+                        {"documentObjectModel": {"documentId": "12345"}}
+                    ),
+                ),
+            ):
+                threads = [
+                    threading.Thread(
+                        target=lambda path=path: results.append(
+                            digitizer.digitize(path)
+                        )
+                    )
+                    for path in paths
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+            mock_start.assert_called_once()
+            self.assertEqual(results, ["12345"] * 3)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -62,7 +62,7 @@ class TestDiscovery(unittest.TestCase):
 
     @patch("questionary.select")
     @patch(
-        "requests.get",
+        "requests.Session.get",
         return_value=MagicMock(
             status_code=200,
             json=lambda: {
@@ -83,7 +83,7 @@ class TestDiscovery(unittest.TestCase):
         self.assertEqual(project_id, "123")
 
     @patch(
-        "requests.get",
+        "requests.Session.get",
         return_value=MagicMock(
             status_code=200,
             json=lambda: {
@@ -108,7 +108,7 @@ class TestDiscovery(unittest.TestCase):
         self.assertEqual(classifier_id, "456")
 
     @patch(
-        "requests.get",
+        "requests.Session.get",
         return_value=MagicMock(
             status_code=200,
             json=lambda: {
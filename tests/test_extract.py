@@ -6,6 +6,7 @@ from requests.exceptions import RequestException
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 from modules.extract import Extract
+from utils.rate_limiter import ThrottledError
 
 
 class TestExtract(unittest.TestCase):
@@ -23,7 +24,9 @@ class TestExtract(unittest.TestCase):
         response.status_code = 200
         response.json.return_value = response_data
 
-        with unittest.mock.patch("requests.post", return_value=response) as mock_post:
+        with unittest.mock.patch(
+            "requests.Session.post", return_value=response
+        ) as mock_post:
             extractor = Extract(base_url, project_id, bearer_token)
             extracted_data = extractor.extract_document(
                 extractor_id, document_id, prompts=prompts
@@ -44,7 +47,9 @@ class TestExtract(unittest.TestCase):
         response = Mock()
         response.status_code = 500
 
-        with unittest.mock.patch("requests.post", return_value=response) as mock_post:
+        with unittest.mock.patch(
+            "requests.Session.post", return_value=response
+        ) as mock_post:
             extractor = Extract(base_url, project_id, bearer_token)
             extracted_data = extractor.extract_document(
                 extractor_id, document_id, prompts=prompts
@@ -62,7 +67,7 @@ class TestExtract(unittest.TestCase):
         prompts = {"prompt1": "value1", "prompt2": "value2"}
 
         with unittest.mock.patch(
-            "requests.post", side_effect=RequestException
+            "requests.Session.post", side_effect=RequestException
         ) as mock_post:
             extractor = Extract(base_url, project_id, bearer_token)
             extracted_data = extractor.extract_document(
@@ -72,6 +77,24 @@ class TestExtract(unittest.TestCase):
             self.assertIsNone(extracted_data)
             mock_post.assert_called_once()
 
+    def test_start_extraction_parks_throttled_document(self):
+        session = Mock()
+        session.post.side_effect = ThrottledError("throttled", retry_after=5.0)
+
+        with unittest.mock.patch(
+            "modules.extract.update_document_stage"
+        ) as mock_update_stage:
+            extractor = Extract(
+                "https://example.com/", "project123", "token", session=session
+            )
+            operation_id = extractor.start_extraction("throttled_extractor", "12345")
+
+        self.assertIsNone(operation_id)
+        self.assertEqual(
+            mock_update_stage.call_args.kwargs["new_stage"], "extraction_parked"
+        )
+        self.assertEqual(mock_update_stage.call_args.kwargs["error_code"], "Throttled")
+
 
 if __name__ == "__main__":
     unittest.main()
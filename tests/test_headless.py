@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+import project_setup
+from headless import add_headless_arguments, headless_settings, is_headless
+
+
+def _parse(*argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--folder")
+    add_headless_arguments(parser)
+    return parser.parse_args(argv)
+
+
+class TestHeadless(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_config(self, data):
+        path = os.path.join(self.temp_dir.name, "run.json")
+        with open(path, "w", encoding="utf-8") as config_file:
+            json.dump(data, config_file)
+        return path
+
+    def test_settings_from_config_file(self):
+        path = self._write_config(
+            {
+                "project_id": "project123",
+                "classifier": "ml-classification",
+                "extractors": {"invoices": {"id": "invoices", "name": "Invoices"}},
+                "validate_extraction": True,
+                "validate_extraction_later": True,
+                "document_folder": "inbox",
+            }
+        )
+        args = _parse("--config", path)
+
+        self.assertTrue(is_headless(args))
+        config, context, folder = headless_settings(args)
+        self.assertEqual(context.project_id, "project123")
+        self.assertEqual(context.classifier, "ml-classification")
+        self.assertEqual(context.extractor_dict["invoices"]["id"], "invoices")
+        self.assertFalse(config.validate_classification)
+        self.assertTrue(config.validate_extraction_later)
+        self.assertTrue(config.perform_classification)
+        self.assertEqual(folder, "inbox")
+
+    def test_discovery_cache_layout_is_accepted(self):
+        path = self._write_config(
+            {
+                "validate_classification": True,
+                "perform_extraction": False,
+                "project": {
+                    "id": "project123",
+                    "name": "Project",
+                    "classifier_id": {"id": "ml-classification", "name": "ML"},
+                },
+            }
+        )
+
+        config, context, folder = headless_settings(_parse("--config", path))
+        self.assertEqual(context.classifier, "ml-classification")
+        self.assertTrue(config.validate_classification)
+        self.assertFalse(config.perform_extraction)
+        self.assertIsNone(context.extractor_dict)
+        self.assertEqual(folder, "example_documents")
+
+    def test_command_line_overrides_config_file(self):
+        path = self._write_config(
+            {"project_id": "project123", "classifier": "ml-classification"}
+        )
+        args = _parse(
+            "--config",
+            path,
+            "--project-id",
+            "project456",
+            "--extractor",
+            "invoices=invoices-extractor",
+            "--extractor",
+            "receipts=receipts-extractor",
+            "--no-classification",
+            "--validate-extraction",
+            "--folder",
+            "inbox",
+        )
+
+        config, context, folder = headless_settings(args)
+        self.assertEqual(context.project_id, "project456")
+        self.assertFalse(config.perform_classification)
+        self.assertIsNone(context.classifier)
+        self.assertEqual(
+            context.extractor_dict,
+            {
+                "invoices": {"id": "invoices-extractor", "name": "invoices-extractor"},
+                "receipts": {"id": "receipts-extractor", "name": "receipts-extractor"},
+            },
+        )
+        self.assertTrue(config.validate_extraction)
+        self.assertEqual(folder, "inbox")
+
+    def test_missing_settings_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, "project ID"):
+            headless_settings(_parse("--headless"))
+        with self.assertRaisesRegex(ValueError, "extractor"):
+            headless_settings(
+                _parse("--headless", "--project-id", "p", "--no-classification")
+            )
+        with self.assertRaises(SystemExit), patch("sys.stderr"):
+            _parse("--extractor", "invoices")
+
+    @patch("project_setup.Discovery")
+    @patch("project_setup.ensure_database")
+    @patch("project_setup.get_authentication")
+    def test_headless_environment_skips_discovery(
+        self, mock_authentication, mock_ensure_database, mock_discovery
+    ):
+        config, context, _ = headless_settings(
+            _parse("--project-id", "p", "--classifier", "c", "--no-extraction")
+        )
+
+        _, _, clients = project_setup.initialize_headless_environment(config, context)
+
+        mock_discovery.assert_not_called()
+        mock_ensure_database.assert_called_once_with()
+        self.assertEqual(len(clients), 4)
+        self.assertEqual(clients[0].project_id, "p")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import unittest
+from unittest.mock import Mock, patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from utils.http_session import HttpSession, get_session
+from utils.token_provider import TokenProvider
+
+
+class TestHttpSession(unittest.TestCase):
+    def test_get_session_is_shared(self):
+        self.assertIs(get_session(), get_session())
+
+    def test_adapter_uses_configured_pool_size(self):
+        session = HttpSession(pool_connections=3, pool_size=7)
+
+        self.assertIs(
+            session.session.get_adapter("https://example.com"), session.adapter
+        )
+        self.assertEqual(session.adapter._pool_connections, 3)
+        self.assertEqual(session.adapter._pool_maxsize, 7)
+
+    def test_requests_are_counted(self):
+        session = HttpSession()
+        response = Mock(status_code=200)
+
+        with (
+            patch("requests.Session.get", return_value=response) as mock_get,
+            patch("requests.Session.post", return_value=response) as mock_post,
+        ):
+            session.get("https://example.com/a", timeout=1)
+            session.post("https://example.com/b", json={}, timeout=1)
+
+        mock_get.assert_called_once_with("https://example.com/a", timeout=1)
+        # JSON bodies are serialized by the session's codec
+        mock_post.assert_called_once_with(
+            "https://example.com/b",
+            data=b"{}",
+            headers={"Content-Type": "application/json"},
+            timeout=1,
+        )
+        stats = session.stats()
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["connections_opened"], 0)
+        self.assertEqual(stats["connections_reused"], 0)
+
+    def test_unauthorized_request_is_resent_once_with_refreshed_token(self):
+        session = HttpSession()
+        auth = Mock()
+        auth.refresh_rejected_token.return_value = "new-token"
+        rejected = Mock(status_code=401)
+        accepted = Mock(status_code=200)
+
+        with patch(
+            "requests.Session.get", side_effect=[rejected, accepted]
+        ) as mock_get:
+            response = session.get(
+                "https://example.com/a",
+                headers={"Authorization": "Bearer old-token"},
+                token_provider=TokenProvider(auth),
+            )
+
+        self.assertIs(response, accepted)
+        auth.refresh_rejected_token.assert_called_once_with("old-token")
+        self.assertEqual(
+            mock_get.call_args.kwargs["headers"]["Authorization"], "Bearer new-token"
+        )
+        self.assertEqual(session.stats()["reauthenticated"], 1)
+
+    def test_unauthorized_request_is_not_resent_twice(self):
+        session = HttpSession()
+        auth = Mock()
+        auth.refresh_rejected_token.return_value = "new-token"
+        rejected = Mock(status_code=401)
+
+        with patch("requests.Session.get", return_value=rejected) as mock_get:
+            response = session.get(
+                "https://example.com/a", token_provider=TokenProvider(auth)
+            )
+
+        self.assertIs(response, rejected)
+        self.assertEqual(mock_get.call_count, 2)
+        auth.refresh_rejected_token.assert_called_once_with(None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+sys.path.append(SRC_DIR)
+
+# Generous bound on importing the entry points in a fresh interpreter; it
+# catches work such as authentication or database setup creeping back in
+IMPORT_TIME_BUDGET = 3.0
+
+# Run in a fresh interpreter with sockets disabled, from an empty folder
+_IMPORT_SCRIPT = """
+import json, os, socket, sys, threading, time
+sys.path.insert(0, {src!r})
+
+def no_network(*args, **kwargs):
+    raise AssertionError("network access during import")
+
+socket.socket.connect = no_network
+socket.create_connection = no_network
+
+# Record who loads .env instead of reading the developer's settings
+import dotenv
+dotenv_callers = []
+
+def record_load_dotenv(*args, **kwargs):
+    dotenv_callers.append(sys._getframe(1).f_globals["__name__"])
+    return False
+
+dotenv.load_dotenv = record_load_dotenv
+
+start = time.perf_counter()
+import project_setup, get_validation_results, main, main_async
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "threads": [thread.name for thread in threading.enumerate()],
+    "files": os.listdir("."),
+    "dotenv_callers": dotenv_callers,
+}}))
+"""
+
+
+class TestImportTime(unittest.TestCase):
+    def test_entry_points_import_without_side_effects(self):
+        # Credentials are left unset so nothing can authenticate at import
+        env = {
+            key: value
+            for key, value in os.environ.items()
+            if key not in ("APP_ID", "APP_SECRET", "AUTH_URL")
+        }
+        with tempfile.TemporaryDirectory() as work_dir:
+            result = subprocess.run(
+                [sys.executable, "-c", _IMPORT_SCRIPT.format(src=SRC_DIR)],
+                cwd=work_dir,
+                env=env,
+                capture_output=True,
+                text=True,
+                timeout=60,
+            )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+
+        # No refresh thread, database writer or poller is started
+        self.assertEqual(report["threads"], ["MainThread"])
+        # Neither the cache folder nor the database is created
+        self.assertEqual(report["files"], [])
+        # Only the settings module loads .env; authentication loads it on first use
+        self.assertEqual(report["dotenv_callers"], ["project_config"])
+        self.assertLess(report["seconds"], IMPORT_TIME_BUDGET)
+
+    def test_authentication_is_initialized_once(self):
+        from utils import auth
+
+        with (
+            patch.object(auth, "_shared_auth", None),
+            patch.object(auth, "initialize_authentication") as mock_initialize,
+        ):
+            first = auth.get_authentication()
+            second = auth.get_authentication()
+
+        self.assertIs(first, second)
+        mock_initialize.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
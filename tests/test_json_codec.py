@@ -0,0 +1,91 @@
+import io
+import os
+import sys
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from utils import json_codec
+from utils.http_session import HttpSession
+from utils.rate_limiter import RateLimiter
+
+PAYLOAD = {"status": "Succeeded", "result": {"name": "Fähre", "values": [1, 2.5, None]}}
+
+
+def make_response(body: bytes, stream: bool = False) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Length"] = str(len(body))
+    if stream:
+        response.raw = Mock(wraps=io.BytesIO(body))
+        response.raw.release_conn = Mock()
+    else:
+        response._content = body
+    return response
+
+
+class TestJsonCodec(unittest.TestCase):
+    def test_round_trip(self):
+        encoded = json_codec.dumps(PAYLOAD, sort_keys=True)
+        self.assertIsInstance(encoded, bytes)
+        self.assertNotIn(b" ", encoded.replace(b"Succeeded", b""))
+        self.assertEqual(json_codec.loads(encoded), PAYLOAD)
+
+    def test_parse_response_decodes_body(self):
+        response = make_response(json_codec.dumps(PAYLOAD))
+        self.assertEqual(json_codec.parse_response(response), PAYLOAD)
+
+    def test_parse_response_falls_back_to_json_method(self):
+        response = Mock()
+        response.json.return_value = PAYLOAD
+        self.assertEqual(json_codec.parse_response(response), PAYLOAD)
+
+    @unittest.skipUnless(json_codec.ijson, "ijson is not installed")
+    def test_large_streamed_response_is_parsed_incrementally(self):
+        response = make_response(json_codec.dumps(PAYLOAD), stream=True)
+        with patch("utils.json_codec.JSON_STREAM_THRESHOLD_MB", 0):
+            self.assertEqual(json_codec.parse_response(response, stream=True), PAYLOAD)
+        response.raw.release_conn.assert_called_once()
+
+    def test_chunked_streamed_response_is_decoded_in_one_go(self):
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(json_codec.dumps(PAYLOAD))
+        with (
+            patch("utils.json_codec.JSON_STREAM_THRESHOLD_MB", 0),
+            patch("utils.json_codec.ijson") as mock_ijson,
+        ):
+            self.assertEqual(json_codec.parse_response(response, stream=True), PAYLOAD)
+        mock_ijson.items.assert_not_called()
+
+    def test_canonical_dumps_does_not_depend_on_backend(self):
+        expected = b'{"a":"F\\u00e4hre","b":[1,2.5]}'
+        self.assertEqual(
+            json_codec.canonical_dumps({"b": [1, 2.5], "a": "Fähre"}), expected
+        )
+        with patch("utils.json_codec.orjson", None):
+            self.assertEqual(
+                json_codec.canonical_dumps({"b": [1, 2.5], "a": "Fähre"}), expected
+            )
+
+    def test_session_serializes_json_bodies(self):
+        session = HttpSession(rate_limiter=RateLimiter(0, 0, 0))
+        with patch("requests.Session.post", return_value=Mock(status_code=200)) as post:
+            session.post(
+                "https://example.com/validate",
+                json=PAYLOAD,
+                headers={"content-type": "application/json; charset=utf-8"},
+            )
+
+        kwargs = post.call_args.kwargs
+        self.assertEqual(json_codec.loads(kwargs["data"]), PAYLOAD)
+        self.assertEqual(
+            kwargs["headers"]["Content-Type"], "application/json; charset=utf-8"
+        )
+        self.assertNotIn("json", kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import sqlite3
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from utils.migrations import SCHEMA_VERSION, get_schema_version, run_migrations
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.conn = sqlite3.connect(
+            os.path.join(self.temp_dir.name, "document_cache.db")
+        )
+
+    def tearDown(self):
+        self.conn.close()
+        self.temp_dir.cleanup()
+
+    def _indexes(self, table):
+        return {row[1] for row in self.conn.execute(f"PRAGMA index_list({table})")}
+
+    def test_new_database_is_created_at_latest_version(self):
+        applied = run_migrations(self.conn)
+
+        self.assertEqual(applied, SCHEMA_VERSION)
+        self.assertEqual(get_schema_version(self.conn), SCHEMA_VERSION)
+        self.assertTrue(
+            {"idx_documents_filename", "idx_documents_stage"}
+            <= self._indexes("documents")
+        )
+        self.assertIn("idx_extraction_document_field", self._indexes("extraction"))
+        self.assertEqual(run_migrations(self.conn), 0)
+
+    def test_upgrades_unversioned_database_in_place(self):
+        # Schema written by ensure_database before migrations existed
+        self.conn.execute(
+            """
+            CREATE TABLE documents (
+                document_id TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                project_id TEXT,
+                timestamp REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            "INSERT INTO documents VALUES ('doc1', 'a.pdf', 'extraction', 'p1', 1.0)"
+        )
+        self.conn.commit()
+
+        run_migrations(self.conn)
+
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(documents)")]
+        self.assertIn("content_hash", columns)
+        self.assertEqual(
+            self.conn.execute("SELECT document_id, filename FROM documents").fetchall(),
+            [("doc1", "a.pdf")],
+        )
+        self.assertEqual(get_schema_version(self.conn), SCHEMA_VERSION)
+
+    def test_hot_queries_use_indexes(self):
+        run_migrations(self.conn)
+        queries = [
+            "SELECT document_id FROM documents WHERE filename = 'a.pdf'",
+            "SELECT document_id FROM documents WHERE stage = 'extraction-validation-submitted'",
+            "SELECT * FROM extraction WHERE filename = 'a.pdf'",
+            "SELECT * FROM extraction WHERE document_id = 'doc1'",
+        ]
+        for query in queries:
+            plan = " ".join(
+                row[3] for row in self.conn.execute(f"EXPLAIN QUERY PLAN {query}")
+            )
+            self.assertIn("USING", plan, query)
+
+
+if __name__ == "__main__":
+    unittest.main()
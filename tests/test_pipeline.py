@@ -0,0 +1,216 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+from unittest.mock import Mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from pipeline import Stage, StagedPipeline, iter_document_paths
+from project_config import (
+    DocumentProcessingContext,
+    PipelineConfig,
+    ProcessingConfig,
+)
+
+
+class TestStagedPipeline(unittest.TestCase):
+    def setUp(self):
+        self.processor = Mock()
+        self.processor.start_digitization.side_effect = lambda path: f"id-{path}"
+        self.processor.classify_document.return_value = [
+            ("invoices", "1-2"),
+            ("receipts", "3"),
+        ]
+        self.processor.get_extractor.side_effect = lambda context, doc_type: (
+            f"{doc_type}-extractor",
+            doc_type or "default_doc",
+        )
+        self.processor.extract_document.return_value = ({"results": True}, None)
+        self.processor.validate_classification.side_effect = (
+            lambda document_id, results, config, context: results
+        )
+        self.context = DocumentProcessingContext(project_id="project123")
+        self.pipeline_config = PipelineConfig(
+            digitization_workers=2,
+            classification_workers=2,
+            extraction_workers=2,
+            validation_workers=1,
+            queue_sizes={"digitization": 1, "extraction": 1},
+            metrics_interval=0,
+        )
+
+    def test_documents_flow_through_every_stage(self):
+        config = ProcessingConfig(validate_extraction=True)
+        pipeline = StagedPipeline(
+            self.processor, config, self.context, self.pipeline_config
+        )
+
+        pipeline.run([f"doc{i}.pdf" for i in range(5)])
+
+        self.assertEqual(self.processor.start_digitization.call_count, 5)
+        self.assertEqual(self.processor.classify_document.call_count, 5)
+        self.assertEqual(self.processor.extract_document.call_count, 10)
+        self.assertEqual(self.processor.validate_extraction.call_count, 10)
+        metrics = pipeline.metrics()
+        self.assertEqual(metrics["extraction"]["processed"], 10)
+        self.assertLessEqual(metrics["digitization"]["max_depth"], 1)
+        self.assertEqual(pipeline.queue_depths()["validation"], 0)
+
+    def test_skips_classification_when_disabled(self):
+        config = ProcessingConfig(perform_classification=False)
+        pipeline = StagedPipeline(
+            self.processor, config, self.context, self.pipeline_config
+        )
+
+        pipeline.run(["doc.pdf"])
+
+        self.processor.classify_document.assert_not_called()
+        self.processor.extract_document.assert_called_once_with(
+            "id-doc.pdf",
+            "doc.pdf",
+            "None-extractor",
+            "default_doc",
+            None,
+            self.context,
+        )
+        self.processor.validate_extraction.assert_not_called()
+
+    def test_resumed_operations_continue_from_next_stage(self):
+        config = ProcessingConfig(validate_extraction=True)
+        self.processor.resume_digitization.return_value = "doc1"
+        self.processor.resume_classification.return_value = [("invoices", "1")]
+        self.processor.resume_extraction.return_value = ({"results": True}, None)
+        pipeline = StagedPipeline(
+            self.processor, config, self.context, self.pipeline_config
+        )
+
+        pipeline.run(
+            ["new.pdf"],
+            [
+                ("digitize-pending", "a.pdf", "doc1", None, "doc1", None),
+                ("classify-pending", "b.pdf", "doc2", "ml-classifier", "op2", None),
+                (
+                    "extraction-pending",
+                    "c.pdf",
+                    "doc3",
+                    "invoices-extractor",
+                    "op3",
+                    "1-2",
+                ),
+            ],
+        )
+
+        self.processor.resume_digitization.assert_called_once_with("a.pdf", "doc1")
+        self.processor.resume_extraction.assert_called_once_with(
+            "doc3", "c.pdf", "invoices-extractor", "op3", "1-2", self.context
+        )
+        self.assertEqual(self.processor.start_digitization.call_count, 1)
+        # a.pdf and new.pdf are classified normally, b.pdf by its resumed operation
+        self.assertEqual(self.processor.classify_document.call_count, 2)
+        self.assertEqual(self.processor.resume_classification.call_count, 1)
+        self.assertEqual(self.processor.extract_document.call_count, 5)
+        self.assertEqual(self.processor.validate_extraction.call_count, 6)
+
+    def test_resumed_page_ranges_are_not_submitted_again(self):
+        config = ProcessingConfig()
+        self.processor.resume_extraction.return_value = ({"results": True}, None)
+        pipeline = StagedPipeline(
+            self.processor, config, self.context, self.pipeline_config
+        )
+
+        pipeline.run(
+            ["c.pdf"],
+            [
+                (
+                    "extraction-pending",
+                    "c.pdf",
+                    "id-c.pdf",
+                    "invoices-extractor",
+                    "op3",
+                    "1-2",
+                )
+            ],
+        )
+
+        self.processor.resume_extraction.assert_called_once()
+        # Only the page range without a resumed operation is extracted again
+        self.processor.extract_document.assert_called_once_with(
+            "id-c.pdf",
+            "c.pdf",
+            "receipts-extractor",
+            "receipts",
+            "3",
+            self.context,
+        )
+
+    def test_stage_put_blocks_when_queue_is_full(self):
+        release = threading.Event()
+        stage = Stage("slow", lambda item: release.wait(), workers=1, queue_size=1)
+        stage.start()
+        stage.put("first")  # picked up by the worker
+        stage.put("second")  # fills the queue
+
+        producer = threading.Thread(target=stage.put, args=("third",))
+        producer.start()
+        producer.join(timeout=0.1)
+        self.assertTrue(producer.is_alive())
+
+        release.set()
+        producer.join(timeout=5)
+        stage.close()
+        self.assertEqual(stage.metrics()["processed"], 3)
+
+    def test_stage_worker_is_free_while_awaiting_a_future(self):
+        pending = Future()
+        handled = []
+
+        def handler(item):
+            result = yield pending if item == "slow" else item
+            handled.append(result)
+
+        stage = Stage("await", handler, workers=1, queue_size=2)
+        stage.start()
+        stage.put("slow")
+        stage.put("fast")
+        # The only worker handles "fast" while "slow" waits on its future
+        for _ in range(50):
+            if handled:
+                break
+            time.sleep(0.01)
+        self.assertEqual(handled, ["fast"])
+        self.assertEqual(stage.metrics()["in_flight"], 1)
+
+        pending.set_result("done")
+        stage.close()
+        self.assertEqual(handled, ["fast", "done"])
+        self.assertEqual(stage.metrics()["processed"], 2)
+
+    def test_stage_counts_failed_futures(self):
+        failed = Future()
+        failed.set_exception(RuntimeError("boom"))
+
+        def handler(item):
+            yield failed
+
+        stage = Stage("fail", handler, workers=1, queue_size=1)
+        stage.start()
+        stage.put("item")
+        stage.close()
+
+        self.assertEqual(stage.metrics()["failed"], 1)
+
+    def test_iter_document_paths_filters_extensions(self):
+        with tempfile.TemporaryDirectory() as folder:
+            for name in ["a.pdf", "b.PNG", "notes.txt"]:
+                open(os.path.join(folder, name), "w").close()
+
+            paths = sorted(iter_document_paths(folder))
+
+        self.assertEqual([os.path.basename(path) for path in paths], ["a.pdf", "b.PNG"])
+
+
+if __name__ == "__main__":
+    unittest.main()
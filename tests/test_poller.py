@@ -0,0 +1,88 @@
+import os
+import sys
+import unittest
+from unittest.mock import Mock, patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from modules.poller import OperationPoller, PollAgain
+from modules.async_request_handler import start_async_request
+from modules.polling_policy import PollingPolicy
+
+
+class TestOperationPoller(unittest.TestCase):
+    def setUp(self):
+        self.poller = OperationPoller(poll_interval=0.01, max_workers=2)
+
+    def test_track_resolves_after_poll_again(self):
+        statuses = iter(["Running", "Running", "Succeeded"])
+
+        def poll():
+            if next(statuses) != "Succeeded":
+                raise PollAgain()
+            return {"documentId": "12345"}
+
+        future = self.poller.track("op1", poll)
+
+        self.assertEqual(future.result(timeout=5), {"documentId": "12345"})
+        self.assertEqual(self.poller.pending_count(), 0)
+
+    def test_track_propagates_exceptions(self):
+        def poll():
+            raise ValueError("boom")
+
+        future = self.poller.track("op2", poll)
+
+        with self.assertRaises(ValueError):
+            future.result(timeout=5)
+
+    def test_many_operations_share_the_schedule(self):
+        futures = [
+            self.poller.track(f"op{i}", lambda i=i: i, first_delay=0.01)
+            for i in range(50)
+        ]
+
+        self.assertEqual([f.result(timeout=5) for f in futures], list(range(50)))
+
+    @patch("modules.async_request_handler.get_response_archive")
+    @patch("modules.async_request_handler.update_document_stage")
+    def test_start_async_request_does_not_block(
+        self, mock_update_stage, mock_get_archive
+    ):
+        running = Mock()
+        running.json.return_value = {"status": "Running"}
+        succeeded = Mock()
+        succeeded.json.return_value = {
+            "status": "Succeeded",
+            "result": {"documentObjectModel": {"documentId": "12345"}},
+        }
+        session = Mock()
+        session.get.side_effect = [running, succeeded]
+
+        future = start_async_request(
+            action="digitization",
+            base_url="https://example.com/",
+            project_id="project123",
+            module_id="digitization",
+            operation_id="12345",
+            document_id="12345",
+            bearer_token="bearerToken",
+            session=session,
+            poller=self.poller,
+            policy=Mock(
+                spec=PollingPolicy,
+                first_delay=Mock(return_value=0.0),
+                next_delay=Mock(return_value=0.01),
+            ),
+        )
+
+        self.assertEqual(
+            future.result(timeout=5),
+            {"documentObjectModel": {"documentId": "12345"}},
+        )
+        self.assertEqual(session.get.call_count, 2)
+        mock_update_stage.assert_called_once()
+        mock_get_archive.return_value.store.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
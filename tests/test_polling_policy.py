@@ -0,0 +1,85 @@
+import os
+import sys
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from modules.polling_policy import PollingPolicy
+
+
+class TestPollingPolicy(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "document_cache.db")
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            """
+            CREATE TABLE documents (
+                document_id TEXT PRIMARY KEY,
+                digitization_duration REAL,
+                extraction_duration REAL,
+                extractor_id TEXT,
+                timestamp REAL NOT NULL
+            )
+            """
+        )
+        rows = [
+            ("doc1", 4.0, 20.0, "invoices", 1.0),
+            ("doc2", 6.0, 30.0, "invoices", 2.0),
+            ("doc3", 5.0, 90.0, "receipts", 3.0),
+        ]
+        conn.executemany("INSERT INTO documents VALUES (?, ?, ?, ?, ?)", rows)
+        conn.commit()
+        conn.close()
+
+        patcher = patch("utils.db_utils.SQLITE_DB_PATH", self.db_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def test_first_delay_uses_median_per_extractor(self):
+        policy = PollingPolicy(first_poll_fraction=0.5)
+
+        self.assertEqual(policy.expected_duration("extraction", "invoices"), 25.0)
+        self.assertEqual(policy.first_delay("extraction", "invoices"), 12.5)
+        self.assertEqual(policy.first_delay("extraction", "receipts"), 45.0)
+        self.assertEqual(policy.first_delay("digitization", "digitization"), 2.5)
+
+    def test_unknown_module_polls_immediately(self):
+        policy = PollingPolicy()
+
+        self.assertIsNone(policy.expected_duration("extraction", "passports"))
+        self.assertEqual(policy.first_delay("extraction", "passports"), 0.0)
+
+    def test_record_updates_expectation(self):
+        policy = PollingPolicy()
+        policy.record("extraction", "passports", 8.0)
+
+        self.assertEqual(policy.expected_duration("extraction", "passports"), 8.0)
+
+    def test_history_loads_without_holding_the_lock(self):
+        policy = PollingPolicy()
+        original_load = policy._load_history
+
+        def load(action, module_id):
+            # Another module's history stays readable during the query
+            self.assertTrue(policy._lock.acquire(blocking=False))
+            policy._lock.release()
+            return original_load(action, module_id)
+
+        with patch.object(policy, "_load_history", side_effect=load):
+            self.assertEqual(policy.expected_duration("extraction", "invoices"), 25.0)
+
+    def test_next_delay_backs_off_with_jitter_and_cap(self):
+        policy = PollingPolicy(min_interval=1.0, max_interval=10.0, backoff=2.0)
+
+        for attempt, expected in [(0, 1.0), (1, 2.0), (3, 8.0), (10, 10.0)]:
+            delay = policy.next_delay("extraction", "invoices", attempt)
+            self.assertGreaterEqual(delay, expected * (1 - policy.jitter))
+            self.assertLessEqual(delay, expected * (1 + policy.jitter))
+
+
+if __name__ == "__main__":
+    unittest.main()
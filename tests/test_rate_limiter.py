@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from utils.http_session import HttpSession
+from utils.rate_limiter import (
+    RateLimiter,
+    ThrottledError,
+    TokenBucket,
+    endpoint_for,
+    parse_retry_after,
+)
+
+
+def _response(status_code, retry_after=None):
+    response = Mock(status_code=status_code)
+    response.headers = {"Retry-After": retry_after} if retry_after else {}
+    return response
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_token_bucket_limits_rate(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_pause_holds_back_callers(self):
+        bucket = TokenBucket(rate=0)
+        bucket.pause(0.05)
+
+        self.assertGreaterEqual(bucket.acquire(), 0.04)
+
+    def test_endpoint_for(self):
+        base = "https://example.com/du_/api/framework/projects/"
+        self.assertEqual(
+            endpoint_for("POST", f"{base}p1/digitization/start?api-version=1"),
+            "start",
+        )
+        self.assertEqual(
+            endpoint_for(
+                "GET", f"{base}p1/extractors/e1/extraction/result/op1?api-version=1.1"
+            ),
+            "poll",
+        )
+        self.assertEqual(endpoint_for("GET", f"{base}?api-version=1.1"), "discovery")
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("7", attempt=0), 7.0)
+        self.assertEqual(parse_retry_after(None, attempt=3), 8.0)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", 0), 0.0)
+
+
+class TestThrottledRequests(unittest.TestCase):
+    def setUp(self):
+        self.limiter = RateLimiter(start_rate=0, poll_rate=0, discovery_rate=0)
+        self.session = HttpSession(rate_limiter=self.limiter, max_throttle_retries=2)
+
+    def test_retries_after_retry_after(self):
+        responses = [_response(429, "0.01"), _response(503, "0.01"), _response(202)]
+
+        with patch("requests.Session.post", side_effect=responses) as mock_post:
+            response = self.session.post("https://example.com/p1/digitization/start")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual(self.session.stats()["throttled"], 2)
+
+    def test_raises_when_retries_are_exhausted(self):
+        with patch("requests.Session.get", return_value=_response(429, "0.01")):
+            with self.assertRaises(ThrottledError) as context:
+                self.session.get("https://example.com/p1/result/op1")
+
+        self.assertEqual(context.exception.retry_after, 0.01)
+
+    def test_no_retry_raises_immediately(self):
+        with patch(
+            "requests.Session.get", return_value=_response(429, "3")
+        ) as mock_get:
+            with self.assertRaises(ThrottledError) as context:
+                self.session.get(
+                    "https://example.com/p1/result/op1", retry_throttled=False
+                )
+
+        mock_get.assert_called_once()
+        self.assertEqual(context.exception.retry_after, 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
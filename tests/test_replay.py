@@ -0,0 +1,147 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.bench_write_results import build_extraction_results
+from db_test_case import DatabaseTestCase
+from replay import replay
+from utils import db_utils
+from utils.response_archive import ResponseArchive
+from utils.write_results import WriteResults
+
+CLASSIFICATION_RESULT = {
+    "classificationResults": [
+        {
+            "DocumentId": "doc-1",
+            "DocumentTypeId": "invoices",
+            "Confidence": 0.97,
+            "DocumentBounds": {"StartPage": 0, "PageCount": 2, "PageRange": "1-2"},
+            "ClassifierName": "ml-classification",
+        }
+    ]
+}
+
+
+class TestReplay(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        # Keep the CSVs written by the live run out of the working tree
+        output_patch = patch(
+            "utils.write_results.OUTPUT_DIR",
+            os.path.join(self.temp_dir.name, "output_results"),
+        )
+        output_patch.start()
+        self.addCleanup(output_patch.stop)
+        self.addCleanup(db_utils.flush_writes)
+        self.archive = ResponseArchive(
+            os.path.join(self.temp_dir.name, "responses"), codec="gzip", enabled=True
+        )
+
+        self.extraction = build_extraction_results(fields=3, rows=2, columns=2)
+        self.extraction["extractionResult"]["DocumentId"] = "doc-1"
+        validated = build_extraction_results(fields=3, rows=2, columns=2)
+        validated["extractionResult"]["DocumentId"] = "doc-1"
+        field = validated["extractionResult"]["ResultsDocument"]["Fields"][0]
+        field["Values"][0]["Value"] = "corrected"
+        field["DataSource"] = "ManuallyChanged"
+        self.validation = {
+            "result": {"validatedExtractionResults": validated["extractionResult"]}
+        }
+
+        # A live run: cache entry, archived results and the rows they produced
+        db_utils.update_cache("docs/invoice.pdf", "doc-1", "init", "proj-1")
+        for action, module_id, operation_id, payload in (
+            ("digitization", "digitization", "doc-1", {"documentObjectModel": {}}),
+            ("classification", "cls-1", "op-c", CLASSIFICATION_RESULT),
+            ("extraction", "ext-1", "op-e", self.extraction),
+            ("extraction_validation", "ext-1", "op-v", self.validation),
+        ):
+            self.archive.store(
+                "doc-1", action, module_id, operation_id, payload, "proj-1"
+            )
+        db_utils.flush_writes()
+        WriteResults(
+            "docs/invoice.pdf",
+            extraction_results=self.extraction,
+            validation_extraction_results=self.validation,
+        ).write_results().result()
+        self.expected = self._extraction()
+
+    def _extraction(self):
+        return db_utils.execute_query(
+            """
+            SELECT filename, document_id, field_id, field, field_value,
+                validated_field_value, is_correct, row_index, column_index
+            FROM extraction ORDER BY field_id, row_index, column_index
+            """
+        )
+
+    def _wipe(self):
+        for table in ("documents", "classification", "extraction"):
+            db_utils.execute_query(f"DELETE FROM {table}")
+
+    def test_rebuilds_tables_from_archive(self):
+        self._wipe()
+        counts = replay(self.archive, workers=1)
+
+        self.assertEqual(counts["extraction"], 1)
+        self.assertEqual(counts["extraction_validation"], 1)
+        self.assertEqual(self._extraction(), self.expected)
+        self.assertIn(
+            ("field0", "corrected", 0),
+            [row[2::3][:1] + row[5:7] for row in self.expected],
+        )
+        self.assertEqual(
+            db_utils.execute_query(
+                "SELECT filename, document_type_id, operation_id FROM classification"
+            ),
+            [("docs/invoice.pdf", "invoices", "op-c")],
+        )
+        self.assertEqual(
+            db_utils.execute_query(
+                """
+                SELECT filename, stage, project_id, classifier_id, extractor_id,
+                    extraction_operation_id
+                FROM documents
+                """
+            ),
+            [
+                (
+                    "docs/invoice.pdf",
+                    "extraction_validation",
+                    "proj-1",
+                    "cls-1",
+                    "ext-1",
+                    "op-e",
+                )
+            ],
+        )
+
+    def test_parallel_replay_is_idempotent(self):
+        db_utils.execute_query("DELETE FROM extraction")
+        for _ in range(2):
+            replay(self.archive, workers=2, batch_size=2)
+
+        self.assertEqual(self._extraction(), self.expected)
+        self.assertEqual(
+            db_utils.execute_query("SELECT COUNT(*) FROM classification"), [(1,)]
+        )
+        # Existing documents keep their stage
+        self.assertEqual(
+            db_utils.execute_query("SELECT stage FROM documents"), [("init",)]
+        )
+
+    def test_project_filter(self):
+        self._wipe()
+        counts = replay(self.archive, project_id="other", workers=1)
+        self.assertEqual(sum(counts.values()), 0)
+        self.assertEqual(
+            db_utils.execute_query("SELECT COUNT(*) FROM documents"), [(0,)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from db_test_case import DatabaseTestCase
+from utils import db_utils
+from utils import response_archive
+from utils.response_archive import ResponseArchive, zstandard
+
+RESULT = {"extractionResult": {"DocumentId": "doc-1", "ResultsDocument": {}}}
+
+
+class TestResponseArchive(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        db_utils.execute_query(
+            "INSERT INTO documents (document_id, filename, stage, timestamp) VALUES (?, ?, ?, ?)",
+            ("doc-1", "invoice.pdf", "extraction", time.time()),
+        )
+        self.root = os.path.join(self.temp_dir.name, "responses")
+
+    def _blobs(self):
+        return [name for _, _, files in os.walk(self.root) for name in files]
+
+    def test_stores_gzip_blob_and_index(self):
+        archive = ResponseArchive(self.root, codec="gzip", enabled=True)
+        archive.store("doc-1", "extraction", "ext-1", "op-1", RESULT, "proj-1").result()
+
+        blobs = self._blobs()
+        self.assertEqual(len(blobs), 1)
+        self.assertTrue(blobs[0].endswith(".json.gz"))
+        self.assertEqual(archive.get("doc-1", "extraction"), RESULT)
+        entry = archive.entries(("extraction",))[0]
+        self.assertEqual(
+            entry[:6], ("doc-1", "extraction", "ext-1", "op-1", "proj-1", "invoice.pdf")
+        )
+        self.assertEqual(archive.entries(("classification",)), [])
+
+    def test_identical_results_share_a_blob(self):
+        archive = ResponseArchive(self.root, codec="gzip", enabled=True)
+        archive.store("doc-1", "extraction", "ext-1", "op-1", RESULT)
+        archive.store("doc-1", "extraction", "ext-1", "op-2", RESULT)
+        db_utils.flush_writes()
+
+        self.assertEqual(len(self._blobs()), 1)
+        self.assertEqual(len(archive.entries()), 2)
+        self.assertEqual(
+            archive.get("doc-1", "extraction", operation_id="op-2"), RESULT
+        )
+
+    @unittest.skipUnless(zstandard, "zstandard is not installed")
+    def test_stores_zstd_blob(self):
+        archive = ResponseArchive(self.root, codec="zstd", enabled=True)
+        archive.store("doc-1", "digitization", "digitization", "doc-1", RESULT).result()
+
+        self.assertTrue(self._blobs()[0].endswith(".json.zst"))
+        self.assertEqual(archive.get("doc-1", "digitization"), RESULT)
+
+    def test_disabled_archive_stores_nothing(self):
+        archive = ResponseArchive(self.root, codec="gzip", enabled=False)
+        self.assertIsNone(archive.store("doc-1", "extraction", "ext-1", "op-1", RESULT))
+        self.assertFalse(os.path.exists(self.root))
+
+    def test_checks_archive_table_once(self):
+        archive = ResponseArchive(self.root, codec="gzip", enabled=True)
+        with patch.object(archive, "_has_index", wraps=archive._has_index) as check:
+            archive.store("doc-1", "extraction", "ext-1", "op-1", RESULT)
+            archive.store("doc-1", "extraction", "ext-1", "op-2", RESULT)
+            db_utils.flush_writes()
+
+        check.assert_called_once()
+        self.assertEqual(len(archive.entries()), 2)
+
+    def test_compresses_off_the_calling_thread(self):
+        archive = ResponseArchive(self.root, codec="gzip", enabled=True)
+        threads = []
+
+        def compress(data, codec):
+            threads.append(threading.get_ident())
+            return response_archive.gzip.compress(data)
+
+        with (
+            patch("utils.db_utils.DB_WRITE_BEHIND", True),
+            patch("utils.response_archive.compress", side_effect=compress),
+        ):
+            archive.store("doc-1", "extraction", "ext-1", "op-1", RESULT).result()
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+        self.assertEqual(archive.get("doc-1", "extraction"), RESULT)
+
+    def test_skips_database_without_archive_table(self):
+        archive = ResponseArchive(self.root, codec="gzip", enabled=True)
+        with patch(
+            "utils.db_utils.SQLITE_DB_PATH",
+            os.path.join(self.temp_dir.name, "unmigrated.db"),
+        ):
+            self.assertIsNone(
+                archive.store("doc-1", "extraction", "ext-1", "op-1", RESULT)
+            )
+        self.assertEqual(self._blobs(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
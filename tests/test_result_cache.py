@@ -0,0 +1,165 @@
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from db_test_case import DatabaseTestCase
+from modules.classify import Classify
+from modules.extract import Extract
+from utils import db_utils
+from utils.db_utils import flush_writes
+from utils.result_cache import ResultCache, prompts_hash
+
+
+class TestResultCache(DatabaseTestCase):
+    def test_hit_requires_same_key(self):
+        cache = ResultCache(ttl_days=1, max_mb=1)
+        prompts = {"prompts": [{"id": "total", "question": "What is the total?"}]}
+        cache.put("doc1", "invoices", "1-2", prompts, {"fields": [1, 2]})
+        flush_writes()
+
+        self.assertEqual(
+            cache.get("doc1", "invoices", "1-2", prompts), {"fields": [1, 2]}
+        )
+        self.assertIsNone(cache.get("doc1", "invoices", "3", prompts))
+        self.assertIsNone(cache.get("doc1", "receipts", "1-2", prompts))
+        self.assertIsNone(cache.get("doc1", "invoices", "1-2", None))
+
+    def test_prompts_hash_ignores_key_order(self):
+        self.assertEqual(prompts_hash({"a": 1, "b": 2}), prompts_hash({"b": 2, "a": 1}))
+        self.assertEqual(prompts_hash(None), "")
+
+    def test_expired_entries_are_ignored(self):
+        cache = ResultCache(ttl_days=1, max_mb=1)
+        with patch(
+            "utils.result_cache.time.time", return_value=time.time() - 2 * 86400
+        ):
+            cache.put("doc1", "invoices", None, None, {"old": True})
+        flush_writes()
+
+        self.assertIsNone(cache.get("doc1", "invoices"))
+
+    def test_evicts_least_recently_used(self):
+        cache = ResultCache(ttl_days=1, max_mb=0.001)  # ~1 KB
+        payload = {"value": "x" * 400}
+        cache.put("doc1", "invoices", None, None, payload)
+        cache.put("doc2", "invoices", None, None, payload)
+        flush_writes()
+        cache.get("doc1", "invoices")
+        cache.put("doc3", "invoices", None, None, payload)
+        flush_writes()
+
+        self.assertIsNotNone(cache.get("doc1", "invoices"))
+        self.assertIsNone(cache.get("doc2", "invoices"))
+        self.assertIsNotNone(cache.get("doc3", "invoices"))
+
+    def test_running_total_tracks_replaced_entries(self):
+        cache = ResultCache(ttl_days=1, max_mb=1)
+        cache.put("doc1", "invoices", None, None, {"value": "x" * 100})
+        cache.put("doc1", "invoices", None, None, {"value": "x" * 10})
+        flush_writes()
+
+        stored = db_utils.execute_query("SELECT SUM(size_bytes) FROM result_cache")
+        self.assertEqual(cache._total_bytes, stored[0][0])
+
+    def test_put_does_not_sum_table_between_sweeps(self):
+        cache = ResultCache(ttl_days=1, max_mb=1)
+        cache.put("doc1", "invoices", None, None, {"a": 1})
+        flush_writes()
+
+        with patch.object(cache, "evict") as mock_evict:
+            cache.put("doc2", "invoices", None, None, {"a": 2})
+            flush_writes()
+
+        mock_evict.assert_not_called()
+
+    def test_entry_keeps_operation_id(self):
+        cache = ResultCache(ttl_days=1, max_mb=1)
+        cache.put("doc1", "invoices", None, None, {"a": 1}, "op-1")
+        flush_writes()
+
+        self.assertEqual(cache.get_entry("doc1", "invoices"), ({"a": 1}, "op-1"))
+
+    def test_classify_cache_hit_reuses_operation_and_advances_stage(self):
+        cache = ResultCache(ttl_days=1, max_mb=1)
+        cache.put(
+            "doc1", "classifier1", None, None, {"classificationResults": []}, "op-1"
+        )
+        db_utils.execute_query(
+            "INSERT INTO documents (document_id, filename, stage, timestamp) VALUES (?, ?, ?, ?)",
+            ("doc1", "invoice.pdf", "digitization", time.time()),
+        )
+        flush_writes()
+
+        with patch("requests.Session.post") as mock_post:
+            client = Classify(
+                "https://example.com/", "project123", "token", result_cache=cache
+            )
+            client.classify_document("invoice.pdf", "doc1", "classifier1", None)
+        flush_writes()
+
+        mock_post.assert_not_called()
+        rows = db_utils.execute_query(
+            "SELECT stage, classification_operation_id, classifier_id FROM documents"
+        )
+        self.assertEqual(rows, [("classification", "op-1", "classifier1")])
+
+    def test_classify_cache_hit_does_not_duplicate_rows(self):
+        cache = ResultCache(ttl_days=1, max_mb=1)
+        classification_results = {
+            "classificationResults": [
+                {
+                    "DocumentId": "doc1",
+                    "DocumentTypeId": "invoices",
+                    "Confidence": 0.9,
+                    "DocumentBounds": {
+                        "StartPage": 0,
+                        "PageCount": 1,
+                        "PageRange": "1",
+                    },
+                    "ClassifierName": "ml-classification",
+                }
+            ]
+        }
+        cache.put("doc1", "classifier1", None, None, classification_results, "op-1")
+        flush_writes()
+
+        client = Classify(
+            "https://example.com/", "project123", "token", result_cache=cache
+        )
+        for _ in range(2):
+            ranges = client.classify_document(
+                "invoice.pdf", "doc1", "classifier1", None
+            )
+        flush_writes()
+
+        self.assertEqual(ranges, [("invoices", "1")])
+        self.assertEqual(
+            db_utils.execute_query("SELECT COUNT(*) FROM classification"), [(0,)]
+        )
+
+    def test_extract_returns_cached_result_without_request(self):
+        cache = ResultCache(ttl_days=1, max_mb=1)
+        extraction_results = {"extractionResult": {"DocumentId": "doc1"}}
+        cache.put("doc1", "invoices", None, None, extraction_results)
+        flush_writes()
+
+        with patch("requests.Session.post") as mock_post:
+            client = Extract(
+                "https://example.com/", "project123", "token", result_cache=cache
+            )
+            results = client.extract_document("invoices", "doc1")
+
+        self.assertEqual(results, extraction_results)
+        mock_post.assert_not_called()
+
+    def test_disabled_cache(self):
+        cache = ResultCache(ttl_days=0)
+        cache.put("doc1", "invoices", None, None, {"a": 1})
+        self.assertIsNone(cache.get("doc1", "invoices"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.bench_write_results import build_extraction_results
+from utils.result_model import (
+    ResultsDocument,
+    parse_classifications,
+    validation_status,
+)
+
+
+def _validation_response(results_document: dict) -> dict:
+    return {
+        "result": {
+            "actionData": {"status": "Completed"},
+            "validatedExtractionResults": {
+                "DocumentId": "doc-1",
+                "ResultsDocument": results_document,
+            },
+        }
+    }
+
+
+class TestResultsDocument(unittest.TestCase):
+    def test_extraction_rows(self):
+        document = ResultsDocument.from_extraction(
+            build_extraction_results(fields=2, rows=2, columns=2)
+        )
+
+        rows = list(document.rows("statement.pdf"))
+        self.assertEqual(len(rows), 2 + 2 * 2)
+        self.assertEqual(
+            rows[0][:7],
+            (
+                "statement.pdf",
+                "bench-document",
+                "bank_statement",
+                "field0",
+                "Field 0",
+                False,
+                "value0",
+            ),
+        )
+        self.assertEqual(rows[0][-3:], ("1-40", -1, -1))
+        # Header cells become the column name of the body cells
+        cell = rows[2 + 3]
+        self.assertEqual(cell[3:5], ("transactions", "col1"))
+        self.assertEqual(cell[6], "r2c1")
+        self.assertEqual(cell[-2:], (2, 1))
+
+    def test_validated_rows(self):
+        results = build_extraction_results(fields=1, rows=1, columns=2)
+        results_document = results["extractionResult"]["ResultsDocument"]
+        results_document["Fields"][0]["DataSource"] = "ManuallyChanged"
+        results_document["Fields"][0]["OperatorConfirmed"] = True
+        document = ResultsDocument.from_validation(
+            _validation_response(results_document)
+        )
+
+        self.assertEqual(
+            list(document.validated_field_rows()),
+            [("doc-1", "field0", "value0", True, False)],
+        )
+        cells = list(document.validated_cell_rows())
+        self.assertEqual(len(cells), 2)
+        self.assertEqual(cells[0][:6], ("doc-1", "transactions", "col0", 1, 0, "r1c0"))
+        self.assertTrue(cells[0][7])
+
+    def test_cell_without_header_is_skipped_when_validated(self):
+        results = build_extraction_results(fields=0, rows=1, columns=2)
+        results_document = results["extractionResult"]["ResultsDocument"]
+        cells = results_document["Tables"][0]["Values"][0]["Cells"]
+        cells.remove(cells[1])  # header of column 1
+        document = ResultsDocument.from_validation(
+            _validation_response(results_document)
+        )
+
+        self.assertEqual(
+            [row[2] for row in document.validated_cell_rows()],
+            ["col0"],
+        )
+        # Extraction keeps the cell with an empty column name
+        self.assertEqual(
+            [row[4] for row in document.cell_rows("statement.pdf")],
+            ["col0", None],
+        )
+
+    def test_parsed_objects_use_slots(self):
+        document = ResultsDocument.from_extraction(
+            build_extraction_results(fields=1, rows=1, columns=1)
+        )
+        for obj in (document, document.fields[0], document.tables[0]):
+            self.assertFalse(hasattr(obj, "__dict__"))
+        self.assertFalse(hasattr(document.tables[0].cells[0], "__dict__"))
+
+
+class TestClassificationAndStatus(unittest.TestCase):
+    def test_parse_classifications(self):
+        results = parse_classifications(
+            {
+                "classificationResults": [
+                    {
+                        "DocumentId": "doc-1",
+                        "DocumentTypeId": "invoice",
+                        "Confidence": 0.9,
+                        "DocumentBounds": {
+                            "StartPage": 0,
+                            "PageCount": 2,
+                            "PageRange": "1-2",
+                        },
+                        "ClassifierName": "ml-classification",
+                    }
+                ]
+            }
+        )
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].page_range, "1-2")
+        self.assertEqual(
+            results[0].row("invoice.pdf", "op-1"),
+            ("doc-1", "invoice.pdf", "invoice", 0.9, 0, 2, "ml-classification", "op-1"),
+        )
+        self.assertEqual(parse_classifications({}), [])
+
+    def test_validation_status(self):
+        self.assertEqual(validation_status(_validation_response({})), "Completed")
+        self.assertIsNone(validation_status({"result": {}}))
+        self.assertIsNone(validation_status(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import stat
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from utils.auth import SCOPE, Authentication
+from utils.token_cache import TokenCache
+
+
+class TestTokenCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "cache", "token_cache.json")
+        self.cache = TokenCache(self.path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip_is_keyed_by_app_and_scope(self):
+        expires_at = time.time() + 3600
+        self.cache.put("app", "scope", "token", expires_at)
+
+        self.assertEqual(self.cache.get("app", "scope"), ("token", expires_at))
+        self.assertIsNone(self.cache.get("other-app", "scope"))
+        self.assertIsNone(self.cache.get("app", "other-scope"))
+
+    def test_file_is_readable_by_owner_only(self):
+        self.cache.put("app", "scope", "token", time.time() + 3600)
+
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+        with open(self.path, encoding="utf-8") as file:
+            self.assertNotIn("app", file.read().replace("access_token", ""))
+
+    def test_expiring_token_is_not_reused(self):
+        self.cache.put("app", "scope", "token", time.time() + 30)
+
+        self.assertIsNone(self.cache.get("app", "scope"))
+
+    def test_unreadable_file_is_a_miss(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("not json")
+
+        self.assertIsNone(self.cache.get("app", "scope"))
+
+    @patch("utils.auth.requests.post")
+    def test_authentication_fetches_lazily_and_reuses_cached_token(self, mock_post):
+        mock_post.return_value = Mock(
+            json=Mock(
+                return_value={
+                    "access_token": "fetched",
+                    "expires_in": 3600,
+                    "token_type": "Bearer",
+                }
+            )
+        )
+        auth = Authentication("app", "secret", "https://id.example.com/", self.cache)
+        mock_post.assert_not_called()
+
+        self.assertEqual(auth.get_bearer_token(), "fetched")
+        self.assertEqual(self.cache.get("app", SCOPE)[0], "fetched")
+
+        # A later run starts from the cached token without a request
+        later = Authentication("app", "secret", "https://id.example.com/", self.cache)
+        self.assertEqual(later.get_bearer_token(), "fetched")
+        self.assertEqual(mock_post.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
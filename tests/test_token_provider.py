@@ -0,0 +1,86 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from utils.auth import Authentication
+from utils.token_provider import TokenProvider, as_token_provider
+
+
+def _token_response(token: str) -> Mock:
+    response = Mock()
+    response.json.return_value = {
+        "access_token": token,
+        "expires_in": 3600,
+        "token_type": "Bearer",
+    }
+    return response
+
+
+class TestTokenProvider(unittest.TestCase):
+    def setUp(self):
+        self.post_patch = patch(
+            "utils.auth.requests.post", return_value=_token_response("token-0")
+        )
+        self.mock_post = self.post_patch.start()
+        self.auth = Authentication("app", "secret", "https://identity.example.com/")
+
+    def tearDown(self):
+        self.post_patch.stop()
+
+    def test_fixed_token(self):
+        provider = as_token_provider("token")
+
+        self.assertEqual(provider.token(), "token")
+        self.assertEqual(provider.refresh("token"), "token")
+        self.assertIs(as_token_provider(provider), provider)
+
+    def test_refreshed_token_is_seen_by_provider(self):
+        provider = TokenProvider(self.auth)
+        self.assertEqual(provider.token(), "token-0")
+
+        self.mock_post.return_value = _token_response("token-1")
+        self.auth.refresh_token()
+
+        self.assertEqual(provider.token(), "token-1")
+
+    def test_expired_token_is_fetched_once_by_concurrent_callers(self):
+        self.auth.token_expiry = time.time()
+        calls = []
+
+        def slow_post(*args, **kwargs):
+            calls.append(1)
+            time.sleep(0.05)
+            return _token_response("token-1")
+
+        self.mock_post.side_effect = slow_post
+        provider = TokenProvider(self.auth)
+        tokens = []
+        threads = [
+            threading.Thread(target=lambda: tokens.append(provider.token()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(tokens, ["token-1"] * 8)
+        self.assertEqual(len(calls), 1)
+
+    def test_rejected_token_is_refreshed_once(self):
+        provider = TokenProvider(self.auth)
+        self.assertEqual(provider.token(), "token-0")
+        self.mock_post.return_value = _token_response("token-1")
+
+        self.assertEqual(provider.refresh("token-0"), "token-1")
+        # A second request rejected with the old token reuses the new one
+        self.assertEqual(provider.refresh("token-0"), "token-1")
+        self.assertEqual(self.mock_post.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
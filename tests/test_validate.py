@@ -25,7 +25,9 @@ class TestValidate(unittest.TestCase):
         response.json.return_value = response_data
 
         with (
-            unittest.mock.patch("requests.post", return_value=response) as mock_post,
+            unittest.mock.patch(
+                "requests.Session.post", return_value=response
+            ) as mock_post,
             unittest.mock.patch.object(
                 Validate,
                 "submit_extraction_validation_request",
@@ -54,7 +56,9 @@ class TestValidate(unittest.TestCase):
         response = Mock()
         response.status_code = 400
 
-        with unittest.mock.patch("requests.post", return_value=response) as mock_post:
+        with unittest.mock.patch(
+            "requests.Session.post", return_value=response
+        ) as mock_post:
             validator = Validate(base_url, project_id, bearer_token)
             validated_results = validator.validate_extraction_results(
                 extractor_id, document_id, extraction_results, extraction_prompts
@@ -73,7 +77,7 @@ class TestValidate(unittest.TestCase):
         extraction_prompts = {"prompt3": "value3", "prompt4": "value4"}
 
         with unittest.mock.patch(
-            "requests.post", side_effect=RequestException
+            "requests.Session.post", side_effect=RequestException
         ) as mock_post:
             validator = Validate(base_url, project_id, bearer_token)
             validated_results = validator.validate_extraction_results(
@@ -0,0 +1,173 @@
+import csv
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.bench_write_results import (
+    CREATE_EXTRACTION_TABLE,
+    build_extraction_results,
+)
+from db_test_case import DatabaseTestCase
+from export_results import export_all_results
+from utils import db_utils
+from utils import atomic_file
+from utils.write_results import CSV_COLUMNS, WriteResults, write_csv
+
+
+class TestWriteResults(DatabaseTestCase):
+    migrate = False
+
+    def setUp(self):
+        super().setUp()
+        db_utils.execute_query(CREATE_EXTRACTION_TABLE)
+
+    def test_writes_fields_and_table_cells(self):
+        results = build_extraction_results(fields=3, rows=4, columns=2)
+        writer = WriteResults("statement.pdf", extraction_results=results)
+        writer.write_extraction_results()
+        writer.conn.commit()
+
+        fields = db_utils.execute_query(
+            "SELECT field_id, field_value, row_index FROM extraction WHERE row_index = -1 ORDER BY field_id"
+        )
+        self.assertEqual(
+            fields,
+            [
+                ("field0", "value0", -1),
+                ("field1", "value1", -1),
+                ("field2", "value2", -1),
+            ],
+        )
+        cells = db_utils.execute_query(
+            "SELECT field, field_value FROM extraction WHERE row_index = 2 ORDER BY column_index"
+        )
+        self.assertEqual(cells, [("col0", "r2c0"), ("col1", "r2c1")])
+        self.assertEqual(
+            db_utils.execute_query("SELECT COUNT(*) FROM extraction"), [(11,)]
+        )
+
+    def test_rewrite_upserts_rows(self):
+        results = build_extraction_results(fields=2, rows=2, columns=2)
+        for _ in range(2):
+            writer = WriteResults("statement.pdf", extraction_results=results)
+            writer.write_extraction_results()
+            writer.conn.commit()
+
+        self.assertEqual(
+            db_utils.execute_query("SELECT COUNT(*) FROM extraction"), [(6,)]
+        )
+
+    def test_merges_validated_results(self):
+        results = build_extraction_results(fields=2, rows=2, columns=2)
+        validated = build_extraction_results(fields=2, rows=2, columns=2)
+        document = validated["extractionResult"]["ResultsDocument"]
+        document["Fields"][1]["Values"][0]["Value"] = "corrected"
+        document["Fields"][1]["DataSource"] = "ManuallyChanged"
+        cell = document["Tables"][0]["Values"][0]["Cells"][-1]
+        cell["Values"][0]["Value"] = "fixed"
+        cell["DataSource"] = "Manual"
+        validation_results = {
+            "result": {"validatedExtractionResults": validated["extractionResult"]}
+        }
+
+        writer = WriteResults("statement.pdf", extraction_results=results)
+        writer.write_extraction_results()
+        writer.conn.commit()
+        writer = WriteResults(
+            "statement.pdf", validation_extraction_results=validation_results
+        )
+        writer.write_validated_results()
+        writer.conn.commit()
+
+        rows = db_utils.execute_query(
+            """
+            SELECT field_id, field, row_index, column_index, validated_field_value, is_correct
+            FROM extraction ORDER BY field_id, row_index, column_index
+            """
+        )
+        self.assertEqual(
+            rows,
+            [
+                ("field0", "Field 0", -1, -1, "value0", 1),
+                ("field1", "Field 1", -1, -1, "corrected", 0),
+                ("transactions", "col0", 1, 0, "r1c0", 1),
+                ("transactions", "col1", 1, 1, "r1c1", 1),
+                ("transactions", "col0", 2, 0, "r2c0", 1),
+                ("transactions", "col1", 2, 1, "fixed", 0),
+            ],
+        )
+
+    def _read_csv(self, path):
+        with open(path, newline="", encoding="utf-8") as csv_file:
+            return list(csv.reader(csv_file))
+
+    def test_write_results_exports_only_current_split(self):
+        output_dir = os.path.join(self.temp_dir.name, "output_results")
+        first = build_extraction_results(fields=2, rows=2, columns=2)
+        second = build_extraction_results(fields=3, rows=1, columns=2)
+        second["extractionResult"]["ResultsDocument"]["Bounds"]["PageRange"] = "41-42"
+
+        with patch("utils.write_results.OUTPUT_DIR", output_dir):
+            WriteResults("statement.pdf", extraction_results=first).write_results()
+            first_csv = os.path.join(output_dir, "statement-pages_1-40.csv")
+            first_mtime = os.stat(first_csv).st_mtime_ns
+            WriteResults("statement.pdf", extraction_results=second).write_results()
+            # Validation-only writes do not touch the CSV files
+            WriteResults(
+                "statement.pdf",
+                validation_extraction_results={
+                    "result": {"validatedExtractionResults": first["extractionResult"]}
+                },
+            ).write_results()
+        db_utils.flush_writes()
+
+        self.assertEqual(
+            sorted(os.listdir(output_dir)),
+            ["statement-pages_1-40.csv", "statement-pages_41-42.csv"],
+        )
+        self.assertEqual(os.stat(first_csv).st_mtime_ns, first_mtime)
+        rows = self._read_csv(os.path.join(output_dir, "statement-pages_41-42.csv"))
+        self.assertEqual(tuple(rows[0]), CSV_COLUMNS)
+        self.assertEqual(len(rows) - 1, 3 + 2)
+        # Both splits share the primary keys of field0, field1 and the first row
+        self.assertEqual(
+            db_utils.execute_query("SELECT COUNT(*) FROM extraction"), [(7,)]
+        )
+
+    def test_full_export_rewrites_every_split(self):
+        output_dir = os.path.join(self.temp_dir.name, "export")
+        for filename in ("a.pdf", "b.pdf"):
+            writer = WriteResults(
+                filename,
+                extraction_results=build_extraction_results(
+                    fields=2, rows=2, columns=2
+                ),
+            )
+            writer.write_extraction_results()
+            writer.conn.commit()
+
+        self.assertEqual(export_all_results(output_dir=output_dir), 2)
+        self.assertEqual(
+            sorted(os.listdir(output_dir)), ["a-pages_1-40.csv", "b-pages_1-40.csv"]
+        )
+        rows = self._read_csv(os.path.join(output_dir, "a-pages_1-40.csv"))
+        self.assertEqual(len(rows) - 1, 6)
+        self.assertEqual(export_all_results("b.pdf", output_dir), 1)
+
+    @unittest.skipIf(os.name == "nt", "POSIX permission bits")
+    def test_csv_permissions_follow_umask(self):
+        with patch.object(atomic_file, "_UMASK", 0o022):
+            path = write_csv("statement.pdf", "1-2", [], self.temp_dir.name)
+
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o644)
+        # The temporary file was renamed, not left behind
+        self.assertFalse(
+            [name for name in os.listdir(self.temp_dir.name) if name.endswith(".tmp")]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()